@@ -0,0 +1,67 @@
+"""
+Benchmark of the import of lammpshade in a fresh interpreter: the lazy
+imports against the eager import of pandas and matplotlib done before, for a
+script that only needs Simulation (e.g. a YAML to XYZ conversion).
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat N]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Statement run in a fresh interpreter, printing its peak RSS (-1 where the
+# resource module is not available, e.g. on Windows)
+STATEMENT = '''
+import time
+start = time.perf_counter()
+{imports}
+import lammpshade
+lammpshade.Simulation
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+except ImportError:
+    rss = -1
+print(elapsed, rss)
+'''
+
+SCENARIOS = [
+    ('lazy (Simulation only)', ''),
+    ('eager (previous behavior)',
+     'import numpy, pandas, matplotlib, matplotlib.pyplot'),
+]
+
+
+def run(imports, repeat):
+    """
+    Returns the median import time (s) and peak RSS (kB on Linux) of a
+    scenario over several fresh interpreters.
+    """
+    times, rss = [], []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', STATEMENT.format(imports=imports)],
+            check=True, capture_output=True, text=True).stdout.split()
+        times.append(float(output[0]))
+        rss.append(int(output[1]))
+    return statistics.median(times), statistics.median(rss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for name, imports in SCENARIOS:
+        elapsed, rss = run(imports, args.repeat)
+        line = f'{name:28s} {elapsed * 1000:8.1f} ms'
+        if rss >= 0:
+            line += f'   peak RSS {rss / 1024:7.1f} MB'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
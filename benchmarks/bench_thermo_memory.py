@@ -0,0 +1,80 @@
+"""
+Memory report of the storage of the thermo data: the list of rows used
+before against ThermoBuffer, for the accumulation and the DataFrame.
+
+Usage:
+    python benchmarks/bench_thermo_memory.py [--rows N] [--columns N]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+import pandas as pd
+
+from lammpshade.ThermoBuffer import ThermoBuffer
+
+
+def make_rows(n_rows, n_columns, seed=0):
+    """
+    Yields deterministic rows of thermo data: the step, the time and floats.
+    """
+    rng = random.Random(seed)
+    for i in range(n_rows):
+        yield [i * 20, i] + [rng.uniform(-500, 500)
+                             for _ in range(n_columns - 2)]
+
+
+def list_path(rows, keywords):
+    """
+    Accumulates the rows the way Simulation did before ThermoBuffer.
+    """
+    data = []
+    for row in rows:
+        data.append(row)
+    return data, pd.DataFrame(data, columns=keywords)
+
+
+def buffer_path(rows, keywords):
+    """
+    Accumulates the rows in a ThermoBuffer.
+    """
+    data = ThermoBuffer(keywords)
+    data.extend(rows)
+    return data, data.to_dataframe()
+
+
+def measure(function, args, keywords):
+    """
+    Returns the memory held by the store, the peak memory and the time of an
+    accumulation function.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    store, thermo = function(make_rows(args.rows, args.columns), keywords)
+    elapsed = time.perf_counter() - start
+    del thermo
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return held, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--columns', type=int, default=17)
+    args = parser.parse_args()
+    keywords = ['Step', 'Time'] + [f'v_{i}' for i in range(args.columns - 2)]
+
+    print(f'{args.rows} rows, {args.columns} columns '
+          f'({args.rows * args.columns * 8 / 1e6:.1f} MB of float64)')
+    for name, function in [('list of rows', list_path),
+                           ('ThermoBuffer', buffer_path)]:
+        held, peak, elapsed = measure(function, args, keywords)
+        print(f'{name:14s} store {held / 1e6:9.1f} MB   '
+              f'peak {peak / 1e6:9.1f} MB   {elapsed:7.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark of the conversion of the values of a LAMMPS YAML dump: the
+element-by-element checks used before (isdigit, '.' in value, float() in a
+try) against Tokenizer, on the thermo and atom lines of a dump.
+
+Usage:
+    python benchmarks/bench_tokenizer.py [dump.yaml] [--atoms N]
+        [--repeat N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from generate_yaml import generate
+from lammpshade.Tokenizer import Tokenizer
+
+
+def legacy_convert(value):
+    """
+    Converts a value the way YAMLReader.convert_value did before Tokenizer.
+    """
+    value = value.strip()
+    if value.isdigit() or (value.startswith('-') and value[1:].isdigit()):
+        return int(value)
+    if '.' in value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    if value.startswith('[') and value.endswith(']'):
+        elements = []
+        for element in value[1:-1].split(','):
+            element = element.strip()
+            converted = legacy_convert(element) if element else element
+            if not isinstance(converted, list) and converted != '':
+                elements.append(converted)
+        return elements
+    return value
+
+
+def read_lines(path):
+    """
+    Returns the values of the thermo data lines of a dump and of the atom
+    rows of its first frame.
+    """
+    thermo, atoms = [], []
+    first_frame = True
+    with open(path, 'r') as file:
+        for line in file:
+            if line.startswith('  - data:'):
+                thermo.append(line.split(':', 1)[1].replace(' ', '').strip())
+            elif line.startswith('  - [') and first_frame:
+                atoms.append(line.split('- ', 1)[1].strip())
+            elif line.startswith('...'):
+                first_frame = False
+    return thermo, atoms
+
+
+def timed(function, values, repeat):
+    """
+    Returns the best time of converting the values with a function.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            function(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('dump', nargs='?', help='LAMMPS YAML dump')
+    parser.add_argument('--atoms', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = args.dump
+        if path is None:
+            path = os.path.join(workdir, 'dump.yaml')
+            generate(path, args.atoms, 50)
+        thermo, atoms = read_lines(path)
+
+    for name, values, key in [('thermo lines', thermo, 'thermo'),
+                              ('atom rows', atoms, 'data')]:
+        tokenizer = Tokenizer()
+        assert [tokenizer.convert(value, key) for value in values] == \
+            [legacy_convert(value) for value in values]
+        legacy = timed(legacy_convert, values, args.repeat)
+        new = timed(lambda value: tokenizer.convert(value, key), values,
+                    args.repeat)
+        per_line = 1e6 / len(values)
+        print(f'{name:12s} {len(values):7d} lines   '
+              f'legacy {legacy * per_line:6.2f} us/line   '
+              f'Tokenizer {new * per_line:6.2f} us/line   '
+              f'{legacy / new:5.2f}x')
+
+
+if __name__ == '__main__':
+    main()
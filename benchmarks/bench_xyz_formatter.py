@@ -0,0 +1,97 @@
+"""
+Benchmark of the formatting of the atom data of an XYZ frame: the pandas
+path used before (DataFrame + filter + to_csv for every frame) against
+FrameFormatter, with list-of-lists and NumPy structured array inputs.
+
+Usage:
+    python benchmarks/bench_xyz_formatter.py [--atoms N] [--frames N]
+"""
+import argparse
+import io
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from lammpshade.FrameFormatter import FrameFormatter
+from lammpshade.XYZWriter import XYZWriter
+
+KEYWORDS = ['id', 'type', 'mass', 'element', 'x', 'y', 'z', 'vx', 'vy', 'vz',
+            'fx', 'fy', 'fz']
+
+
+def make_frame(n_atoms, seed=0):
+    """
+    Returns a deterministic frame of atom data as a list of lists.
+    """
+    rng = random.Random(seed)
+    return [[i + 1, 1 + i % 2, 12.016, 'C' if i % 2 else 'H2']
+            + [round(rng.uniform(-50, 50), 6) for _ in range(9)]
+            for i in range(n_atoms)]
+
+
+def to_array(data):
+    """
+    Converts a frame of atom data to a NumPy structured array.
+    """
+    columns = list(zip(*data))
+    array = np.empty(len(data), dtype=[
+        (keyword, np.array(column).dtype)
+        for keyword, column in zip(KEYWORDS, columns)
+    ])
+    for keyword, column in zip(KEYWORDS, columns):
+        array[keyword] = column
+    return array
+
+
+def pandas_path(data):
+    """
+    Formats a frame the way XYZWriter did before FrameFormatter.
+    """
+    buffer = io.StringIO()
+    atoms_df = pd.DataFrame(data, columns=KEYWORDS)
+    atoms_df = atoms_df.filter(XYZWriter.ATOM_KEYWORDS, axis=1)
+    atoms_df.to_csv(buffer, mode='a', index=False, header=False, sep=" ",
+                    lineterminator='\n')
+    return buffer.getvalue()
+
+
+def timed(function, data, frames):
+    """
+    Returns the frames per second of a formatting function.
+    """
+    start = time.perf_counter()
+    for _ in range(frames):
+        function(data)
+    return frames / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--atoms', type=int, default=20000)
+    parser.add_argument('--frames', type=int, default=20)
+    args = parser.parse_args()
+
+    data = make_frame(args.atoms)
+    array = to_array(data)
+    formatter = FrameFormatter(XYZWriter.ATOM_KEYWORDS)
+
+    def format_list(frame):
+        return formatter.format(frame, KEYWORDS)
+
+    # The new path must produce the same text as the old one
+    assert format_list(data) == pandas_path(data)
+    assert format_list(array) == pandas_path(data)
+
+    print(f'{args.atoms} atoms, {args.frames} frames')
+    for name, function, frame in [
+            ('pandas DataFrame + to_csv', pandas_path, data),
+            ('FrameFormatter (list of lists)', format_list, data),
+            ('FrameFormatter (structured array)', format_list, array)]:
+        print(f'{name:36s} {timed(function, frame, args.frames):8.2f} '
+              'frames/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Deterministic generator of synthetic LAMMPS YAML dumps, with the layout of
+the files written by 'dump yaml' and 'dump_modify thermo yes'.
+
+Usage:
+    python benchmarks/generate_yaml.py OUTPUT [--atoms N] [--frames N]
+        [--columns id,type,element,x,y,z] [--thermo-width N] [--seed N]
+"""
+import argparse
+import random
+
+# Atom columns written by default
+DEFAULT_COLUMNS = ['id', 'type', 'mass', 'element', 'x', 'y', 'z', 'vx',
+                   'vy', 'vz', 'fx', 'fy', 'fz']
+# Elements and masses of the atom types
+ELEMENTS = [('C', 12.011), ('H', 1.008), ('O', 15.999), ('N', 14.007)]
+BOX = [(0.0, 53.116896629333496), (0.0, 52.572092056274414),
+       (0.43933719493705575, 96.33734401328508)]
+
+
+def atom_value(keyword, i, rng):
+    """
+    Returns the text of the value of an atom column.
+    """
+    atom_type = i % len(ELEMENTS)
+    if keyword == 'id':
+        return str(i + 1)
+    if keyword == 'type':
+        return str(atom_type + 1)
+    if keyword == 'element':
+        return ELEMENTS[atom_type][0]
+    if keyword == 'mass':
+        return f'{ELEMENTS[atom_type][1]:g}'
+    if keyword in ('x', 'y', 'z'):
+        low, high = BOX['xyz'.index(keyword)]
+        return f'{rng.uniform(low, high):g}'
+    return f'{rng.gauss(0, 1):g}'
+
+
+def write_frame(file, timestep, n_atoms, columns, thermo_keywords, rng):
+    """
+    Writes one YAML document (frame) of the dump.
+    """
+    thermo = [str(timestep), str(timestep // 20)] + [
+        repr(rng.uniform(-500, 500)) for _ in thermo_keywords[2:]]
+    file.write('---\ncreator: LAMMPS\n'
+               f'timestep: {timestep}\nunits: real\ntime: {timestep // 20}\n'
+               f'natoms: {n_atoms}\nboundary: [ p, p, p, p, s, s, ]\n'
+               'thermo:\n'
+               f'  - keywords: [ {", ".join(thermo_keywords)}, ]\n'
+               f'  - data: [ {", ".join(thermo)}, ]\n'
+               'box:\n')
+    for low, high in BOX:
+        file.write(f'  - [ {low!r}, {high!r} ]\n')
+    file.write(f'keywords: [ {", ".join(columns)}, ]\ndata:\n')
+    rows = []
+    for i in range(n_atoms):
+        values = ' , '.join(atom_value(keyword, i, rng)
+                            for keyword in columns)
+        rows.append(f'  - [ {values}, ]\n')
+    file.write(''.join(rows))
+    file.write('...\n')
+
+
+def generate(output, atoms=1000, frames=10, columns=None, thermo_width=17,
+             seed=0):
+    """
+    Writes a synthetic LAMMPS YAML dump. The same arguments always produce
+    the same file.
+
+    Parameters
+    ----------
+    output : str
+        The path to the YAML file to write.
+    atoms : int, optional
+        The number of atoms of each frame. Default is 1000.
+    frames : int, optional
+        The number of frames. Default is 10.
+    columns : list, optional
+        The atom keywords. Defaults to DEFAULT_COLUMNS.
+    thermo_width : int, optional
+        The number of thermo keywords (at least 2: Step and Time).
+        Default is 17.
+    seed : int, optional
+        The seed of the random values. Default is 0.
+
+    Returns
+    -------
+    None
+    """
+    columns = list(columns or DEFAULT_COLUMNS)
+    thermo_keywords = ['Step', 'Time'] + [
+        f'v_thermo{i}' for i in range(max(thermo_width, 2) - 2)]
+    rng = random.Random(seed)
+    with open(output, 'w') as file:
+        for frame in range(frames):
+            write_frame(file, frame * 20, atoms, columns, thermo_keywords,
+                        rng)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('output')
+    parser.add_argument('--atoms', type=int, default=1000)
+    parser.add_argument('--frames', type=int, default=10)
+    parser.add_argument('--columns', default=','.join(DEFAULT_COLUMNS))
+    parser.add_argument('--thermo-width', type=int, default=17)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    generate(args.output, args.atoms, args.frames, args.columns.split(','),
+             args.thermo_width, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+"""
+Benchmark suite of the readers and writers of lammpshade on a synthetic
+LAMMPS YAML dump, reporting MB/s, frames/s and peak RSS of each scenario.
+
+Every scenario runs in a fresh interpreter, so that its peak RSS is not
+affected by the other ones. The results can be saved as JSON and compared
+with a previous run to detect regressions.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--atoms N] [--frames N]
+        [--columns id,type,element,x,y,z] [--thermo-width N]
+        [--scenarios name,...] [--output results.json]
+        [--compare baseline.json]
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows: the peak RSS is not reported
+    resource = None
+
+# pandas is imported here so that its import time is not measured
+import pandas  # noqa: F401
+
+from generate_yaml import DEFAULT_COLUMNS, generate
+from lammpshade.BinaryWriter import BinaryWriter
+from lammpshade.Constructor import Simulation
+from lammpshade.XYZWriter import XYZWriter
+from lammpshade.YAMLReader import YAMLReader
+
+
+def read_steps(path, workdir, use_mmap=False):
+    """
+    Reads every step with YAMLReader.get_next_step.
+    """
+    reader = YAMLReader(path, use_mmap=use_mmap)
+    frames = 0
+    while reader.get_next_step():
+        frames += 1
+    return os.path.getsize(path), frames
+
+
+def read_steps_mmap(path, workdir):
+    """
+    Reads every step with YAMLReader.get_next_step through a memory map.
+    """
+    return read_steps(path, workdir, use_mmap=True)
+
+
+def get_thermodata(path, workdir):
+    """
+    Collects the thermo data with Simulation.get_thermodata.
+    """
+    thermo = Simulation(path).get_thermodata()
+    return os.path.getsize(path), 0 if thermo is None else len(thermo)
+
+
+def convert_to_xyz(path, workdir, **kwargs):
+    """
+    Converts the dump with Simulation.convert_to_xyz.
+    """
+    simulation = Simulation(path)
+    simulation.convert_to_xyz(os.path.join(workdir, 'output.xyz'), **kwargs)
+    frames = 0 if simulation.thermo_data is None else \
+        len(simulation.thermo_data)
+    return os.path.getsize(path), frames
+
+
+def convert_to_xyz_prefetch(path, workdir):
+    """
+    Converts the dump with Simulation.convert_to_xyz, parsing the steps in
+    a background thread.
+    """
+    return convert_to_xyz(path, workdir, prefetch=4)
+
+
+def write_steps(path, writer):
+    """
+    Writes the steps of the dump, parsed beforehand one at a time, with the
+    write_to_xyz method of a writer. Only the writing is timed.
+    """
+    elapsed = 0.0
+    frames = 0
+    with writer:
+        for step in YAMLReader(path):
+            start = time.perf_counter()
+            writer.write_to_xyz(step)
+            elapsed += time.perf_counter() - start
+            frames += 1
+    return frames, elapsed
+
+
+def write_to_xyz(path, workdir):
+    """
+    Writes the steps of the dump with XYZWriter.write_to_xyz. The throughput
+    is measured on the output.
+    """
+    output = os.path.join(workdir, 'output.xyz')
+    frames, elapsed = write_steps(path, XYZWriter(output))
+    return os.path.getsize(output), frames, elapsed
+
+
+def write_to_npy(path, workdir):
+    """
+    Writes the steps of the dump as a binary trajectory with
+    BinaryWriter.write_to_xyz. The throughput is measured on the XYZ output
+    of the same frames, so that the MB/s compare with write_to_xyz.
+    """
+    output = os.path.join(workdir, 'output.xyz')
+    with XYZWriter(output) as writer:
+        for step in YAMLReader(path):
+            writer.write_to_xyz(step)
+    frames, elapsed = write_steps(
+        path, BinaryWriter(os.path.join(workdir, 'output.npy')))
+    return os.path.getsize(output), frames, elapsed
+
+
+SCENARIOS = {
+    'read_steps': read_steps,
+    'read_steps_mmap': read_steps_mmap,
+    'get_thermodata': get_thermodata,
+    'convert_to_xyz': convert_to_xyz,
+    'convert_to_xyz_prefetch': convert_to_xyz_prefetch,
+    'write_to_xyz': write_to_xyz,
+    'write_to_npy': write_to_npy,
+}
+
+
+def run_child(name, path):
+    """
+    Runs a scenario in this interpreter and prints its result as JSON.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            result = SCENARIOS[name](path, workdir)
+        elapsed = time.perf_counter() - start
+    if len(result) == 3:
+        # The scenario timed itself
+        elapsed = result[2]
+    size, frames = result[:2]
+    rss_mb = None
+    if resource is not None:
+        # ru_maxrss is in kB on Linux and in bytes on macOS
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rss_mb = rss / 2 ** 20 if sys.platform == 'darwin' else rss / 2 ** 10
+    print(json.dumps({
+        'scenario': name, 'seconds': elapsed, 'frames': frames,
+        'mb_per_s': size / 1e6 / elapsed, 'frames_per_s': frames / elapsed,
+        'peak_rss_mb': rss_mb,
+    }))
+
+
+def run_scenario(name, path):
+    """
+    Runs a scenario in a fresh interpreter and returns its result.
+    """
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', name, path],
+        check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def compare(results, baseline_path):
+    """
+    Prints the throughput of the results relative to a baseline.
+    """
+    with open(baseline_path, 'r') as file:
+        baseline = {result['scenario']: result
+                    for result in json.load(file)['results']}
+    print(f'\nRelative to {baseline_path}:')
+    for result in results:
+        reference = baseline.get(result['scenario'])
+        if reference:
+            ratio = result['mb_per_s'] / reference['mb_per_s']
+            line = f"{result['scenario']:24s} {ratio:6.2f}x MB/s"
+            if None not in (result['peak_rss_mb'], reference['peak_rss_mb']):
+                rss = result['peak_rss_mb'] - reference['peak_rss_mb']
+                line += f"   peak RSS {rss:+8.1f} MB"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--atoms', type=int, default=20000)
+    parser.add_argument('--frames', type=int, default=10)
+    parser.add_argument('--columns', default=','.join(DEFAULT_COLUMNS))
+    parser.add_argument('--thermo-width', type=int, default=17)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--output', help='path of the JSON results')
+    parser.add_argument('--compare', help='path of baseline JSON results')
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+
+    config = {'atoms': args.atoms, 'frames': args.frames,
+              'columns': args.columns.split(','),
+              'thermo_width': args.thermo_width}
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'dump.yaml')
+        generate(path, args.atoms, args.frames, config['columns'],
+                 args.thermo_width)
+        size = os.path.getsize(path)
+        print(f"{args.atoms} atoms, {args.frames} frames, "
+              f"{size / 1e6:.1f} MB")
+        for name in args.scenarios.split(','):
+            result = run_scenario(name, path)
+            results.append(result)
+            line = (f"{name:24s} {result['mb_per_s']:8.2f} MB/s "
+                    f"{result['frames_per_s']:8.2f} frames/s")
+            if result['peak_rss_mb'] is not None:
+                line += f"   peak RSS {result['peak_rss_mb']:7.1f} MB"
+            print(line)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'config': config, 'python': platform.python_version(),
+                       'results': results}, file, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
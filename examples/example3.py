@@ -5,7 +5,12 @@ import lammpshade as lp
 # Load the YAML file
 sim = lp.Simulation("input_example.yaml")
 
-# Get next step data from the simulation file
-while True:
-    step_data = sim.file.get_next_step()
-    print(step_data)
+# Iterate over the steps of the simulation file
+with sim.file as steps:
+    for step_data in steps:
+        print(step_data)
+
+# Read only every 10th step of a new reader, skipping the others
+with lp.YAMLReader("input_example.yaml") as reader:
+    for step_data in reader.iter_steps(stride=10):
+        print(step_data['timestep'])
@@ -0,0 +1,178 @@
+"""
+This module provides the selection of the atoms of the steps by id, type,
+element or by an expression on their columns.
+"""
+import itertools
+import numpy as np
+
+
+class AtomFilter:
+    """
+    A class to select the atoms of the steps. The atoms are selected by id
+    (a set of ids or a range), by type, by element and by a vectorized
+    expression on their columns (e.g. the atoms above a plane), the atoms
+    kept being those matching every given criterion. The criteria are
+    evaluated on whole columns with NumPy, and the rows of the other atoms
+    are dropped from the atom data of the steps.
+
+    ...
+
+    Attributes
+    ----------
+    ids : set or range
+        The ids of the atoms to keep (None to keep all the ids).
+    types : set
+        The types of the atoms to keep (None to keep all the types).
+    elements : set
+        The elements of the atoms to keep (None to keep all the elements).
+    where : callable
+        The expression selecting the atoms, called with a dictionary of the
+        where_columns as NumPy arrays and returning a boolean array (None to
+        keep all the atoms).
+    columns : list
+        The atom keywords needed to evaluate the criteria.
+
+    Methods
+    -------
+    __init__(ids=None, types=None, elements=None, where=None,
+             where_columns=('x', 'y', 'z'))
+        Initializes an AtomFilter object.
+    mask(columns)
+        Returns the boolean mask of the atoms to keep.
+    apply(data, keywords)
+        Returns the rows of the atoms to keep.
+    """
+
+    def __init__(self, ids=None, types=None, elements=None, where=None,
+                 where_columns=('x', 'y', 'z')):
+        """
+        Initializes an AtomFilter object.
+
+        Parameters
+        ----------
+        ids : iterable or range, optional
+            The ids of the atoms to keep, e.g. {1, 5, 8} or range(1, 1001).
+            Default is None (all the ids).
+        types : iterable, optional
+            The types of the atoms to keep. Default is None (all the types).
+        elements : iterable, optional
+            The elements of the atoms to keep, e.g. ['O', 'H'].
+            Default is None (all the elements).
+        where : callable, optional
+            The expression selecting the atoms, e.g.
+            lambda atoms: atoms['z'] > 40. It is called with a dictionary of
+            the where_columns as NumPy arrays and returns a boolean array.
+            With several workers, it must be picklable (e.g. a function
+            defined at the top level of a module). Default is None.
+        where_columns : sequence, optional
+            The atom keywords used by the expression.
+            Default is ('x', 'y', 'z').
+        """
+        # Ids of the atoms to keep, ranges are kept as such
+        self.ids = ids if ids is None or isinstance(ids, range) \
+            else set(ids)
+        self.types = None if types is None else set(types)
+        self.elements = None if elements is None else set(elements)
+        self.where = where  # Expression selecting the atoms
+        # Atom keywords needed by the criteria
+        self.columns = [name for name, criterion in
+                        (('id', self.ids), ('type', self.types),
+                         ('element', self.elements))
+                        if criterion is not None]
+        if where is not None:
+            self.columns += [name for name in where_columns
+                             if name not in self.columns]
+
+    def __repr__(self):
+        where = self.where if self.where is None else \
+            f'{self.where.__module__}.{self.where.__qualname__}'
+        return (f'AtomFilter(ids={self.ids!r}, types={self.types!r}, '
+                f'elements={self.elements!r}, where={where})')
+
+    def mask(self, columns):
+        """
+        Returns the boolean mask of the atoms to keep.
+
+        Parameters
+        ----------
+        columns : dict
+            The atom columns needed by the criteria (see the columns
+            attribute), as sequences of the same length.
+
+        Returns
+        -------
+        mask : numpy.ndarray
+            A boolean array, True for the atoms to keep.
+        """
+        mask = None
+        for name, criterion in (('id', self.ids), ('type', self.types),
+                                ('element', self.elements)):
+            if criterion is None:
+                continue
+            values = np.asarray(columns[name])
+            if isinstance(criterion, range):
+                selected = self._in_range(values, criterion)
+            else:
+                selected = np.isin(values, list(criterion))
+            mask = selected if mask is None else mask & selected
+        if self.where is not None:
+            arrays = {name: np.asarray(columns[name])
+                      for name in self.columns}
+            selected = np.asarray(self.where(arrays), dtype=bool)
+            mask = selected if mask is None else mask & selected
+        if mask is None:
+            # No criterion, every atom is kept
+            length = len(next(iter(columns.values()))) if columns else 0
+            mask = np.ones(length, dtype=bool)
+        return mask
+
+    def apply(self, data, keywords):
+        """
+        Returns the rows of the atoms to keep.
+
+        Parameters
+        ----------
+        data : list or numpy.ndarray
+            The atom rows of a step, as a list of lists or a NumPy
+            structured array.
+        keywords : list
+            The atom keywords of the rows.
+
+        Returns
+        -------
+        data : list or numpy.ndarray
+            The rows of the atoms to keep, of the same kind as data.
+
+        Raises
+        ------
+        KeyError
+            If a keyword needed by the criteria is not found in the keywords.
+        """
+        missing = [name for name in self.columns if name not in keywords]
+        if missing:
+            raise KeyError(f"Atom keywords {missing} of the atom filter are "
+                           f"not found in the step dictionary")
+
+        if hasattr(data, 'dtype'):
+            return data[self.mask({name: data[name]
+                                   for name in self.columns})]
+        if not data:
+            return data
+        columns = {name: [row[keywords.index(name)] for row in data]
+                   for name in self.columns}
+        return list(itertools.compress(data, self.mask(columns)))
+
+    @staticmethod
+    def _in_range(values, ids):
+        """
+        Returns the mask of the values that are in a range, without
+        expanding it.
+        """
+        if ids.step < 0:
+            ids = ids[::-1]
+        if not ids:
+            return np.zeros(len(values), dtype=bool)
+        selected = (values >= ids.start) & (values < ids.stop)
+        if ids.step != 1:
+            selected &= (values - ids.start) % ids.step == 0
+        return selected
@@ -0,0 +1,340 @@
+"""
+This module provides a transposed store of the atom columns of a trajectory,
+with one time series per atom, so that following an atom through the frames
+is a slice of a memory-mapped array instead of a scan of the trajectory.
+"""
+import json
+import os
+import numpy as np
+from lammpshade.BinaryWriter import BinaryWriter
+
+
+class AtomSeries:
+    """
+    A class to write and read the time series of the atoms of a simulation.
+    The store is a directory with one NumPy file per atom keyword (e.g.
+    x.npy), of shape (atoms, frames): the values of an atom in every frame
+    are contiguous. The atoms are sorted by id (ids.npy), and the header of
+    each frame is stored in a table (frames.npy, see
+    BinaryWriter.FRAME_DTYPE). The boundary flags and the units of the first
+    frame are stored with the layout of the store in series.json.
+
+    The steps are written in one streaming pass, like with XYZWriter: the
+    store is used as a context manager and the steps are written with
+    write_step. The number of frames is given beforehand so that the arrays
+    are allocated once, and the frames are gathered in blocks before being
+    written, so that each block writes one contiguous run of values per
+    atom. The atoms are those of the first frame: the atoms missing from a
+    frame have NaN values, and the atoms that are not in the first frame
+    are ignored.
+
+    ...
+
+    Attributes
+    ----------
+    path : str
+        The path to the store directory.
+    fields : list
+        The atom keywords stored, in order.
+    columns : list
+        The atom keywords read from the steps (the fields and 'id').
+    n_frames : int
+        The number of frames allocated when writing, or stored when loaded.
+    block_frames : int
+        The number of frames gathered before being written.
+    ids : numpy.ndarray
+        The sorted ids of the atoms (None before the first frame).
+    frames : numpy.ndarray
+        The header table of the frames.
+    series : dict
+        The arrays of the fields, of shape (atoms, frames).
+    boundary : list
+        The boundary flags of the first frame (None if missing).
+    units : str
+        The units of the first frame (None if missing).
+
+    Methods
+    -------
+    __init__(path, fields=('x', 'y', 'z'), n_frames=0, block_frames=256,
+             dtype='f8')
+        Initializes an AtomSeries object.
+    __enter__()
+        Starts writing the store when the object is used as a context
+        manager.
+    __exit__()
+        Writes the last frames and the tables of the store.
+    __len__()
+        Returns the number of frames written or stored.
+    write_step(step)
+        Writes the atom columns of a step as the next frame.
+    load(path, mmap_mode='r')
+        Loads a store.
+    get(ids, field=None)
+        Returns the time series of some atoms.
+    rows(ids)
+        Returns the rows of some atoms in the arrays.
+    """
+
+    VERSION = 1  # Version of the store format
+
+    def __init__(self, path, fields=('x', 'y', 'z'), n_frames=0,
+                 block_frames=256, dtype='f8'):
+        """
+        Initializes an AtomSeries object.
+
+        Parameters
+        ----------
+        path : str
+            The path to the store directory.
+        fields : sequence, optional
+            The atom keywords stored. Default is ('x', 'y', 'z').
+        n_frames : int, optional
+            The number of frames to allocate (e.g. the number of steps of
+            the index of the YAML file). Default is 0.
+        block_frames : int, optional
+            The number of frames gathered before being written.
+            Default is 256.
+        dtype : str, optional
+            The dtype of the stored values. It must be a float type, to
+            store NaN for missing atoms. Default is 'f8'.
+        """
+        self.path = path  # Path to the store directory
+        self.fields = list(fields)  # Atom keywords stored
+        # Atom keywords read from the steps
+        self.columns = self.fields + ['id'] * ('id' not in self.fields)
+        self.n_frames = n_frames  # Frames allocated or stored
+        self.block_frames = max(int(block_frames), 1)  # Frames per block
+        self.dtype = np.dtype(dtype)  # Dtype of the stored values
+        self.ids = None  # Sorted ids of the atoms
+        self.frames = []  # Header rows of the frames
+        self.series = {}  # Arrays of the fields, of shape (atoms, frames)
+        self.boundary = None  # Boundary flags of the first frame
+        self.units = None  # Units of the first frame
+        self._block = None  # Frames gathered before being written
+        self._size = 0  # Frames gathered in the block
+        self._written = 0  # Frames written to the arrays
+
+    def __enter__(self):
+        """
+        Starts writing the store when the object is used as a context
+        manager.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        self.frames = []
+        self._written = 0
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Writes the last frames gathered and the tables of the store.
+        """
+        self._flush()
+        for array in self.series.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+        np.save(os.path.join(self.path, 'frames.npy'),
+                np.array(self.frames, dtype=BinaryWriter.FRAME_DTYPE))
+        if self.ids is not None:
+            np.save(os.path.join(self.path, 'ids.npy'), self.ids)
+        self.n_frames = self._written
+        state = {'version': self.VERSION, 'fields': self.fields,
+                 'dtype': self.dtype.str, 'n_frames': self.n_frames,
+                 'boundary': self.boundary, 'units': self.units}
+        with open(os.path.join(self.path, 'series.json'), 'w') as file:
+            json.dump(state, file)
+
+    def __len__(self):
+        return self._written + self._size
+
+    def write_step(self, step):
+        """
+        Writes the atom columns of a step as the next frame.
+
+        Parameters
+        ----------
+        step : dict
+            A dictionary containing the data of the step. It should AT LEAST
+            contain the 'keywords' and 'data' keys, with 'id' and the stored
+            fields in the atom keywords.
+
+        Raises
+        ------
+        KeyError
+            If the atom data, the atom ids or a stored field is not found in
+            the step.
+        ValueError
+            If more frames than allocated are written, or if the ids of the
+            first frame are not unique.
+        """
+        for key in ('keywords', 'data'):
+            if key not in step:
+                raise KeyError(f"'{key}' is not found in the step dictionary")
+        keywords = step['keywords']
+        missing = [name for name in self.columns if name not in keywords]
+        if missing:
+            raise KeyError(f"Atom keywords {missing} are not found in the "
+                           f"step dictionary")
+        if len(self) >= self.n_frames:
+            raise ValueError(f"The store was allocated for {self.n_frames} "
+                             f"frames.")
+
+        columns = self._columns(step['data'], keywords)
+        ids = np.asarray(columns['id'], dtype=np.int64)
+        if self.ids is None:
+            self._allocate(step, ids)
+
+        # Rows of the atoms of the step in the arrays
+        if len(ids) == len(self.ids) and np.array_equal(ids, self.ids):
+            rows, order = slice(None), slice(None)
+        else:
+            order = np.argsort(ids, kind='stable')
+            rows = np.searchsorted(self.ids, ids[order])
+            found = rows < len(self.ids)
+            found[found] = self.ids[rows[found]] == ids[order][found]
+            rows, order = rows[found], order[found]
+            self._block[:, :, self._size] = np.nan
+
+        for i, field in enumerate(self.fields):
+            self._block[i, rows, self._size] = \
+                np.asarray(columns[field], dtype=self.dtype)[order]
+        self.frames.append(BinaryWriter.frame_row(step))
+        self._size += 1
+        if self._size == self.block_frames:
+            self._flush()
+
+    @staticmethod
+    def load(path, mmap_mode='r'):
+        """
+        Loads a store.
+
+        Parameters
+        ----------
+        path : str
+            The path to the store directory.
+        mmap_mode : str, optional
+            The mode of the memory maps of the arrays (see numpy.load), or
+            None to read them in memory. Default is 'r'.
+
+        Returns
+        -------
+        series : AtomSeries
+            The store, with its ids, frames and arrays.
+        """
+        with open(os.path.join(path, 'series.json'), 'r') as file:
+            state = json.load(file)
+        series = AtomSeries(path, state['fields'], state['n_frames'],
+                            dtype=state['dtype'])
+        series._written = state['n_frames']
+        series.boundary = state['boundary']
+        series.units = state['units']
+        series.frames = np.load(os.path.join(path, 'frames.npy'))
+        ids_path = os.path.join(path, 'ids.npy')
+        series.ids = np.load(ids_path) if os.path.exists(ids_path) else \
+            np.empty(0, dtype=np.int64)
+        for field in series.fields:
+            # The arrays may have been allocated for more frames
+            array = np.load(os.path.join(path, field + '.npy'),
+                            mmap_mode=mmap_mode) \
+                if series.ids.size else np.empty((0, 0), series.dtype)
+            series.series[field] = array[:, :series.n_frames]
+        return series
+
+    def get(self, ids, field=None):
+        """
+        Returns the time series of some atoms.
+
+        Parameters
+        ----------
+        ids : int or sequence
+            The id of an atom, or the ids of several atoms.
+        field : str, optional
+            The atom keyword. Defaults to None (all the fields).
+
+        Returns
+        -------
+        numpy.ndarray or dict
+            The values of the field, of shape (frames,) for an id and
+            (atoms, frames) for several ids, or a dictionary of them by
+            field if no field is given.
+        """
+        rows = self.rows(ids)
+        if field is not None:
+            return np.asarray(self.series[field][rows])
+        return {name: np.asarray(self.series[name][rows])
+                for name in self.fields}
+
+    def rows(self, ids):
+        """
+        Returns the rows of some atoms in the arrays.
+
+        Parameters
+        ----------
+        ids : int or sequence
+            The id of an atom, or the ids of several atoms.
+
+        Returns
+        -------
+        int or numpy.ndarray
+            The row of the atom, or the rows of the atoms.
+
+        Raises
+        ------
+        KeyError
+            If an atom is not found in the store.
+        """
+        wanted = np.asarray(ids, dtype=np.int64)
+        rows = np.searchsorted(self.ids, wanted)
+        if len(self.ids):
+            found = (rows < len(self.ids)) & \
+                (self.ids[np.minimum(rows, len(self.ids) - 1)] == wanted)
+        else:
+            found = np.zeros(wanted.shape, dtype=bool)
+        if not np.all(found):
+            missing = np.atleast_1d(wanted)[~np.atleast_1d(found)]
+            raise KeyError(f"Atoms {missing.tolist()} are not found in the "
+                           f"store")
+        return int(rows) if rows.ndim == 0 else rows
+
+    def _allocate(self, step, ids):
+        """
+        Allocates the arrays of the store for the atoms of the first frame.
+        """
+        self.ids = np.sort(ids)
+        if np.any(self.ids[1:] == self.ids[:-1]):
+            raise ValueError("The atom ids of the first frame are not "
+                             "unique.")
+        boundary = step.get('boundary')
+        self.boundary = boundary if isinstance(boundary, list) else None
+        units = step.get('units')
+        self.units = units if isinstance(units, str) else None
+        for field in self.fields:
+            self.series[field] = np.lib.format.open_memmap(
+                os.path.join(self.path, field + '.npy'), mode='w+',
+                dtype=self.dtype, shape=(len(self.ids), self.n_frames)) \
+                if len(self.ids) else np.empty((0, self.n_frames), self.dtype)
+        self._block = np.empty((len(self.fields), len(self.ids),
+                                self.block_frames), dtype=self.dtype)
+
+    def _flush(self):
+        """
+        Writes the frames gathered in the block to the arrays.
+        """
+        if not self._size:
+            return
+        start, stop = self._written, self._written + self._size
+        for i, field in enumerate(self.fields):
+            self.series[field][:, start:stop] = self._block[i, :, :self._size]
+        self._written = stop
+        self._size = 0
+
+    def _columns(self, data, keywords):
+        """
+        Returns the columns of the atom data (list of lists or NumPy
+        structured array) read from the steps.
+        """
+        if hasattr(data, 'dtype'):
+            return {name: data[name] for name in self.columns}
+        transposed = list(zip(*data)) if len(data) else \
+            [()] * len(keywords)
+        return {name: transposed[keywords.index(name)]
+                for name in self.columns}
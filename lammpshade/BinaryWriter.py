@@ -0,0 +1,318 @@
+"""
+This module contains the BinaryWriter class for writing the atom coordinates
+of the steps as a binary trajectory of NumPy files, which can be memory-mapped
+by downstream tools.
+"""
+import os
+import struct
+import numpy as np
+
+
+class BinaryWriter:
+    """
+    A class used to write the steps of a simulation as a binary trajectory.
+    It has the same interface as XYZWriter: it is used as a context manager
+    and the steps are written with write_to_xyz (or its alias write_step).
+
+    The trajectory is made of three NumPy files:
+    - <name>.npy: the float32 frames, of shape (frames, atoms, fields), with
+      a fixed stride. The frames are appended to the file as they are
+      written, and the shape in the header is updated when the file is
+      closed, so that it can be loaded with numpy.load(mmap_mode='r').
+    - <name>.frames.npy: a structured array with one row per frame (timestep,
+      time, natoms and box bounds, NaN when missing).
+    - <name>.atoms.npy: a structured array with the id, type and element of
+      the atoms of the first frame (the fields found in the step).
+    The rows of each frame are sorted by atom id when the ids are present, so
+    that an atom has the same position in every frame.
+
+    ...
+
+    Attributes
+    ----------
+    filepath : str
+        The path to the frames file (.npy).
+    frames_path : str
+        The path to the frame header table.
+    atoms_path : str
+        The path to the atom table.
+    fields : list
+        The atom keywords stored in the frames, in order.
+    columns : list
+        The atom keywords read from the steps (the fields and the keywords
+        of the atom table).
+    natoms : int
+        The number of atoms of each frame (None before the first frame).
+    frames : list
+        The header rows of the frames written so far.
+    output : file object
+        The frames file.
+
+    Methods
+    -------
+    __init__(filepath, fields=('x', 'y', 'z'))
+        Initializes the BinaryWriter object with the specified output file
+        path.
+    __enter__()
+        Opens the frames file when the object is used as a context manager.
+    __exit__()
+        Writes the headers and the tables and closes the frames file.
+    write_step(step)
+        Writes the atom coordinates and the header of a step.
+    write_to_xyz(step)
+        Alias of write_step, for compatibility with XYZWriter.
+    get_coordinates(step)
+        Returns the stored fields of the atoms of a step.
+    frame_row(step)
+        Returns the row of the frame header table of a step.
+    load(filepath, mmap_mode='r')
+        Loads a binary trajectory.
+    """
+
+    HEADER_SIZE = 256  # Bytes reserved for the header of the frames file
+    # Dtype of the frame header table
+    FRAME_DTYPE = np.dtype([('timestep', 'i8'), ('time', 'f8'),
+                            ('natoms', 'i8'), ('box', 'f8', (3, 2))])
+    # Atom keywords stored in the atom table, with their dtype
+    ATOM_FIELDS = [('id', 'i8'), ('type', 'i8'), ('element', 'U8')]
+
+    def __init__(self, filepath, fields=('x', 'y', 'z')):
+        """
+        Initializes the BinaryWriter object with the specified output file
+        path.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the frames file. If only the filename is given, the
+            files will be created in the "./npy/" subdirectory.
+        fields : sequence, optional
+            The atom keywords stored in the frames, in order.
+            Default is ('x', 'y', 'z').
+
+        Raises
+        ------
+        ValueError
+            If the file format is not .npy.
+        """
+        if not filepath.lower().endswith('.npy'):
+            raise ValueError("File format must be .npy")
+
+        # If only the filename is given, create it in the "./npy/" directory
+        if not os.path.dirname(filepath):
+            filepath = os.path.join(os.getcwd(), 'npy', filepath)
+
+        self.filepath = filepath  # Path to the frames file
+        base = filepath[:-len('.npy')]
+        self.frames_path = base + '.frames.npy'  # Path to the frame table
+        self.atoms_path = base + '.atoms.npy'  # Path to the atom table
+        self.fields = list(fields)  # Atom keywords stored in the frames
+        # Atom keywords read from the steps
+        self.columns = self.fields + [name for name, _ in self.ATOM_FIELDS
+                                      if name not in self.fields]
+        self.natoms = None  # Number of atoms of each frame
+        self.frames = []  # Header rows of the frames written so far
+        self.atoms = None  # Atom table, from the first frame
+        self.output = None  # Frames file
+        self.has_written = False  # Flag to check if the file has been written
+
+    def __enter__(self):
+        """
+        Opens the frames file when the object is used as a context manager.
+        If the file is already written by this object, the new frames are
+        appended to it.
+        """
+        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        if self.has_written:
+            self.output = open(self.filepath, 'r+b')
+            self.output.seek(0, os.SEEK_END)
+        else:
+            self.output = open(self.filepath, 'wb')
+            self.output.write(self._header(0))
+        self.has_written = True
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Writes the final header of the frames file and the tables, and closes
+        the frames file.
+        """
+        if not self.output:
+            return
+        try:
+            # Shape of the frames written so far
+            self.output.seek(0)
+            self.output.write(self._header(len(self.frames)))
+        finally:
+            self.output.close()
+        np.save(self.frames_path, np.array(self.frames,
+                                           dtype=self.FRAME_DTYPE))
+        if self.atoms is not None:
+            np.save(self.atoms_path, self.atoms)
+
+    def write_step(self, step):
+        """
+        Writes the atom coordinates and the header of a step.
+
+        Parameters
+        ----------
+        step : dict
+            A dictionary containing the data of the step. It should AT LEAST
+            contain the 'natoms', 'keywords' and 'data' keys, and the stored
+            fields in the atom keywords.
+
+        Raises
+        ------
+        KeyError
+            If the atom data or a stored field is not found in the step.
+        ValueError
+            If the number of atoms differs from the first frame.
+        """
+        coordinates = self.get_coordinates(step)
+        if self.natoms is None:
+            self.natoms = len(coordinates)
+        elif len(coordinates) != self.natoms:
+            raise ValueError(f"The number of atoms changed from "
+                             f"{self.natoms} to {len(coordinates)}: frames "
+                             f"of a binary trajectory have a fixed size.")
+
+        self.output.write(coordinates.tobytes())
+        self.frames.append(self.frame_row(step))
+
+    # Same interface as XYZWriter
+    write_to_xyz = write_step
+
+    def get_coordinates(self, step):
+        """
+        Returns the stored fields of the atoms of a step as a float32 array
+        of shape (atoms, fields), sorted by atom id if the ids are present.
+        The atom table is recorded from the first frame.
+
+        Parameters
+        ----------
+        step : dict
+            A dictionary containing the data of the step.
+
+        Returns
+        -------
+        coordinates : numpy.ndarray
+            The stored fields of the atoms.
+        """
+        for key in ('natoms', 'keywords', 'data'):
+            if key not in step:
+                raise KeyError(f"'{key}' is not found in the step dictionary")
+        keywords = step['keywords']
+        missing = [field for field in self.fields if field not in keywords]
+        if missing:
+            raise KeyError(f"Atom keywords {missing} are not found in the "
+                           f"step dictionary")
+
+        columns = self._columns(step['data'], keywords,
+                                self.fields + ['id'] * ('id' in keywords))
+        coordinates = np.empty((len(step['data']), len(self.fields)),
+                               dtype=np.float32)
+        for i, field in enumerate(self.fields):
+            coordinates[:, i] = columns[field]
+
+        order = None
+        if 'id' in columns:
+            ids = np.asarray(columns['id'], dtype=np.int64)
+            if np.any(ids[1:] < ids[:-1]):
+                order = np.argsort(ids, kind='stable')
+                coordinates = coordinates[order]
+
+        if self.atoms is None:
+            self.atoms = self._atom_table(step['data'], keywords, order)
+        return coordinates
+
+    @staticmethod
+    def load(filepath, mmap_mode='r'):
+        """
+        Loads a binary trajectory.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the frames file (.npy).
+        mmap_mode : str, optional
+            The mode of the memory map of the frames (see numpy.load), or
+            None to read them in memory. Default is 'r'.
+
+        Returns
+        -------
+        frames : numpy.ndarray
+            The float32 frames, of shape (frames, atoms, fields).
+        headers : numpy.ndarray
+            The frame header table.
+        atoms : numpy.ndarray
+            The atom table, or None if it was not written.
+        """
+        base = filepath[:-len('.npy')]
+        frames = np.load(filepath, mmap_mode=mmap_mode)
+        headers = np.load(base + '.frames.npy')
+        atoms = np.load(base + '.atoms.npy') \
+            if os.path.exists(base + '.atoms.npy') else None
+        return frames, headers, atoms
+
+    def _header(self, n_frames):
+        """
+        Returns the header of the frames file (NumPy format 1.0), padded to
+        HEADER_SIZE bytes so that it can be rewritten in place.
+        """
+        shape = (n_frames, self.natoms or 0, len(self.fields))
+        header = repr({'descr': '<f4', 'fortran_order': False,
+                       'shape': shape})
+        # Magic string, version and length of the header
+        prefix = b'\x93NUMPY\x01\x00' + struct.pack('<H',
+                                                    self.HEADER_SIZE - 10)
+        return prefix + header.ljust(self.HEADER_SIZE - 11).encode() + b'\n'
+
+    @staticmethod
+    def frame_row(step):
+        """
+        Returns the row of the frame header table of a step (see
+        FRAME_DTYPE).
+
+        Parameters
+        ----------
+        step : dict
+            A dictionary containing the data of the step.
+
+        Returns
+        -------
+        row : tuple
+            The timestep, time, number of atoms and box bounds of the step.
+        """
+        box = np.full((3, 2), np.nan)
+        if 'box' in step:
+            # Bounds of the three dimensions (the tilt factors are ignored)
+            bounds = [list(bound)[:2] for bound in step['box'][:3]]
+            box[:len(bounds)] = np.array(bounds, dtype=float)
+        return (step.get('timestep', -1), step.get('time', np.nan),
+                len(step['data']), box)
+
+    def _atom_table(self, data, keywords, order):
+        """
+        Returns the atom table of the first frame.
+        """
+        fields = [(name, dtype) for name, dtype in self.ATOM_FIELDS
+                  if name in keywords]
+        if not fields:
+            return None
+        columns = self._columns(data, keywords, [name for name, _ in fields])
+        atoms = np.empty(len(data), dtype=fields)
+        for name, _ in fields:
+            atoms[name] = columns[name]
+        return atoms if order is None else atoms[order]
+
+    @staticmethod
+    def _columns(data, keywords, names):
+        """
+        Returns the columns of the atom data (list of lists or NumPy
+        structured array) with the given keywords.
+        """
+        if hasattr(data, 'dtype'):
+            return {name: data[name] for name in names}
+        transposed = list(zip(*data)) if len(data) else \
+            [()] * len(keywords)
+        return {name: transposed[keywords.index(name)] for name in names}
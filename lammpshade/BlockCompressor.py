@@ -0,0 +1,174 @@
+"""
+This module provides a text file writer that compresses its data in
+independent blocks on a pool of threads.
+"""
+import collections
+import gzip
+import lzma
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Compressions supported by the writer and the suffixes of their files
+SUFFIXES = {
+    'gzip': '.gz',
+    'xz': '.xz',
+}
+
+
+class BlockCompressor:
+    """
+    A class to write text to a gzip or xz file, compressing it in independent
+    blocks on a pool of threads (as pigz does). Each block is compressed into
+    a complete gzip member or xz stream, and the blocks are written in order:
+    the concatenation is a valid file for gzip, xz and the readers of the
+    standard library. zlib and lzma release the GIL while compressing, so
+    the blocks are compressed in parallel with the writes.
+
+    ...
+
+    Attributes
+    ----------
+    filepath : str
+        The path to the compressed file.
+    compression : str
+        'gzip' or 'xz'.
+    block_size : int
+        The number of uncompressed bytes of each block.
+    level : int
+        The compression level (preset for xz).
+    threads : int
+        The number of compression threads.
+
+    Methods
+    -------
+    __init__(filepath, mode='w', compression='gzip', block_size=4194304,
+             level=None, threads=None)
+        Initializes a BlockCompressor object and opens the file.
+    write(text)
+        Writes text to the file.
+    flush()
+        Compresses and writes the buffered text.
+    close()
+        Flushes the text and closes the file.
+    """
+
+    def __init__(self, filepath, mode='w', compression='gzip',
+                 block_size=4194304, level=None, threads=None):
+        """
+        Initializes a BlockCompressor object and opens the file.
+
+        Parameters
+        ----------
+        filepath : str
+            The path to the compressed file.
+        mode : str, optional
+            'w' to overwrite the file, 'a' to append new blocks to it.
+            Default is 'w'.
+        compression : str, optional
+            'gzip' or 'xz'. Default is 'gzip'.
+        block_size : int, optional
+            The number of uncompressed bytes of each block. Default is 4 MiB.
+        level : int, optional
+            The compression level. Defaults to 6 for both compressions.
+        threads : int, optional
+            The number of compression threads. Defaults to the number of
+            CPUs.
+
+        Raises
+        ------
+        ValueError
+            If the compression or the mode is not supported.
+        """
+        if compression not in SUFFIXES:
+            raise ValueError(f"Unsupported compression '{compression}'.")
+        if mode not in ('w', 'a'):
+            raise ValueError(f"Unsupported mode '{mode}'.")
+
+        self.filepath = filepath  # Path to the compressed file
+        self.compression = compression  # 'gzip' or 'xz'
+        self.block_size = block_size  # Uncompressed bytes of each block
+        self.level = 6 if level is None else level  # Compression level
+        self.threads = threads or os.cpu_count() or 1  # Compression threads
+        self._file = open(filepath, mode + 'b')  # Compressed file
+        self._buffer = []  # Text not submitted yet
+        self._size = 0  # Size of the text not submitted yet
+        self._pool = ThreadPoolExecutor(max_workers=self.threads)
+        self._pending = collections.deque()  # Blocks being compressed
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def write(self, text):
+        """
+        Writes text to the file. The text is compressed once a block is
+        full.
+
+        Parameters
+        ----------
+        text : str
+            The text to write.
+
+        Returns
+        -------
+        int
+            The number of characters written.
+        """
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size >= self.block_size:
+            self._submit()
+        return len(text)
+
+    def flush(self):
+        """
+        Compresses and writes the buffered text. Each flush ends a block.
+        """
+        if self._size:
+            self._submit()
+        while self._pending:
+            self._file.write(self._pending.popleft().result())
+        self._file.flush()
+
+    def close(self):
+        """
+        Flushes the text and closes the file.
+        """
+        if self.closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._pool.shutdown()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _submit(self):
+        """
+        Submits the buffered text as a block to the pool, writing the
+        compressed blocks that are done in order. The number of blocks in
+        flight is bounded to twice the number of threads.
+        """
+        data = ''.join(self._buffer).encode()
+        self._buffer = []
+        self._size = 0
+        self._pending.append(self._pool.submit(self._compress, data))
+
+        while self._pending and (self._pending[0].done() or
+                                 len(self._pending) > 2 * self.threads):
+            self._file.write(self._pending.popleft().result())
+
+    def _compress(self, data):
+        """
+        Compresses a block into a gzip member or an xz stream.
+        """
+        if self.compression == 'gzip':
+            # No timestamp, so that the output is reproducible
+            return gzip.compress(data, self.level, mtime=0)
+        return lzma.compress(data, format=lzma.FORMAT_XZ, preset=self.level)
@@ -0,0 +1,250 @@
+"""
+This module provides a reader that serves the steps of a YAML file from its
+binary cache.
+"""
+from lammpshade.YAMLReader import YAMLReader
+
+
+class CachedReader(YAMLReader):
+    """
+    A class to read the steps of a YAML file from a TrajectoryCache, with the
+    same interface as YAMLReader. The positions used by seek and tell are
+    frame numbers instead of byte offsets.
+
+    ...
+
+    Attributes
+    ----------
+    cache : TrajectoryCache
+        The loaded cache of the YAML file.
+
+    Methods
+    -------
+    __init__(cache, columns=None, thermo_columns=None, atom_filter=None)
+        Initializes a CachedReader object.
+    open_file()
+        Reopens the cache at the first frame.
+    get_next_step(skip_data=False)
+        Returns the next step of the cache.
+    get_next_thermo()
+        Returns the next step of the cache without its atom data.
+    get_next_header()
+        Returns the next step of the cache without its atom data.
+    skip_step()
+        Skips the next step.
+    peek_timestep()
+        Returns the timestep of the next step without moving the reader.
+    build_index(index_path=None, rebuild=False)
+        Returns None, as the cache does not need an index.
+    get_step(n)
+        Returns the n-th step of the cache.
+    seek_timestep(timestep)
+        Moves the reader to the step with the given timestep.
+    seek(n)
+        Moves the reader to a frame.
+    tell()
+        Returns the position of the next frame.
+    """
+
+    def __init__(self, cache, columns=None, thermo_columns=None,
+                 atom_filter=None):
+        """
+        Initializes a CachedReader object.
+
+        Parameters
+        ----------
+        cache : TrajectoryCache
+            The loaded cache of the YAML file.
+        columns : list, optional
+            The atom keywords to keep. Only their columns are read from the
+            cache. Defaults to None (all the keywords are kept).
+        thermo_columns : list, optional
+            The thermo keywords to keep. Defaults to None.
+        atom_filter : AtomFilter, optional
+            The selection of the atoms to keep. Defaults to None.
+        """
+        self.cache = cache  # Cache of the YAML file
+        super().__init__(cache.filename, columns=columns,
+                         thermo_columns=thermo_columns,
+                         atom_filter=atom_filter)
+
+    def open_file(self):
+        """
+        Reopens the cache at the first frame.
+
+        Returns
+        -------
+        cache : TrajectoryCache
+            The cache, used as the file object of the reader.
+        """
+        self.cache.open()
+        return self.cache
+
+    def get_next_step(self, skip_data=False):
+        """
+        Returns the next step of the cache.
+
+        Parameters
+        ----------
+        skip_data : bool, optional
+            If True, the step is returned without its atom data.
+            Defaults to False.
+
+        Returns
+        -------
+        step : dict
+            A dictionary containing data from the next step. Empty if the
+            end of the cache is reached.
+        """
+        if self.file.closed or self.file.pos >= len(self.cache):
+            # Close the cache when done reading
+            self.file.close()
+            return {}
+        # Positions of the selected columns of the cache
+        atoms = self.select_columns(self.cache.atom_keywords,
+                                    self.selected_columns())
+        thermo = self.select_columns(self.cache.thermo_keywords,
+                                     self.thermo_columns)
+        step = self.cache.get_frame(self.file.pos, skip_data=skip_data,
+                                    atom_positions=atoms and atoms[0],
+                                    thermo_positions=thermo and thermo[0])
+        self.file.pos += 1
+        self.filter_atoms(step)
+        self.current_step = step
+        return step
+
+    def get_next_thermo(self):
+        """
+        Returns the next step of the cache without its atom data. Unlike
+        YAMLReader.get_next_thermo, the whole header of the step is returned.
+
+        Returns
+        -------
+        step : dict
+            A dictionary containing the header and the thermo data of the
+            next step. Empty if the end of the cache is reached.
+        """
+        return self.get_next_step(skip_data=True)
+
+    def get_next_header(self):
+        """
+        Returns the next step of the cache without its atom data (the thermo
+        data of the step is included).
+
+        Returns
+        -------
+        step : dict
+            A dictionary containing the header of the next step. Empty if the
+            end of the cache is reached.
+        """
+        return self.get_next_step(skip_data=True)
+
+    def skip_step(self):
+        """
+        Skips the next step.
+
+        Returns
+        -------
+        bool
+            True if a step was skipped, False if the end of the cache was
+            reached.
+        """
+        if self.file.closed or self.file.pos >= len(self.cache):
+            self.file.close()
+            return False
+        self.file.pos += 1
+        return True
+
+    def peek_timestep(self):
+        """
+        Returns the timestep of the next step without moving the reader.
+
+        Returns
+        -------
+        timestep : int
+            The timestep of the next step, or None if it is not found or if
+            the end of the cache is reached.
+        """
+        if self.file.closed or self.file.pos >= len(self.cache):
+            return None
+        return self.cache.headers[self.file.pos].get('timestep')
+
+    def build_index(self, index_path=None, rebuild=False):
+        """
+        Returns None, as the frames of the cache are accessed directly.
+        """
+        return None
+
+    def get_step(self, n):
+        """
+        Returns the n-th step of the cache. Subsequent calls to
+        get_next_step continue from the following step.
+
+        Parameters
+        ----------
+        n : int
+            The position of the step (negative values count from the end).
+
+        Returns
+        -------
+        step : dict
+            A dictionary containing data from the n-th step.
+
+        Raises
+        ------
+        IndexError
+            If the cache has no n-th step.
+        """
+        if not -len(self.cache) <= n < len(self.cache):
+            raise IndexError(f"Step {n} not found in '{self.filename}', "
+                             f"which contains {len(self.cache)} steps.")
+        self.seek(n % len(self.cache))
+        return self.get_next_step()
+
+    def seek_timestep(self, timestep):
+        """
+        Moves the reader to the step with the given timestep.
+
+        Parameters
+        ----------
+        timestep : int
+            The timestep to move to.
+
+        Returns
+        -------
+        n : int
+            The position of the step.
+
+        Raises
+        ------
+        ValueError
+            If the timestep is not found in the cache.
+        """
+        for n, header in enumerate(self.cache.headers):
+            if header.get('timestep') == timestep:
+                self.seek(n)
+                return n
+        raise ValueError(f"Timestep {timestep} not found in "
+                         f"'{self.filename}'.")
+
+    def seek(self, n):
+        """
+        Moves the reader to a frame.
+
+        Parameters
+        ----------
+        n : int
+            The position of the frame.
+        """
+        if self.file.closed:
+            self.file = self.open_file()
+        self.file.seek(n)
+
+    def tell(self):
+        """
+        Returns the position of the next frame, or the number of frames if
+        the end of the cache was reached.
+        """
+        if self.file.closed:
+            return len(self.cache)
+        return self.file.tell()
@@ -0,0 +1,129 @@
+"""
+This module provides the detection of compressed files and the functions to
+open them as streams of decompressed data.
+"""
+import bz2
+import io
+import lzma
+from lammpshade.GzipReader import GzipReader
+
+
+# Magic numbers at the beginning of the supported compressed files
+MAGIC_NUMBERS = {
+    'gzip': b'\x1f\x8b',
+    'bz2': b'BZh',
+    'xz': b'\xfd7zXZ\x00',
+    'zstd': b'\x28\xb5\x2f\xfd',
+}
+
+
+def detect_compression(filename):
+    """
+    Detects the compression of a file from its first bytes.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the file.
+
+    Returns
+    -------
+    compression : str
+        'gzip', 'bz2', 'xz' or 'zstd', or None if the file is not compressed
+        or cannot be read (the error is then reported when it is opened).
+    """
+    try:
+        with io.open(filename, 'rb') as file:
+            head = file.read(6)
+    except OSError:
+        return None
+    for compression, magic in MAGIC_NUMBERS.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_binary(filename, compression=None, checkpoints=None):
+    """
+    Opens a file as a seekable binary stream of decompressed data. Offsets
+    (tell and seek) are positions in the decompressed data.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the file.
+    compression : str, optional
+        The compression of the file, as returned by detect_compression.
+        Defaults to None (plain file).
+    checkpoints : list, optional
+        The checkpoints shared between the readers of a gzip file (see
+        GzipReader). Defaults to None.
+
+    Returns
+    -------
+    file : binary file object
+        The stream of decompressed data.
+
+    Raises
+    ------
+    ImportError
+        If the file is compressed with zstd and no zstd module is available.
+    """
+    if compression is None:
+        return open(filename, 'rb')
+    if compression == 'gzip':
+        # Seekable reader with checkpoints of the decompressor
+        return io.BufferedReader(GzipReader(filename,
+                                            checkpoints=checkpoints),
+                                 buffer_size=65536)
+    if compression == 'bz2':
+        return bz2.open(filename, 'rb')
+    if compression == 'xz':
+        return lzma.open(filename, 'rb')
+    if compression == 'zstd':
+        return _open_zstd(filename)
+    raise ValueError(f"Unsupported compression '{compression}'.")
+
+
+def open_text(filename, compression=None, checkpoints=None):
+    """
+    Opens a file as a text stream of decompressed data, with the default
+    encoding of open().
+
+    Parameters
+    ----------
+    filename : str
+        The path to the file.
+    compression : str, optional
+        The compression of the file, as returned by detect_compression.
+        Defaults to None (plain file).
+    checkpoints : list, optional
+        The checkpoints shared between the readers of a gzip file.
+        Defaults to None.
+
+    Returns
+    -------
+    file : text file object
+        The stream of decompressed text.
+    """
+    if compression is None:
+        return open(filename, 'r')
+    return io.TextIOWrapper(open_binary(filename, compression, checkpoints))
+
+
+def _open_zstd(filename):
+    """
+    Opens a zstd file with the standard library module (Python 3.14+) or
+    with the optional zstandard package.
+    """
+    try:
+        from compression import zstd
+        return zstd.open(filename, 'rb')
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Reading zstd-compressed files requires Python "
+                          "3.14 or the 'zstandard' package.")
+    return zstandard.open(filename, 'rb')
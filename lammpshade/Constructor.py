@@ -1,7 +1,20 @@
 from lammpshade.YAMLReader import YAMLReader
+from lammpshade.CachedReader import CachedReader
+from lammpshade.TrajectoryCache import TrajectoryCache
 from lammpshade.XYZWriter import XYZWriter
-from lammpshade.GraphMaker import GraphMaker
-import pandas as pd
+from lammpshade.BinaryWriter import BinaryWriter
+from lammpshade.AtomSeries import AtomSeries
+from lammpshade.MSDAnalyzer import MSDAnalyzer
+from lammpshade.ThermoBuffer import ThermoBuffer
+from lammpshade.StepPrefetcher import StepPrefetcher
+from lammpshade.ConversionCheckpoint import ConversionCheckpoint
+from collections import deque
+import bisect
+import contextlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import io
+import os
 
 
 """
@@ -20,30 +33,81 @@ class Simulation:
     Attributes
     ----------
     file : YAMLReader
-        The YAMLReader object for reading the simulation data file.
+        The YAMLReader object for reading the simulation data file (a
+        CachedReader when the steps are read from the binary cache).
+    cache : TrajectoryCache
+        The binary cache of the simulation data file (None if disabled).
     thermo_keywords : list
         The list of thermo keywords.
-    thermo_data : list
-        The list of thermo data.
+    thermo_data : ThermoBuffer
+        The columnar store of the thermo data.
+    output : XYZWriter or BinaryWriter
+        The writer of the last output file (None before any conversion).
     graphs : GraphMaker
         The GraphMaker object for creating graphs.
 
     Methods
     -------
-    __init__(self, filepath)
+    __init__(self, filepath, use_mmap=False, cache=False, columns=None,
+             thermo_columns=None, atom_filter=None)
         Initializes the Simulation object.
-    convert_to_xyz(self, output)
+    open_cache(self)
+        Builds the binary cache if needed and reads the steps from it.
+    convert_to_xyz(self, output, thermo_flag=True, workers=1,
+                   chunk_steps=16, max_chunks=None, stride=1,
+                   start_timestep=None, stop_timestep=None, prefetch=0,
+                   resume=False, checkpoint_interval=60.0,
+                   atom_filter=None)
         Converts the simulation data to XYZ format.
-    get_thermodata(self)
+    write_steps(out, thermo_flag, selection, first=0, prefetch=0,
+                checkpoint=None, i=0)
+        Converts the remaining steps serially.
+    resume_conversion(checkpoint, thermo_flag, selection)
+        Prepares the resumption of an interrupted conversion.
+    save_checkpoint(checkpoint, out, offset, steps)
+        Flushes the output file and saves a checkpoint of the conversion.
+    project_columns(out, atom_filter=None)
+        Restricts the atom keywords and the atoms read during a conversion.
+    create_writer(output)
+        Creates the writer of an output file, based on its extension.
+    follow(self, output=None, thermo_flag=True, poll_interval=0.1,
+           max_interval=5.0, timeout=None, callback=None)
+        Processes the steps of a simulation data file still being written.
+    write_chunks_parallel(out, thermo_flag, workers, chunk_steps,
+                          max_chunks, selection, first=0, checkpoint=None)
+        Converts the remaining steps to XYZ format with a process pool.
+    select_offsets(index, start, stride=1, start_timestep=None,
+                   stop_timestep=None, first=0)
+        Selects the offsets of the steps to convert from the file index.
+    get_thermodata(self, stride=1, start_timestep=None, stop_timestep=None)
         Retrieves the thermo data from the simulation data.
     get_step_thermodata(self, step)
         Retrieves the thermo data from the simulation step data.
+    get_frame_table()
+        Retrieves the metadata of every frame as a DataFrame.
+    get_frame_row(header)
+        Returns the row of the frame table of a step header.
+    extract_atom_series(path, fields=('x', 'y', 'z'), stride=1,
+                        atom_filter=None, block_frames=256)
+        Writes the time series of the atoms to a transposed store.
+    get_msd_analyzer(path, stride=1, atom_filter=None, batch_atoms=None)
+        Returns the MSD analyzer of the atoms of the simulation.
+    get_msd(path, stride=1, atom_filter=None, batch_atoms=None)
+        Retrieves the mean-squared displacement of the atoms by type.
+    get_diffusion(path, stride=1, atom_filter=None, batch_atoms=None,
+                  start=0.1, stop=0.5)
+        Retrieves the diffusion coefficient of the atoms by type.
     make_graphs(self, interact=False)
         Creates graphs from the thermo data.
 
     """
 
-    def __init__(self, filepath):
+    # Columns of the frame table
+    FRAME_COLUMNS = ['timestep', 'time', 'natoms', 'units', 'boundary',
+                     'xlo', 'xhi', 'ylo', 'yhi', 'zlo', 'zhi']
+
+    def __init__(self, filepath, use_mmap=False, cache=False, columns=None,
+                 thermo_columns=None, atom_filter=None):
         """
         Initializes the Simulation object.
 
@@ -51,6 +115,26 @@ class Simulation:
         ----------
         filepath : str
             The path to the simulation data file.
+        use_mmap : bool, optional
+            If True, the simulation data file is read through a memory map.
+            Default is False.
+        cache : bool or str, optional
+            If True, the steps are stored in a binary cache next to the file
+            (the file path followed by '.cache') the first time they are
+            read, and later readings, including the ones of other sessions,
+            are served from the cache. A string sets the path of the cache
+            directory. Default is False.
+        columns : list, optional
+            The atom keywords read from the steps (see YAMLReader): the
+            values of the other keywords are not converted. By default, all
+            the keywords are read, except during the conversions, which only
+            read the keywords written to the output.
+        thermo_columns : list, optional
+            The thermo keywords read from the steps, e.g. ['Step', 'Time',
+            'Temp']. Default is None (all the keywords).
+        atom_filter : AtomFilter, optional
+            The selection of the atoms read from the steps (see AtomFilter),
+            e.g. AtomFilter(types=[1]). Default is None (all the atoms).
 
         Raises
         ------
@@ -58,37 +142,222 @@ class Simulation:
             If the file is not found.
 
         """
-        self.file = YAMLReader(filepath)  # Create YAMLReader object
+        # Create YAMLReader object
+        self.file = YAMLReader(filepath, use_mmap=use_mmap, columns=columns,
+                               thermo_columns=thermo_columns,
+                               atom_filter=atom_filter)
+        self.use_mmap = use_mmap  # Read the file through a memory map
+        self.cache = None  # Binary cache of the simulation data
         self.thermo_keywords = None  # Thermo keywords of the simulation data
         self.thermo_data = None  # Thermo data of the simulation data
+        self.output = None  # Writer of the last output file
+
+        if cache:
+            self.cache = TrajectoryCache(
+                filepath, cache if isinstance(cache, str) else None)
+            if self.cache.load():
+                # Read the steps from the valid cache of a previous session
+                self.file.close()
+                self.file = CachedReader(self.cache, self.file.columns,
+                                         self.file.thermo_columns,
+                                         self.file.atom_filter)
+
+    def open_cache(self):
+        """
+        Builds the binary cache of the simulation data if it was requested
+        and is not available yet, and reads the following steps from it.
+        Nothing is done if steps have already been read from the file.
+
+        Returns
+        -------
+        bool
+            True if the steps are read from the cache.
+        """
+        if isinstance(self.file, CachedReader):
+            return True
+        if self.cache is None or self.file.tell() != 0:
+            return False
 
-    def convert_to_xyz(self, output, thermo_flag=True):
+        if self.cache.build(use_mmap=self.use_mmap):
+            self.file.close()
+            self.file = CachedReader(self.cache, self.file.columns,
+                                     self.file.thermo_columns,
+                                     self.file.atom_filter)
+            return True
+        # The steps cannot be cached, keep reading the file
+        return False
+
+    def convert_to_xyz(self, output, thermo_flag=True, workers=1,
+                       chunk_steps=16, max_chunks=None, stride=1,
+                       start_timestep=None, stop_timestep=None, prefetch=0,
+                       resume=False, checkpoint_interval=60.0,
+                       atom_filter=None):
         """
         Converts the simulation data to XYZ format.
+        A selection of the steps can be converted with stride,
+        start_timestep and stop_timestep: the other steps are skipped by the
+        reader without being parsed.
 
         Parameters
         ----------
         output : str
-            The path to the output XYZ file.
+            The path to the output XYZ file (.xyz, or .xyz.gz and .xyz.xz for
+            compressed files). With a .npy path, the steps are written as a
+            binary trajectory of float32 coordinates (see BinaryWriter).
         thermo_flag : bool
             A boolean indicating if thermo data should be included.
             Default is True.
+        workers : int, optional
+            The number of processes used to parse and format the steps.
+            With more than one worker, the YAML file is split at step
+            boundaries into chunks that are converted in parallel and written
+            back in order; the output is identical to the serial one.
+            Scripts using this option on Windows or macOS must be protected
+            by an 'if __name__ == "__main__":' guard. Compressed files,
+            steps served from the binary cache and binary outputs are
+            always converted serially.
+            Default is 1.
+        chunk_steps : int, optional
+            The number of steps of each chunk when workers > 1.
+            Default is 16.
+        max_chunks : int, optional
+            The maximum number of chunks being converted or waiting to be
+            written at the same time, which bounds the memory used when
+            workers > 1. Defaults to twice the number of workers.
+        stride : int, optional
+            Only every stride-th step is converted. Default is 1.
+        start_timestep : int, optional
+            The first timestep to convert (included). Default is None.
+        stop_timestep : int, optional
+            The last timestep to convert (included). Timesteps are assumed
+            to increase along the file. Default is None.
+        prefetch : int, optional
+            If positive, the steps are parsed in a background thread up to
+            prefetch steps ahead of the writing, so that parsing overlaps
+            with the writes of the XYZ file (useful when the write latency
+            is high, e.g. on network filesystems). Only used when the steps
+            are converted serially. Default is 0 (no background thread).
+        resume : bool, optional
+            If True, checkpoints of the conversion are saved next to the
+            output file (the output path followed by '.ckpt') and, if the
+            checkpoint of an interrupted conversion of the same file with the
+            same selection is found, the output file is truncated after the
+            last step it records and the conversion continues from there.
+            The thermo data of the steps already written is read again,
+            without their atom data. The checkpoint is removed once the
+            conversion is complete. Not supported for binary outputs, nor
+            with an atom filter using an expression ('where'), whose
+            callable cannot be compared with the one of the checkpoint.
+            Default is False.
+        checkpoint_interval : float, optional
+            The minimum time between two checkpoints, in seconds, when
+            resume is True. Default is 60.
+        atom_filter : AtomFilter, optional
+            The selection of the atoms to convert (see AtomFilter), e.g.
+            AtomFilter(types=[1]), which replaces the one of the Simulation
+            object during the conversion. The rows of the other atoms are
+            dropped as soon as they are decoded, and the number of atoms of
+            each frame is the number of atoms kept. Default is None (the
+            atom filter of the Simulation object, if any).
 
         Returns
         ------
         None
         """
         i = 0  # Counter for the number of steps processed
+        # Selection of the steps to convert
+        selection = {'stride': stride, 'start_timestep': start_timestep,
+                     'stop_timestep': stop_timestep}
 
-        # Create XYZWriter object
-        self.output = XYZWriter(output)
-        with self.output as out:
-            while True:
-                # Get the next step
-                step = self.file.get_next_step()
-                if not step:
-                    # End of file
-                    break
+        # Serve the steps from the binary cache if it is enabled
+        cached = self.open_cache()
+
+        # Create the writer of the output format
+        self.output = self.create_writer(output)
+
+        first = 0  # Position of the first selected step
+        checkpoint = None  # Checkpoints of the conversion
+        if resume:
+            if isinstance(self.output, BinaryWriter):
+                raise ValueError("Binary outputs cannot be resumed.")
+            atoms = atom_filter or self.file.atom_filter
+            if atoms is not None and atoms.where is not None:
+                raise ValueError("Conversions with an atom filter expression "
+                                 "cannot be resumed.")
+            settings = dict(selection, cached=cached,
+                            input=os.path.abspath(self.file.filename),
+                            atom_filter=repr(atoms))
+            checkpoint = ConversionCheckpoint(self.output.filepath, settings,
+                                              checkpoint_interval)
+            if checkpoint.load():
+                thermo_flag = self.resume_conversion(checkpoint, thermo_flag,
+                                                     selection)
+                i = checkpoint.steps
+                # The step after the last one written was not selected
+                first = stride - 1 if i else 0
+
+        # Only the atom keywords written and the selected atoms are read
+        with self.output as out, self.project_columns(out, atom_filter):
+            # Compressed files cannot be split between processes, and only
+            # the text frames are converted in parallel
+            if workers > 1 and not cached and \
+                    self.file.compression is None and \
+                    isinstance(out, XYZWriter):
+                # Convert the steps with a process pool
+                self.write_chunks_parallel(out, thermo_flag, workers,
+                                           chunk_steps, max_chunks,
+                                           selection, first, checkpoint)
+            else:
+                self.write_steps(out, thermo_flag, selection, first,
+                                 prefetch, checkpoint, i)
+
+        if checkpoint is not None:
+            # The conversion is complete
+            checkpoint.remove()
+
+    def write_steps(self, out, thermo_flag, selection, first=0, prefetch=0,
+                    checkpoint=None, i=0):
+        """
+        Converts the remaining steps of the simulation data serially and
+        writes them to an open writer.
+
+        Parameters
+        ----------
+        out : XYZWriter or BinaryWriter
+            The writer, already opened.
+        thermo_flag : bool
+            A boolean indicating if thermo data should be included.
+        selection : dict
+            The stride, start_timestep and stop_timestep arguments of
+            YAMLReader.iter_steps.
+        first : int, optional
+            The position of the first selected step among the remaining
+            ones. Default is 0.
+        prefetch : int, optional
+            The number of steps parsed ahead in a background thread.
+            Default is 0 (no background thread).
+        checkpoint : ConversionCheckpoint, optional
+            The checkpoints of the conversion. Default is None.
+        i : int, optional
+            The number of steps already written. Default is 0.
+
+        Returns
+        -------
+        None
+        """
+        def steps_with_offsets():
+            # Position of the reader after each step, read before the next
+            # step is parsed (also in the background thread)
+            for step in self.file.iter_steps(start=first, **selection):
+                yield step, self.file.tell()
+
+        steps = steps_with_offsets()
+        if prefetch > 0:
+            # Parse the steps in a background thread
+            steps = StepPrefetcher(steps, depth=prefetch)
+
+        try:
+            for step, offset in steps:
                 if thermo_flag:
                     # Get thermo data from the step
                     thermo_flag = self.get_step_thermodata(step)
@@ -101,10 +370,369 @@ class Simulation:
                 # Increment the step counter
                 i += 1
 
-    def get_thermodata(self):
+                if checkpoint is not None and checkpoint.due():
+                    self.save_checkpoint(checkpoint, out, offset, i)
+        finally:
+            if prefetch > 0:
+                # Stop the background thread
+                steps.close()
+
+    def resume_conversion(self, checkpoint, thermo_flag, selection):
+        """
+        Prepares the resumption of an interrupted conversion from its
+        checkpoint: the thermo data of the steps already written is read
+        again, the output file is truncated after the last step written and
+        the reader is moved after it.
+
+        Parameters
+        ----------
+        checkpoint : ConversionCheckpoint
+            The loaded checkpoint.
+        thermo_flag : bool
+            A boolean indicating if thermo data should be included.
+        selection : dict
+            The stride, start_timestep and stop_timestep arguments of
+            YAMLReader.iter_steps.
+
+        Returns
+        -------
+        thermo_flag : bool
+            A boolean indicating if thermo data is still collected.
+        """
+        print('Resuming the conversion after step n. ',
+              checkpoint.steps - 1)
+        if thermo_flag:
+            # Thermo data of the steps already written
+            steps = self.file.iter_steps(thermo_only=True, **selection)
+            for step in itertools.islice(steps, checkpoint.steps):
+                thermo_flag = self.get_step_thermodata(step)
+                if not thermo_flag:
+                    break
+
+        # Drop the steps written after the checkpoint and append to the file
+        os.truncate(self.output.filepath, checkpoint.output_offset)
+        self.output.has_written = True
+        self.output.thermo_check = list(checkpoint.thermo_check)
+        self.file.seek(checkpoint.input_offset)
+        return thermo_flag
+
+    def save_checkpoint(self, checkpoint, out, offset, steps):
+        """
+        Flushes the output file and saves a checkpoint of the conversion.
+
+        Parameters
+        ----------
+        checkpoint : ConversionCheckpoint
+            The checkpoints of the conversion.
+        out : XYZWriter
+            The writer, already opened.
+        offset : int
+            The position of the reader after the last step written.
+        steps : int
+            The number of steps written.
+        """
+        out.output.flush()
+        checkpoint.save(offset, os.path.getsize(out.filepath), steps,
+                        out.thermo_check)
+
+    @contextlib.contextmanager
+    def project_columns(self, out, atom_filter=None):
+        """
+        Restricts the atom keywords read from the steps to the ones used by
+        a writer (its columns attribute), unless a selection of columns was
+        given to the Simulation object, and the atoms read to the ones of an
+        atom filter, while the context is active.
+
+        Parameters
+        ----------
+        out : XYZWriter or BinaryWriter
+            The writer of the steps.
+        atom_filter : AtomFilter, optional
+            The selection of the atoms to read. Default is None (the atom
+            filter of the reader).
+        """
+        columns, atoms = self.file.columns, self.file.atom_filter
+        if columns is None:
+            self.file.columns = out.columns
+        if atom_filter is not None:
+            self.file.atom_filter = atom_filter
+        try:
+            yield
+        finally:
+            self.file.columns, self.file.atom_filter = columns, atoms
+
+    def create_writer(self, output):
+        """
+        Creates the writer of an output file: a BinaryWriter for .npy files
+        and an XYZWriter otherwise.
+
+        Parameters
+        ----------
+        output : str
+            The path to the output file.
+
+        Returns
+        -------
+        writer : XYZWriter or BinaryWriter
+            The writer of the output file.
+        """
+        if output.lower().endswith('.npy'):
+            return BinaryWriter(output)
+        return XYZWriter(output)
+
+    def follow(self, output=None, thermo_flag=True, poll_interval=0.1,
+               max_interval=5.0, timeout=None, callback=None):
+        """
+        Processes the steps of a simulation data file that is still being
+        written by a running job, as they are completed (see
+        YAMLReader.follow). The thermo data of each step is appended to
+        thermo_data, so that get_thermodata returns the steps processed so
+        far, and each step is appended to the output file, which is flushed
+        after every step. Earlier steps are never read again: a later call
+        with the same output continues where the previous one stopped.
+
+        Parameters
+        ----------
+        output : str, optional
+            The path to the output file (see convert_to_xyz). Defaults to
+            None (only the thermo data is collected).
+        thermo_flag : bool, optional
+            A boolean indicating if thermo data should be collected.
+            Default is True.
+        poll_interval : float, optional
+            The initial interval between two polls of the file, in seconds.
+            Default is 0.1.
+        max_interval : float, optional
+            The maximum interval between two polls, in seconds.
+            Default is 5.0.
+        timeout : float, optional
+            The time in seconds after which the method returns if no new
+            step is complete. Default is None (follow the file until
+            interrupted).
+        callback : callable, optional
+            A function called with each step after it has been processed.
+            Default is None.
+
+        Returns
+        -------
+        int
+            The number of steps processed.
+
+        Raises
+        ------
+        ValueError
+            If the steps are served from the binary cache.
+        """
+        if isinstance(self.file, CachedReader):
+            raise ValueError("The steps served from the binary cache cannot "
+                             "be followed.")
+
+        writer = None
+        if output is not None:
+            writer = self.create_writer(output)
+            if self.output is not None and \
+                    self.output.filepath == writer.filepath:
+                # Append to the output of the previous call
+                writer = self.output
+            self.output = writer
+
+        i = 0  # Counter for the number of steps processed
+        with writer if writer is not None else contextlib.nullcontext():
+            for step in self.file.follow(poll_interval, max_interval,
+                                         timeout):
+                if thermo_flag:
+                    # Get thermo data from the step
+                    thermo_flag = self.get_step_thermodata(step)
+
+                if writer is not None:
+                    # Append the step to the output file
+                    writer.write_to_xyz(step)
+                    writer.output.flush()
+
+                if callback is not None:
+                    callback(step)
+                # Print the step number
+                print('Step n. ', i, ' processed')
+                i += 1
+        return i
+
+    def write_chunks_parallel(self, out, thermo_flag, workers, chunk_steps,
+                              max_chunks, selection=None, first=0,
+                              checkpoint=None):
+        """
+        Converts the remaining steps of the simulation data to XYZ format
+        with a process pool and writes them to an open XYZWriter.
+        The first step is converted in this process to settle the state of
+        the writer (availability of thermo and box data). The following
+        steps are located with the index of the YAML file and split into
+        chunks, that are converted independently and written in order.
+        If the state of the writer changes inside a chunk, the chunks that
+        were converted with the old state are converted again, so that the
+        output is the same as the serial one.
+
+        Parameters
+        ----------
+        out : XYZWriter
+            The XYZWriter object, already opened.
+        thermo_flag : bool
+            A boolean indicating if thermo data should be included.
+        workers : int
+            The number of processes.
+        chunk_steps : int
+            The number of steps of each chunk.
+        max_chunks : int
+            The maximum number of chunks in flight. If None, twice the number
+            of workers is used.
+        selection : dict, optional
+            The stride, start_timestep and stop_timestep arguments of
+            select_offsets. Defaults to None (all the steps).
+        first : int, optional
+            The position of the first selected step among the remaining
+            ones. Default is 0.
+        checkpoint : ConversionCheckpoint, optional
+            The checkpoints of the conversion, saved after the chunks.
+            Default is None.
+
+        Returns
+        -------
+        None
+        """
+        start = self.file.tell()  # Current position of the reader
+        index = self.file.build_index()
+        offsets = self.select_offsets(index, start, first=first,
+                                      **(selection or {}))
+        if not offsets:
+            self.file.seek(index.end)
+            return
+
+        # Convert the first step serially
+        self.file.seek(offsets[0])
+        step = self.file.get_next_step()
+        if not step:
+            return
+        if thermo_flag:
+            thermo_flag = self.get_step_thermodata(step)
+        out.write_to_xyz(step)
+        # Counter for the number of steps processed
+        i = checkpoint.steps if checkpoint is not None else 0
+        print('Step n. ', i, ' processed')
+        i += 1
+
+        # Chunks of step offsets
+        chunks = deque(offsets[k:k + chunk_steps]
+                       for k in range(1, len(offsets), chunk_steps))
+        max_chunks = max_chunks if max_chunks else 2 * workers
+        pending = deque()  # Submitted chunks, in order
+        args = (self.file.filename, out.filepath, thermo_flag,
+                self.file.use_mmap)
+        # Columns read by the workers
+        projection = {'columns': self.file.columns,
+                      'thermo_columns': self.file.thermo_columns,
+                      'atom_filter': self.file.atom_filter}
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while chunks or pending:
+                # Keep at most max_chunks chunks in flight
+                while chunks and len(pending) < max_chunks:
+                    chunk = chunks.popleft()
+                    state = list(out.thermo_check)
+                    future = pool.submit(convert_chunk, *args, chunk, state,
+                                         **projection)
+                    pending.append((chunk, state, future))
+
+                chunk, state, future = pending.popleft()
+                text, end_state, thermo = future.result()
+                if state != out.thermo_check:
+                    # The chunk was converted with an outdated writer state
+                    text, end_state, thermo = convert_chunk(
+                        *args, chunk, list(out.thermo_check), **projection)
+
+                # Write the chunk to the output file
+                out.output.write(text)
+                out.thermo_check = end_state
+                for step_thermo in thermo:
+                    if thermo_flag:
+                        thermo_flag = self.get_step_thermodata(step_thermo)
+                    print('Step n. ', i, ' processed')
+                    i += 1
+
+                if checkpoint is not None and checkpoint.due():
+                    # The reader would continue at the step after the chunk
+                    n = bisect.bisect_right(index.offsets, chunk[-1])
+                    offset = index.offsets[n] if n < len(index) else \
+                        index.end
+                    self.save_checkpoint(checkpoint, out, offset, i)
+
+        # Leave the reader at the end of the file
+        self.file.seek(index.end)
+
+    def select_offsets(self, index, start, stride=1, start_timestep=None,
+                       stop_timestep=None, first=0):
+        """
+        Selects the offsets of the steps to convert from the index of the
+        YAML file, with the same rules as YAMLReader.iter_steps.
+
+        Parameters
+        ----------
+        index : StepIndex
+            The index of the YAML file.
+        start : int
+            The byte offset from which steps are considered.
+        stride : int, optional
+            Only every stride-th step is selected. Default is 1.
+        start_timestep : int, optional
+            The first timestep to select (included). Default is None.
+        stop_timestep : int, optional
+            The last timestep to select (included). Default is None.
+        first : int, optional
+            The position of the first selected step among the considered
+            ones. Default is 0.
+
+        Returns
+        -------
+        offsets : list
+            The byte offsets of the selected steps.
+        """
+        timestep_range = start_timestep is not None or \
+            stop_timestep is not None
+        offsets = []
+        n = 0  # Position of the step among the considered ones
+        for offset, timestep in zip(index.offsets, index.timesteps):
+            if offset < start:
+                continue
+            if timestep_range:
+                if not isinstance(timestep, int) or (
+                        start_timestep is not None and
+                        timestep < start_timestep):
+                    continue
+                if stop_timestep is not None and timestep > stop_timestep:
+                    break
+            if n >= first and (n - first) % stride == 0:
+                offsets.append(offset)
+            n += 1
+        return offsets
+
+    def get_thermodata(self, stride=1, start_timestep=None,
+                       stop_timestep=None):
         """
         Retrieves the thermo data from the simulation data.
         If the thermo data is not found, prints a message and returns None.
+        Only the header and the thermo data of each step are read, the atom
+        rows are skipped without being converted.
+        A selection of the steps can be read with stride, start_timestep and
+        stop_timestep. The selection only applies when the thermo data is
+        read from the file: thermo data already collected (e.g. by
+        convert_to_xyz) is returned as it is.
+
+        Parameters
+        ----------
+        stride : int, optional
+            Only every stride-th step is read. Default is 1.
+        start_timestep : int, optional
+            The first timestep to read (included). Default is None.
+        stop_timestep : int, optional
+            The last timestep to read (included). Timesteps are assumed to
+            increase along the file. Default is None.
 
         Returns
         -------
@@ -117,25 +745,23 @@ class Simulation:
         thermo_flag = True  # Flag for thermo data availability
 
         if self.thermo_data is None:
-            # Get step data from the file
-            step = self.file.get_next_step()
-
-            while True:  # Loop through the steps
-                if not step:
-                    # End of file
-                    break
+            # Serve the steps from the binary cache if it is enabled
+            self.open_cache()
+            # Get the thermo data of the selected steps from the file
+            steps = self.file.iter_steps(stride=stride,
+                                         start_timestep=start_timestep,
+                                         stop_timestep=stop_timestep,
+                                         thermo_only=True)
 
-                elif thermo_flag:
-                    # Check if thermo data is available in the step and get it
-                    thermo_flag = self.get_step_thermodata(step)
-                    # Get the next step
-                    step = self.file.get_next_step()
-
-                elif not thermo_flag:
+            for step in steps:  # Loop through the steps
+                if not thermo_flag:
                     # No thermo data found in the step
                     print('No thermo data found in the file')
                     break
 
+                # Check if thermo data is available in the step and get it
+                thermo_flag = self.get_step_thermodata(step)
+
                 # Print the step number
                 print('Step n. ', i, ' processed')
                 # Increment the step counter
@@ -143,16 +769,14 @@ class Simulation:
 
             if thermo_flag and self.thermo_keywords is not None:
                 # Create a DataFrame from the thermo data
-                thermo = pd.DataFrame(self.thermo_data,
-                                      columns=self.thermo_keywords)
+                thermo = self.thermo_data.to_dataframe()
                 return thermo
             else:
                 # No thermo data found
                 return None
         else:
             # Create a DataFrame from the thermo data
-            thermo = pd.DataFrame(self.thermo_data,
-                                  columns=self.thermo_keywords)
+            thermo = self.thermo_data.to_dataframe()
             return thermo
 
     def get_step_thermodata(self, step):
@@ -184,7 +808,7 @@ class Simulation:
             if thermo_flag:
                 # Get thermo keywords from the step
                 self.thermo_keywords = step['thermo']['keywords']
-                self.thermo_data = []
+                self.thermo_data = ThermoBuffer(self.thermo_keywords)
 
         if thermo_flag:
             # Append thermo data to the thermo_data attribute
@@ -225,6 +849,243 @@ class Simulation:
                 return False
             return True
 
+    def get_frame_table(self):
+        """
+        Retrieves the metadata of every frame of the simulation data as a
+        table, e.g. to spot missing frames or a collapsing box.
+        Only the headers of the steps are read: the thermo data is skipped
+        and the atom rows are skipped by line count, without being
+        converted. The position of the reader is restored afterwards.
+
+        Returns
+        -------
+        frames : DataFrame
+            One row per frame, with the columns 'timestep' and 'natoms'
+            (nullable integers), 'time' (float), 'units' and 'boundary' (the
+            boundary flags separated by spaces, e.g. 'p p p p s s') and the
+            bounds of the box 'xlo', 'xhi', 'ylo', 'yhi', 'zlo' and 'zhi'
+            (floats). Missing values are NaN or NA.
+        """
+        # pandas is imported only when a DataFrame is built
+        import pandas as pd
+
+        columns = {name: [] for name in self.FRAME_COLUMNS}
+        position = self.file.tell()
+        self.file.seek(0)
+        try:
+            while not self.file.file.closed:
+                header = self.file.get_next_header()
+                if header:
+                    for name, value in self.get_frame_row(header).items():
+                        columns[name].append(value)
+        finally:
+            # Restore the position of the reader
+            self.file.seek(position)
+
+        frames = {}
+        for name, values in columns.items():
+            if name in ('timestep', 'natoms'):
+                frames[name] = pd.array(values, dtype='Int64')
+            elif name in ('units', 'boundary'):
+                frames[name] = pd.Series(values, dtype=object)
+            else:
+                frames[name] = pd.Series(values, dtype='float64')
+        return pd.DataFrame(frames, columns=self.FRAME_COLUMNS)
+
+    def get_frame_row(self, header):
+        """
+        Returns the row of the frame table of a step header.
+
+        Parameters
+        ----------
+        header : dict
+            The header of a step.
+
+        Returns
+        -------
+        row : dict
+            The values of the columns of the frame table.
+        """
+        def typed(value, kinds=(int, float)):
+            # The value if it has one of the types, None otherwise
+            return value if type(value) in kinds else None
+
+        boundary = header.get('boundary')
+        if isinstance(boundary, list):
+            boundary = ' '.join(map(str, boundary))
+        row = {'timestep': typed(header.get('timestep'), (int,)),
+               'time': typed(header.get('time')),
+               'natoms': typed(header.get('natoms'), (int,)),
+               'units': typed(header.get('units'), (str,)),
+               'boundary': typed(boundary, (str,))}
+
+        box = header.get('box')
+        for n, axis in enumerate('xyz'):
+            bounds = box[n] if isinstance(box, list) and len(box) > n \
+                else None
+            if not isinstance(bounds, list) or len(bounds) < 2:
+                # Missing bounds (the tilt factors are ignored)
+                bounds = [None, None]
+            row[axis + 'lo'] = typed(bounds[0])
+            row[axis + 'hi'] = typed(bounds[1])
+        return row
+
+    def extract_atom_series(self, path, fields=('x', 'y', 'z'), stride=1,
+                            atom_filter=None, block_frames=256):
+        """
+        Writes the time series of the atoms to a transposed store (see
+        AtomSeries), in one pass over the steps, so that the values of an
+        atom in every frame are later read as a slice of a memory-mapped
+        array. The number of frames is taken from the index of the YAML file
+        (or from the binary cache), and only the stored fields and the atom
+        ids are read from the steps. The position of the reader is restored
+        afterwards.
+
+        Parameters
+        ----------
+        path : str
+            The path to the store directory.
+        fields : sequence, optional
+            The atom keywords stored. Default is ('x', 'y', 'z').
+        stride : int, optional
+            Only every stride-th step is stored. Default is 1.
+        atom_filter : AtomFilter, optional
+            The selection of the atoms stored (the atoms selected in the
+            first step). Default is None (the atom filter of the Simulation
+            object, if any).
+        block_frames : int, optional
+            The number of frames gathered before being written.
+            Default is 256.
+
+        Returns
+        -------
+        series : AtomSeries
+            The store, loaded with memory-mapped arrays.
+        """
+        if stride < 1:
+            raise ValueError("stride must be a positive integer.")
+        # Serve the steps from the binary cache if it is enabled
+        if self.open_cache():
+            n_steps = len(self.cache)
+        else:
+            n_steps = len(self.file.build_index())
+
+        series = AtomSeries(path, fields, len(range(0, n_steps, stride)),
+                            block_frames)
+        position = self.file.tell()
+        self.file.seek(0)
+        try:
+            # Only the stored fields and the selected atoms are read
+            with series, self.project_columns(series, atom_filter):
+                for step in self.file.iter_steps(stride=stride):
+                    series.write_step(step)
+        finally:
+            # Restore the position of the reader
+            self.file.seek(position)
+        return AtomSeries.load(path)
+
+    def get_msd_analyzer(self, path, stride=1, atom_filter=None,
+                         batch_atoms=None):
+        """
+        Writes the time series of the coordinates and of the type of the
+        atoms to a store (see extract_atom_series) and returns the MSD
+        analyzer of the store (see MSDAnalyzer).
+
+        Parameters
+        ----------
+        path : str
+            The path to the store directory.
+        stride : int, optional
+            Only every stride-th step is used. Default is 1.
+        atom_filter : AtomFilter, optional
+            The selection of the atoms used. Default is None (the atom filter
+            of the Simulation object, if any).
+        batch_atoms : int, optional
+            The number of atoms processed at once. Defaults to None (see
+            MSDAnalyzer).
+
+        Returns
+        -------
+        analyzer : MSDAnalyzer
+            The analyzer of the stored time series.
+        """
+        # Coordinates and type found in the atom keywords of the first step
+        position = self.file.tell()
+        self.file.seek(0)
+        try:
+            keywords = self.file.get_next_header().get('keywords')
+        finally:
+            self.file.seek(position)
+        if not isinstance(keywords, list):
+            keywords = []
+        fields = [name for name in MSDAnalyzer.AXES + ['type']
+                  if name in keywords]
+
+        series = self.extract_atom_series(path, fields, stride, atom_filter)
+        return MSDAnalyzer(series, batch_atoms)
+
+    def get_msd(self, path, stride=1, atom_filter=None, batch_atoms=None):
+        """
+        Retrieves the mean-squared displacement of the atoms, grouped by
+        type, with the coordinates unwrapped across the periodic directions.
+        The coordinates are written to a store of time series first, so that
+        trajectories larger than the memory are processed by batches of
+        atoms.
+
+        Parameters
+        ----------
+        path : str
+            The path to the store directory.
+        stride : int, optional
+            Only every stride-th step is used. Default is 1.
+        atom_filter : AtomFilter, optional
+            The selection of the atoms used. Default is None.
+        batch_atoms : int, optional
+            The number of atoms processed at once. Default is None.
+
+        Returns
+        -------
+        msd : DataFrame
+            One row per lag, with the lag time as index and one column per
+            atom type (see MSDAnalyzer.msd).
+        """
+        analyzer = self.get_msd_analyzer(path, stride, atom_filter,
+                                         batch_atoms)
+        return analyzer.msd()
+
+    def get_diffusion(self, path, stride=1, atom_filter=None,
+                      batch_atoms=None, start=0.1, stop=0.5):
+        """
+        Retrieves the diffusion coefficient of the atoms, grouped by type,
+        from the slope of their mean-squared displacement (see get_msd and
+        MSDAnalyzer.diffusion).
+
+        Parameters
+        ----------
+        path : str
+            The path to the store directory.
+        stride : int, optional
+            Only every stride-th step is used. Default is 1.
+        atom_filter : AtomFilter, optional
+            The selection of the atoms used. Default is None.
+        batch_atoms : int, optional
+            The number of atoms processed at once. Default is None.
+        start : float, optional
+            The first lag of the fit, as a fraction of the lags.
+            Default is 0.1.
+        stop : float, optional
+            The last lag of the fit (excluded), as a fraction of the lags.
+            Default is 0.5.
+
+        Returns
+        -------
+        diffusion : Series
+            The diffusion coefficient of each atom type.
+        """
+        analyzer = self.get_msd_analyzer(path, stride, atom_filter,
+                                         batch_atoms)
+        return analyzer.diffusion(start=start, stop=stop)
+
     def make_graphs(self, mode='display'):
         """
         Creates an instance of the GraphMaker class and generates graphs based
@@ -248,6 +1109,9 @@ class Simulation:
         """
         # Get thermo data
         thermo_df = self.get_thermodata()
+        # Import the plotting stack only when graphs are made
+        from lammpshade.GraphMaker import GraphMaker
+
         # Create GraphMaker object
         self.graphs = GraphMaker(thermo_df)
 
@@ -258,3 +1122,68 @@ class Simulation:
                              'Valid values are "display" and "interactive"')
         else:
             self.graphs.run(mode)
+
+
+def convert_chunk(filename, output, thermo_flag, use_mmap, offsets,
+                  thermo_check, columns=None, thermo_columns=None,
+                  atom_filter=None):
+    """
+    Converts a chunk of steps of a YAML file to XYZ format.
+    Used by the worker processes of Simulation.convert_to_xyz.
+
+    Parameters
+    ----------
+    filename : str
+        The path to the YAML file.
+    output : str
+        The path to the output XYZ file (nothing is written to it).
+    thermo_flag : bool
+        A boolean indicating if the thermo data of the steps is returned.
+    use_mmap : bool
+        If True, the YAML file is read through a memory map.
+    offsets : list
+        The byte offsets of the steps of the chunk.
+    thermo_check : list
+        The state of the XYZWriter at the beginning of the chunk.
+    columns : list, optional
+        The atom keywords read from the steps. Defaults to None (all).
+    thermo_columns : list, optional
+        The thermo keywords read from the steps. Defaults to None (all).
+    atom_filter : AtomFilter, optional
+        The selection of the atoms read from the steps. Defaults to None.
+
+    Returns
+    -------
+    text : str
+        The steps of the chunk in XYZ format.
+    thermo_check : list
+        The state of the XYZWriter at the end of the chunk.
+    thermo : list
+        One dictionary per step containing its thermo data (if any), or an
+        empty list if thermo_flag is False.
+    """
+    reader = YAMLReader(filename, use_mmap=use_mmap, columns=columns,
+                        thermo_columns=thermo_columns,
+                        atom_filter=atom_filter)
+
+    # Write to memory instead of the output file
+    writer = XYZWriter(output)
+    writer.output = io.StringIO()
+    writer.thermo_check = thermo_check
+
+    thermo = []
+    for offset in offsets:
+        reader.seek(offset)
+        step = reader.get_next_step()
+        if not step:
+            break
+        if thermo_flag:
+            # Keep the original keywords, which are modified by the writer
+            thermo.append({'thermo': dict(step['thermo'])}
+                          if 'thermo' in step else {})
+        else:
+            thermo.append({})
+        writer.write_to_xyz(step)
+
+    reader.file.close()
+    return writer.output.getvalue(), writer.thermo_check, thermo
@@ -0,0 +1,156 @@
+"""
+This module provides the checkpoints of a conversion, which allow an
+interrupted conversion to be resumed after the last step written.
+"""
+import json
+import os
+import time
+
+
+class ConversionCheckpoint:
+    """
+    A class to save and load the checkpoint of a conversion in a JSON file
+    next to the output file (the output path followed by '.ckpt').
+    The checkpoint records the position of the reader after the last step
+    written, the size of the output file at that point, the number of steps
+    written and the state of the writer. It is only valid for the same input
+    file and the same selection of steps.
+
+    ...
+
+    Attributes
+    ----------
+    path : str
+        The path to the checkpoint file.
+    output : str
+        The path to the output file.
+    settings : dict
+        The input file and the selection of steps of the conversion.
+    interval : float
+        The minimum time between two checkpoints, in seconds.
+    input_offset : int
+        The position of the reader after the last step written.
+    output_offset : int
+        The size of the output file after the last step written.
+    steps : int
+        The number of steps written.
+    thermo_check : list
+        The state of the writer after the last step written.
+
+    Methods
+    -------
+    __init__(output, settings, interval=60.0)
+        Initializes a ConversionCheckpoint object.
+    load()
+        Loads the checkpoint file if it is valid.
+    due()
+        Returns True if a checkpoint should be saved.
+    save(input_offset, output_offset, steps, thermo_check)
+        Saves a checkpoint.
+    remove()
+        Removes the checkpoint file.
+    """
+
+    VERSION = 1  # Version of the checkpoint format
+
+    def __init__(self, output, settings, interval=60.0):
+        """
+        Initializes a ConversionCheckpoint object.
+
+        Parameters
+        ----------
+        output : str
+            The path to the output file.
+        settings : dict
+            The input file and the selection of steps of the conversion,
+            which must match for a checkpoint to be resumed.
+        interval : float, optional
+            The minimum time between two checkpoints, in seconds.
+            Default is 60.
+        """
+        self.path = output + '.ckpt'  # Path to the checkpoint file
+        self.output = output  # Path to the output file
+        self.settings = settings  # Input file and selection of steps
+        self.interval = interval  # Minimum time between two checkpoints
+        self.input_offset = 0  # Position of the reader
+        self.output_offset = 0  # Size of the output file
+        self.steps = 0  # Number of steps written
+        self.thermo_check = [True]*2  # State of the writer
+        self._last_save = time.monotonic()  # Time of the last checkpoint
+
+    def load(self):
+        """
+        Loads the checkpoint file. A checkpoint is only valid if it was saved
+        for the same settings and if the output file contains the steps it
+        records.
+
+        Returns
+        -------
+        bool
+            True if a valid checkpoint was loaded.
+        """
+        try:
+            with open(self.path, 'r') as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return False
+
+        if state.get('version') != self.VERSION or \
+                state.get('settings') != self.settings:
+            print('The checkpoint of a different conversion was found\n' +
+                  'The conversion will start from the beginning')
+            return False
+        if not os.path.exists(self.output) or \
+                os.path.getsize(self.output) < state['output_offset']:
+            print('The output file is shorter than its checkpoint\n' +
+                  'The conversion will start from the beginning')
+            return False
+
+        self.input_offset = state['input_offset']
+        self.output_offset = state['output_offset']
+        self.steps = state['steps']
+        self.thermo_check = state['thermo_check']
+        return True
+
+    def due(self):
+        """
+        Returns True if the last checkpoint is older than the interval.
+        """
+        return time.monotonic() - self._last_save >= self.interval
+
+    def save(self, input_offset, output_offset, steps, thermo_check):
+        """
+        Saves a checkpoint. The file is replaced atomically, so that an
+        interruption while saving leaves the previous checkpoint.
+
+        Parameters
+        ----------
+        input_offset : int
+            The position of the reader after the last step written.
+        output_offset : int
+            The size of the output file after the last step written, once
+            flushed.
+        steps : int
+            The number of steps written.
+        thermo_check : list
+            The state of the writer after the last step written.
+        """
+        self.input_offset = input_offset
+        self.output_offset = output_offset
+        self.steps = steps
+        self.thermo_check = list(thermo_check)
+        state = {'version': self.VERSION, 'settings': self.settings,
+                 'input_offset': input_offset,
+                 'output_offset': output_offset, 'steps': steps,
+                 'thermo_check': self.thermo_check}
+        with open(self.path + '.tmp', 'w') as file:
+            json.dump(state, file)
+        os.replace(self.path + '.tmp', self.path)
+        self._last_save = time.monotonic()
+
+    def remove(self):
+        """
+        Removes the checkpoint file, once the conversion is complete.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,204 @@
+"""
+This module provides a class for formatting the atom data of a step as the
+text lines of an XYZ frame.
+"""
+
+
+class FrameFormatter:
+    """
+    A class to format the atom data of a step as space-separated text lines,
+    keeping only a selection of columns in a given order.
+    The selection is resolved once for each layout of atom keywords and
+    cached. Each column is then converted to text in bulk and the lines are
+    assembled in a single buffer. The values are written exactly as pandas'
+    DataFrame.to_csv would write them, as long as the integers fit in 64
+    bits: integer columns as integers, numeric columns containing at least
+    one float as floats (shortest repr), missing values as empty fields and
+    other columns as the string of each value, quoted when it contains a
+    space, a quote or a line break. Integers beyond the 64-bit range, for
+    which the type inferred by pandas varies, are always written as
+    integers.
+
+    ...
+
+    Attributes
+    ----------
+    columns : list
+        The keywords of the columns to write, in output order.
+
+    Methods
+    -------
+    __init__(columns)
+        Initializes a FrameFormatter object.
+    layout(keywords)
+        Returns the positions and names of the selected columns.
+    format(data, keywords)
+        Formats the atom data as text lines.
+    format_column(column)
+        Converts a column of Python values to a list of strings.
+    format_array_column(column)
+        Converts a NumPy array column to a list of strings.
+    """
+
+    QUOTED = (' ', '"', '\n', '\r')  # Characters of the quoted fields
+
+    def __init__(self, columns):
+        """
+        Initializes a FrameFormatter object.
+
+        Parameters
+        ----------
+        columns : list
+            The keywords of the columns to write, in output order. Keywords
+            missing from a step are ignored.
+        """
+        self.columns = list(columns)  # Keywords of the output columns
+        self._layouts = {}  # Cache of the layouts, by atom keywords
+
+    def layout(self, keywords):
+        """
+        Returns the positions and names of the selected columns for a layout
+        of atom keywords. The result is cached.
+
+        Parameters
+        ----------
+        keywords : list
+            The atom keywords of the step.
+
+        Returns
+        -------
+        layout : list
+            A list of (position in keywords, keyword) tuples, in output order.
+        """
+        key = tuple(keywords)
+        if key not in self._layouts:
+            self._layouts[key] = [
+                (keywords.index(column), column)
+                for column in self.columns if column in keywords
+            ]
+        return self._layouts[key]
+
+    def format(self, data, keywords):
+        """
+        Formats the atom data as text lines.
+
+        Parameters
+        ----------
+        data : list or numpy.ndarray
+            The atom data, as a list of lists (one per atom) or as a NumPy
+            structured array with one field per keyword.
+        keywords : list
+            The atom keywords of the step.
+
+        Returns
+        -------
+        text : str
+            One line per atom, each ending with a newline character.
+
+        Raises
+        ------
+        ValueError
+            If the atom rows do not match the number of keywords.
+        """
+        layout = self.layout(keywords)
+        if len(data) == 0 or not layout:
+            return ''
+
+        if hasattr(data, 'dtype'):
+            # NumPy structured array
+            columns = [self.format_array_column(data[name])
+                       for _, name in layout]
+        else:
+            if set(map(len, data)) != {len(keywords)}:
+                raise ValueError(f"{len(keywords)} columns passed, but the "
+                                 "atom rows have a different length.")
+            # Transpose the rows into columns
+            transposed = list(zip(*data))
+            columns = [self.format_column(transposed[position])
+                       for position, _ in layout]
+
+        if len(columns) == 1:
+            # A line with a single empty field is written as a quoted field
+            columns = [['""' if value == '' else value
+                        for value in columns[0]]]
+        return '\n'.join(map(' '.join, zip(*columns))) + '\n'
+
+    def format_column(self, column):
+        """
+        Converts a column of Python values to a list of strings.
+
+        Parameters
+        ----------
+        column : sequence
+            The values of the column.
+
+        Returns
+        -------
+        list
+            The values converted to strings.
+        """
+        kinds = set(map(type, column))
+        if kinds <= {str}:
+            return self._quote(list(column))
+        if kinds <= {int} or kinds <= {bool}:
+            return list(map(str, column))
+        if kinds <= {int, float, type(None)} and \
+                not self._has_big_int(column, kinds):
+            # Numeric column with floats: every value is written as a float
+            if type(None) not in kinds:
+                return self._fix_nan(list(map(repr, map(float, column))))
+            return ['' if value is None or value != value
+                    else repr(float(value)) for value in column]
+        # Mixed column: every value is written as it is
+        return self._quote(['' if value is None or value != value
+                            else str(value) for value in column])
+
+    def format_array_column(self, column):
+        """
+        Converts a NumPy array column to a list of strings.
+
+        Parameters
+        ----------
+        column : numpy.ndarray
+            The values of the column.
+
+        Returns
+        -------
+        list
+            The values converted to strings.
+        """
+        if column.dtype.kind == 'f':
+            return self._fix_nan(list(map(repr, column.tolist())))
+        if column.dtype.kind == 'U':
+            return self._quote(column.tolist())
+        return self.format_column(column.tolist())
+
+    def _has_big_int(self, column, kinds):
+        """
+        Checks if a numeric column holds integers beyond the 64-bit range,
+        which are not converted to floats.
+        """
+        if int not in kinds:
+            return False
+        integers = [value for value in column if type(value) is int]
+        return min(integers) < -2**63 or max(integers) >= 2**63
+
+    def _quote(self, column):
+        """
+        Quotes the strings of a column that contain a space, a quote or a
+        line break, doubling their quotes.
+        """
+        text = ''.join(column)
+        if not any(char in text for char in self.QUOTED):
+            return column
+        return ['"' + value.replace('"', '""') + '"'
+                if any(char in value for char in self.QUOTED) else value
+                for value in column]
+
+    def _fix_nan(self, column):
+        """
+        Replaces the 'nan' strings of a float column with empty fields.
+        """
+        if 'nan' in column:
+            column = ['' if value == 'nan' else value for value in column]
+        return column
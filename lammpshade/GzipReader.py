@@ -0,0 +1,242 @@
+"""
+This module provides a seekable reader of gzip files that records
+checkpoints of the decompressor, so that random access does not need to
+decompress the file from the beginning.
+"""
+import bisect
+import io
+import zlib
+
+
+# Magic number of gzip members
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class GzipReader(io.RawIOBase):
+    """
+    A class to read the decompressed bytes of a gzip file (possibly made of
+    several members) as a seekable binary stream.
+    While the file is read, the state of the decompressor is copied every
+    `spacing` decompressed bytes. A seek restores the last checkpoint before
+    the target and only decompresses the bytes between them, whether the
+    target is before or after the current position. The checkpoints can be
+    shared between several readers of the same file.
+
+    ...
+
+    Attributes
+    ----------
+    filename : str
+        The path to the gzip file.
+    spacing : int
+        The number of decompressed bytes between two checkpoints.
+    checkpoints : list
+        The (decompressed offset, compressed offset, decompressor)
+        checkpoints, sorted by decompressed offset.
+
+    Methods
+    -------
+    __init__(filename, spacing=16777216, checkpoints=None)
+        Initializes a GzipReader object.
+    readable()
+        Returns True.
+    seekable()
+        Returns True.
+    readinto(buffer)
+        Reads decompressed bytes into a buffer.
+    tell()
+        Returns the current decompressed offset.
+    seek(offset, whence=0)
+        Moves to a decompressed offset.
+    close()
+        Closes the gzip file.
+    """
+
+    CHUNK_SIZE = 65536  # Compressed bytes read at once
+    OUTPUT_SIZE = 1048576  # Maximum decompressed bytes at once
+
+    def __init__(self, filename, spacing=16777216, checkpoints=None):
+        """
+        Initializes a GzipReader object.
+
+        Parameters
+        ----------
+        filename : str
+            The path to the gzip file.
+        spacing : int, optional
+            The number of decompressed bytes between two checkpoints.
+            Default is 16 MiB.
+        checkpoints : list, optional
+            A list of checkpoints shared with other readers of the same
+            file. Defaults to a new list.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the specified file is not found.
+        """
+        super().__init__()
+        self.filename = filename  # Path to the gzip file
+        self.spacing = spacing  # Decompressed bytes between checkpoints
+        # Checkpoints of the decompressor, shared with other readers
+        self.checkpoints = [] if checkpoints is None else checkpoints
+        self._file = open(filename, 'rb')  # Compressed file
+        self._restore((0, 0, zlib.decompressobj(zlib.MAX_WBITS | 16)))
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        """
+        Reads decompressed bytes into a buffer.
+
+        Parameters
+        ----------
+        buffer : writable bytes-like object
+            The buffer to fill.
+
+        Returns
+        -------
+        int
+            The number of bytes read, 0 at the end of the file.
+        """
+        while self._start >= len(self._output):
+            if not self._fill():
+                return 0
+        size = min(len(buffer), len(self._output) - self._start)
+        buffer[:size] = self._output[self._start:self._start + size]
+        self._start += size
+        self._pos += size
+        return size
+
+    def tell(self):
+        """
+        Returns the current decompressed offset.
+        """
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """
+        Moves to a decompressed offset, restoring the closest checkpoint
+        before it if it is ahead of the current position.
+
+        Parameters
+        ----------
+        offset : int
+            The offset, relative to whence.
+        whence : int, optional
+            io.SEEK_SET (default) or io.SEEK_CUR.
+
+        Returns
+        -------
+        int
+            The new decompressed offset.
+
+        Raises
+        ------
+        io.UnsupportedOperation
+            If whence is io.SEEK_END.
+        """
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("Seeking from the end of a gzip "
+                                          "file is not supported.")
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}.")
+
+        # Closest checkpoint before the target
+        n = bisect.bisect_right(self.checkpoints, (offset, float('inf'))) - 1
+        if offset < self._pos or (n >= 0 and
+                                  self.checkpoints[n][0] > self._pos):
+            self._restore(self.checkpoints[n] if n >= 0 else
+                          (0, 0, zlib.decompressobj(zlib.MAX_WBITS | 16)))
+
+        # Decompress up to the target
+        while self._pos < offset:
+            if self._start >= len(self._output) and not self._fill():
+                break
+            size = min(offset - self._pos, len(self._output) - self._start)
+            self._start += size
+            self._pos += size
+        return self._pos
+
+    def close(self):
+        """
+        Closes the gzip file.
+        """
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+    def _restore(self, checkpoint):
+        """
+        Restores the state of a checkpoint.
+        """
+        pos, compressed_pos, decompressor = checkpoint
+        self._pos = pos  # Decompressed offset of the next byte
+        self._decompressor = decompressor.copy()
+        self._file.seek(compressed_pos)
+        self._input = b''  # Compressed bytes not fed to the decompressor
+        self._output = b''  # Decompressed bytes not returned yet
+        self._start = 0  # Position of the next byte in the output
+        self._eof = False  # End of the gzip file
+        self._last_checkpoint = pos  # Offset of the last checkpoint
+
+    def _fill(self):
+        """
+        Decompresses the next chunk of the file into the output. Returns
+        False at the end of the file.
+        """
+        if self._eof:
+            return False
+        if self._pos - self._last_checkpoint >= self.spacing:
+            self._add_checkpoint()
+
+        if not self._input:
+            self._input = self._file.read(self.CHUNK_SIZE)
+            if not self._input:
+                # End of the compressed file: return the pending output
+                self._eof = True
+                self._output = self._decompressor.flush()
+                self._start = 0
+                return bool(self._output)
+        # The output is bounded so that checkpoints can be placed within
+        # highly compressed chunks
+        self._output = self._decompressor.decompress(self._input,
+                                                     self.OUTPUT_SIZE)
+        self._start = 0
+        self._input = self._decompressor.unconsumed_tail
+
+        if self._decompressor.eof:
+            # End of a member: the next one starts with the unused bytes
+            self._input = self._decompressor.unused_data
+            while len(self._input) < len(GZIP_MAGIC):
+                # The magic of the next member may be split between chunks
+                chunk = self._file.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                self._input += chunk
+            if self._input.startswith(GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            else:
+                # Last member, possibly followed by padding
+                self._eof = not self._output
+                self._input = b''
+                self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+                self._file.seek(0, io.SEEK_END)
+        return True
+
+    def _add_checkpoint(self):
+        """
+        Records the state of the decompressor at the current offset.
+        """
+        compressed_pos = self._file.tell() - len(self._input)
+        checkpoint = (self._pos, compressed_pos, self._decompressor.copy())
+        n = bisect.bisect_left(self.checkpoints, (self._pos,))
+        if n == len(self.checkpoints) or self.checkpoints[n][0] != self._pos:
+            self.checkpoints.insert(n, checkpoint)
+        self._last_checkpoint = self._pos
@@ -0,0 +1,269 @@
+"""
+This module provides the mean-squared displacement (MSD) and the diffusion
+coefficients of the atoms of a simulation, computed from the time series of
+their coordinates.
+"""
+import numpy as np
+
+
+class MSDAnalyzer:
+    """
+    A class to compute the mean-squared displacement of the atoms of a
+    simulation, grouped by type, and their diffusion coefficients.
+    The coordinates are read from a store of time series (see AtomSeries),
+    by batches of atoms, so that the trajectory does not need to fit in
+    memory: each batch is unwrapped across the periodic directions of the
+    'boundary' of the simulation, and its MSD at every lag is computed with
+    the FFT algorithm, in O(N log N) operations for N frames instead of
+    O(N^2) for the average over the time windows:
+
+        MSD(m) = S1(m) - 2 S2(m)
+
+    where S1(m) is the mean of r(k + m)^2 + r(k)^2 over the windows, given by
+    cumulative sums, and S2(m) the autocorrelation of the positions, given by
+    FFT. The MSD of the batches are summed by type.
+
+    ...
+
+    Attributes
+    ----------
+    series : AtomSeries
+        The time series of the coordinates of the atoms.
+    fields : list
+        The coordinates used, among 'x', 'y' and 'z'.
+    batch_atoms : int
+        The number of atoms processed at once.
+    periodic : list
+        True for the periodic directions of the fields.
+
+    Methods
+    -------
+    __init__(series, batch_atoms=None)
+        Initializes an MSDAnalyzer object.
+    msd()
+        Returns the MSD of the atoms of each type.
+    diffusion(msd=None, start=0.1, stop=0.5)
+        Returns the diffusion coefficient of the atoms of each type.
+    lag_times()
+        Returns the time of each lag.
+    unwrap(positions)
+        Unwraps the coordinates of a batch of atoms.
+    msd_fft(positions)
+        Returns the MSD of a batch of atoms at every lag.
+    """
+
+    AXES = ['x', 'y', 'z']  # Coordinates, in the order of the box bounds
+    BATCH_VALUES = 2**22  # Coordinates processed at once by default
+
+    def __init__(self, series, batch_atoms=None):
+        """
+        Initializes an MSDAnalyzer object.
+
+        Parameters
+        ----------
+        series : AtomSeries
+            The loaded time series of the atoms, with some of the 'x', 'y'
+            and 'z' fields (and 'type' to group the atoms by type).
+        batch_atoms : int, optional
+            The number of atoms processed at once. Defaults to None (as many
+            atoms as BATCH_VALUES coordinates).
+
+        Raises
+        ------
+        KeyError
+            If the series has no coordinate.
+        """
+        self.series = series  # Time series of the atoms
+        self.fields = [axis for axis in self.AXES if axis in series.fields]
+        if not self.fields:
+            raise KeyError("No coordinate ('x', 'y' or 'z') is found in the "
+                           "series")
+        if batch_atoms is None:
+            batch_atoms = self.BATCH_VALUES // max(len(series), 1)
+        self.batch_atoms = max(int(batch_atoms), 1)  # Atoms processed at once
+
+        # Periodic directions, with both bounds 'p'
+        boundary = series.boundary
+        self.periodic = [isinstance(boundary, list) and len(boundary) == 6
+                         and boundary[2 * n] == boundary[2 * n + 1] == 'p'
+                         for n in (self.AXES.index(axis)
+                                   for axis in self.fields)]
+
+    def msd(self):
+        """
+        Returns the MSD of the atoms of each type, averaged over the atoms
+        and the time windows. The atoms missing from a frame (NaN values)
+        are ignored.
+
+        Returns
+        -------
+        msd : DataFrame
+            One row per lag, with the lag time as index ('lag') and one
+            column per atom type (a single column named 'all' if the series
+            has no 'type' field), in squared distance units of the file.
+        """
+        # pandas is imported only when a DataFrame is built
+        import pandas as pd
+
+        n_frames = len(self.series)
+        n_atoms = len(self.series.ids)
+        types = self.series.series['type'][:, 0] \
+            if 'type' in self.series.series and n_frames else None
+
+        sums, counts = {}, {}  # Sum of the MSD and number of atoms by type
+        for start in range(0, n_atoms, self.batch_atoms):
+            stop = min(start + self.batch_atoms, n_atoms)
+            positions = np.stack([np.asarray(self.series.series[field]
+                                             [start:stop])
+                                  for field in self.fields], axis=-1)
+            # Atoms present in every frame
+            present = np.all(np.isfinite(positions), axis=(1, 2))
+            msd = self.msd_fft(self.unwrap(positions[present]))
+            keys = types[start:stop][present] if types is not None else \
+                np.zeros(len(msd))
+            for key in np.unique(keys):
+                selected = keys == key
+                sums[key] = sums.get(key, 0) + msd[selected].sum(axis=0)
+                counts[key] = counts.get(key, 0) + int(selected.sum())
+
+        columns = {}
+        for key in sorted(sums):
+            name = 'all' if types is None else \
+                (int(key) if float(key).is_integer() else key)
+            columns[name] = sums[key] / counts[key]
+        return pd.DataFrame(columns, index=pd.Index(self.lag_times(),
+                                                    name='lag'))
+
+    def diffusion(self, msd=None, start=0.1, stop=0.5):
+        """
+        Returns the diffusion coefficient of the atoms of each type, from
+        the slope of a linear fit of their MSD against the lag time:
+        D = slope / (2 d), with d the number of coordinates. The fit range
+        excludes the short lags (ballistic regime) and the long lags, which
+        are averaged over few time windows.
+
+        Parameters
+        ----------
+        msd : DataFrame, optional
+            The MSD returned by the msd method. Defaults to None (the MSD is
+            computed).
+        start : float, optional
+            The first lag of the fit, as a fraction of the lags.
+            Default is 0.1.
+        stop : float, optional
+            The last lag of the fit (excluded), as a fraction of the lags.
+            Default is 0.5.
+
+        Returns
+        -------
+        diffusion : Series
+            The diffusion coefficient of each atom type, in squared distance
+            units per time unit of the file.
+
+        Raises
+        ------
+        ValueError
+            If the fit range contains less than two lags.
+        """
+        import pandas as pd
+
+        if msd is None:
+            msd = self.msd()
+        first = int(start * len(msd))
+        last = int(stop * len(msd))
+        if last - first < 2:
+            raise ValueError(f"The fit range contains {max(last - first, 0)} "
+                             f"lags, at least 2 are needed.")
+        times = np.asarray(msd.index, dtype=float)[first:last]
+        coefficients = {
+            name: np.polyfit(times, msd[name].to_numpy()[first:last], 1)[0] /
+            (2 * len(self.fields)) for name in msd.columns}
+        return pd.Series(coefficients, name='D', dtype=float)
+
+    def lag_times(self):
+        """
+        Returns the time of each lag, from the time of the frames (or from
+        their timestep if the time is missing). The frames are assumed to be
+        evenly spaced.
+
+        Returns
+        -------
+        numpy.ndarray
+            The time of each lag, starting at 0.
+        """
+        frames = self.series.frames
+        times = np.asarray(frames['time'], dtype=float)
+        if not np.all(np.isfinite(times)):
+            times = np.asarray(frames['timestep'], dtype=float)
+        return times - times[0] if len(times) else times
+
+    def unwrap(self, positions):
+        """
+        Unwraps the coordinates of a batch of atoms across the periodic
+        directions: a displacement between two frames longer than half the
+        box length is taken as a crossing of the boundary.
+
+        Parameters
+        ----------
+        positions : numpy.ndarray
+            The coordinates of the atoms, of shape (atoms, frames, fields).
+
+        Returns
+        -------
+        numpy.ndarray
+            The unwrapped coordinates, of the same shape.
+        """
+        if not any(self.periodic) or positions.shape[1] < 2:
+            return positions
+        box = self.series.frames['box']
+        steps = np.diff(positions, axis=1)
+        for n, axis in enumerate(self.fields):
+            if not self.periodic[n]:
+                continue
+            bounds = box[:, self.AXES.index(axis)]
+            # Box length at the end of each displacement
+            length = (bounds[1:, 1] - bounds[1:, 0])[np.newaxis, :]
+            steps[..., n] -= length * np.round(steps[..., n] / length)
+        unwrapped = np.empty_like(positions)
+        unwrapped[:, 0] = positions[:, 0]
+        np.cumsum(steps, axis=1, out=unwrapped[:, 1:])
+        unwrapped[:, 1:] += positions[:, :1]
+        return unwrapped
+
+    @staticmethod
+    def msd_fft(positions):
+        """
+        Returns the MSD of a batch of atoms at every lag, averaged over the
+        time windows, with the FFT algorithm.
+
+        Parameters
+        ----------
+        positions : numpy.ndarray
+            The unwrapped coordinates of the atoms, of shape (atoms, frames,
+            fields).
+
+        Returns
+        -------
+        numpy.ndarray
+            The MSD of each atom, of shape (atoms, frames).
+        """
+        n_atoms, n_frames = positions.shape[:2]
+        if not n_atoms or not n_frames:
+            return np.zeros((n_atoms, n_frames))
+        windows = np.arange(n_frames, 0, -1)  # Windows of each lag
+
+        # S1: mean of r(k + m)^2 + r(k)^2, from cumulative sums
+        squares = np.sum(positions ** 2, axis=2)
+        cumulative = np.zeros((n_atoms, n_frames + 1))
+        np.cumsum(squares, axis=1, out=cumulative[:, 1:])
+        lags = np.arange(n_frames)
+        s1 = (cumulative[:, n_frames - lags] + cumulative[:, -1:] -
+              cumulative[:, lags]) / windows
+
+        # S2: autocorrelation of the positions, zero-padded to avoid the
+        # circular correlation
+        size = 1 << (2 * n_frames - 1).bit_length()
+        spectrum = np.fft.rfft(positions, n=size, axis=1)
+        power = (spectrum * spectrum.conj()).real
+        s2 = np.fft.irfft(power, n=size, axis=1)[:, :n_frames].sum(axis=2)
+        return s1 - 2 * s2 / windows
@@ -0,0 +1,215 @@
+"""
+This module provides a read-only, memory-mapped file object that scans the
+raw bytes of a file and decodes only the slices that are requested.
+"""
+import mmap
+import re
+
+
+# End of a block of YAML list items: a newline that is not followed by
+# another list item ('- ...')
+BLOCK_END = re.compile(rb'\n(?![ \t]*- )')
+
+
+class MappedFile:
+    """
+    A class to read a file through a memory map.
+    Lines are located on the raw bytes and decoded only when requested, and
+    blocks of list items (e.g. the atom rows of a LAMMPS YAML step) can be
+    skipped without being decoded, so that they are only touched as pages.
+
+    ...
+
+    Attributes
+    ----------
+    filename : str
+        The path to the file.
+    data : mmap.mmap or bytes
+        The memory map of the file (empty bytes for an empty file).
+    pos : int
+        The byte offset of the next line to read.
+    closed : bool
+        True if the file has been closed.
+
+    Methods
+    -------
+    __init__(filename)
+        Initializes a MappedFile object.
+    readline()
+        Reads and decodes the next line.
+    read_raw_line()
+        Reads the next line without decoding it.
+    read_rows()
+        Reads and decodes the block of list items starting at the current
+        position.
+    skip_rows()
+        Skips the block of list items starting at the current position.
+    skip_past(marker)
+        Skips all the lines up to the first one starting with a marker.
+    tell()
+        Returns the current byte offset.
+    seek(offset)
+        Moves to a byte offset.
+    close()
+        Closes the memory map and the file.
+    """
+
+    def __init__(self, filename):
+        """
+        Initializes a MappedFile object.
+
+        Parameters
+        ----------
+        filename : str
+            The path to the file.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the specified file is not found.
+        """
+        self.filename = filename  # Path to the file
+        self._file = open(filename, 'rb')  # Underlying binary file
+        try:
+            # Map the whole file in read-only mode
+            self.data = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self.data = b''
+        self.pos = 0  # Byte offset of the next line
+        self.closed = False  # Flag to check if the file has been closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def readline(self):
+        """
+        Reads and decodes the next line.
+
+        Returns
+        -------
+        line : str
+            The next line, including its newline character, or an empty
+            string at the end of the file.
+        """
+        return self.read_raw_line().decode()
+
+    def read_raw_line(self):
+        """
+        Reads the next line without decoding it.
+
+        Returns
+        -------
+        line : bytes
+            The next line, including its newline character, or empty bytes
+            at the end of the file.
+        """
+        end = self.data.find(b'\n', self.pos)
+        end = len(self.data) if end < 0 else end + 1
+        line = self.data[self.pos:end]
+        self.pos = end
+        return line
+
+    def read_rows(self):
+        """
+        Reads and decodes the block of list items starting at the current
+        position. The whole block is decoded at once.
+
+        Returns
+        -------
+        rows : list
+            The lines of the block, without their newline characters.
+        """
+        start = self.pos
+        end = self._block_end()
+        if end == start:
+            return []
+        self.pos = end
+        return self.data[start:end].decode().splitlines()
+
+    def skip_rows(self):
+        """
+        Skips the block of list items starting at the current position
+        without decoding it.
+
+        Returns
+        -------
+        None
+        """
+        self.pos = self._block_end()
+
+    def skip_past(self, marker):
+        """
+        Skips all the lines, starting from the current position, up to and
+        including the first one that starts with a marker, without decoding
+        them.
+
+        Parameters
+        ----------
+        marker : bytes
+            The beginning of the line to look for (e.g. b'...').
+
+        Returns
+        -------
+        found : bool
+            True if the marker was found, False if the end of the file was
+            reached.
+        """
+        if self.data[self.pos:self.pos + len(marker)] == marker:
+            start = self.pos
+        else:
+            start = self.data.find(b'\n' + marker, self.pos)
+            if start < 0:
+                self.pos = len(self.data)
+                return False
+            start += 1
+        self.pos = start
+        self.read_raw_line()
+        return True
+
+    def tell(self):
+        """
+        Returns the current byte offset.
+        """
+        return self.pos
+
+    def seek(self, offset):
+        """
+        Moves to a byte offset.
+
+        Parameters
+        ----------
+        offset : int
+            The byte offset of the beginning of a line.
+
+        Returns
+        -------
+        None
+        """
+        self.pos = offset
+
+    def close(self):
+        """
+        Closes the memory map and the file.
+        """
+        if not self.closed:
+            if isinstance(self.data, mmap.mmap):
+                self.data.close()
+            self._file.close()
+            self.closed = True
+
+    def _block_end(self):
+        """
+        Returns the byte offset of the first line, starting from the current
+        position, that is not a list item.
+        """
+        head = self.data[self.pos:self.pos + 64].lstrip(b' \t')
+        if not head.startswith(b'- '):
+            # The current line is not a list item
+            return self.pos
+        match = BLOCK_END.search(self.data, self.pos)
+        return match.end() if match else len(self.data)
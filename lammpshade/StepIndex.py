@@ -0,0 +1,373 @@
+"""
+This module provides a class for indexing the steps of a LAMMPS YAML file by
+their byte offset, allowing random access to any step of the file.
+"""
+import json
+import os
+from lammpshade.Compression import detect_compression, open_binary
+from lammpshade.MappedFile import MappedFile
+
+
+class StepIndex:
+    """
+    A class to build, persist and query an index of the steps of a LAMMPS
+    YAML file.
+    Every step (YAML document) is recorded with the byte offset of its first
+    line, its timestep and its number of atoms. The index is stored in a
+    sidecar file next to the YAML file and is validated against the size and
+    the modification time of the YAML file. For compressed YAML files, the
+    offsets are positions in the decompressed data.
+
+    ...
+
+    Attributes
+    ----------
+    filename : str
+        The path to the YAML file.
+    index_path : str
+        The path to the sidecar file where the index is stored.
+    offsets : list
+        The byte offset of the first line of each step.
+    timesteps : list
+        The timestep of each step (None if not found).
+    natoms : list
+        The number of atoms of each step (None if not found).
+    size : int
+        The size of the YAML file when it was last indexed.
+    mtime : float
+        The modification time of the YAML file when it was last indexed.
+    scanned : int
+        The byte offset right after the last complete step indexed.
+    end : int
+        The byte offset of the end of the data reached by the last scan,
+        i.e. the size of the decompressed data for compressed YAML files.
+    checkpoints : list
+        The checkpoints of the decompressor shared with the readers of a
+        gzip-compressed YAML file.
+
+    Methods
+    -------
+    __init__(filename, index_path=None, checkpoints=None)
+        Initializes a StepIndex object.
+    __len__()
+        Returns the number of indexed steps.
+    update(rebuild=False)
+        Brings the index up to date with the YAML file.
+    scan(start)
+        Indexes the steps of the YAML file starting from a byte offset.
+    load()
+        Loads the index from the sidecar file.
+    save()
+        Saves the index to the sidecar file.
+    is_valid()
+        Checks if the index matches the current state of the YAML file.
+    find_timestep(timestep)
+        Returns the position of a timestep in the index.
+    """
+
+    VERSION = 2  # Version of the sidecar file format
+
+    def __init__(self, filename, index_path=None, checkpoints=None):
+        """
+        Initializes a StepIndex object.
+
+        Parameters
+        ----------
+        filename : str
+            The path to the YAML file.
+        index_path : str, optional
+            The path to the sidecar file. Defaults to the YAML file path
+            followed by '.idx'.
+        checkpoints : list, optional
+            The checkpoints shared with the readers of a gzip-compressed
+            YAML file (see GzipReader). Defaults to None.
+        """
+        self.filename = filename  # Path to the YAML file
+        # Path to the sidecar file
+        self.index_path = index_path if index_path else filename + '.idx'
+        self.offsets = []  # Byte offset of each step
+        self.timesteps = []  # Timestep of each step
+        self.natoms = []  # Number of atoms of each step
+        self.size = 0  # Size of the YAML file when indexed
+        self.mtime = 0.0  # Modification time of the YAML file when indexed
+        self.scanned = 0  # Byte offset after the last complete step
+        self.end = 0  # Byte offset of the end of the (decompressed) data
+        self._timestep_map = None  # Lazy mapping timestep -> position
+        self.checkpoints = checkpoints  # Checkpoints of a gzip file
+
+    def __len__(self):
+        """
+        Returns the number of indexed steps.
+        """
+        return len(self.offsets)
+
+    def update(self, rebuild=False):
+        """
+        Brings the index up to date with the YAML file.
+        The sidecar file is loaded if the index is empty. If the YAML file has
+        grown since it was indexed, only the new part of the file is scanned.
+        If it has shrunk or was rewritten, the index is rebuilt from scratch.
+        The index is saved to the sidecar file when it changes.
+
+        Parameters
+        ----------
+        rebuild : bool, optional
+            If True, the index is rebuilt from scratch. Defaults to False.
+
+        Returns
+        -------
+        self : StepIndex
+            The updated StepIndex object.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the YAML file is not found.
+        """
+        if not os.path.exists(self.filename):
+            raise FileNotFoundError(f"File '{self.filename}' not found.")
+
+        if not rebuild and not self.offsets:
+            # Try to reuse the sidecar file
+            self.load()
+
+        if not rebuild and self.is_valid():
+            # Nothing has changed since the last scan
+            return self
+
+        stat = os.stat(self.filename)
+        if rebuild or not self._is_prefix_unchanged(stat):
+            # The file was rewritten, start over
+            self._reset()
+
+        # Drop the incomplete step at the end of the file (if any) and scan
+        # the part of the file that was not indexed yet
+        self._truncate(self.scanned)
+        self.scan(self.scanned)
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.save()
+        return self
+
+    def scan(self, start):
+        """
+        Indexes the steps of the YAML file starting from a byte offset.
+        A step starts with a '---' line (or with the first key of the file)
+        and ends with a '...' line. A trailing step that is not terminated is
+        indexed as well, but it will be scanned again on the next update.
+        Plain files are scanned through a memory map and blocks of list
+        items (e.g. atom rows) are skipped without being read line by line.
+        Compressed files are scanned line by line while being decompressed.
+
+        Parameters
+        ----------
+        start : int
+            The byte offset where the scan starts.
+
+        Returns
+        -------
+        None
+        """
+        entry = None  # [offset, timestep, natoms] of the current step
+        compression = detect_compression(self.filename)
+        if compression is None:
+            file = MappedFile(self.filename)
+        else:
+            file = open_binary(self.filename, compression, self.checkpoints)
+        with file:
+            file.seek(start)
+            while True:
+                pos = file.tell()  # Byte offset of the current line
+                line = file.read_raw_line() if compression is None else \
+                    file.readline()
+                if not line:
+                    # End of the data, decompressed if compressed
+                    self.end = pos
+                    break
+
+                if line[:1] in (b' ', b'\t', b'\r', b'\n'):
+                    if compression is None:
+                        # Skip atom rows, list items and blank lines at once
+                        file.skip_rows()
+                elif line.startswith(b'---'):
+                    if entry is not None:
+                        # Previous step was not terminated by '...'
+                        self._append(entry)
+                        self.scanned = pos
+                    entry = [pos, None, None]
+                elif line.startswith(b'...'):
+                    if entry is not None:
+                        self._append(entry)
+                        entry = None
+                    self.scanned = pos + len(line)
+                else:
+                    if entry is None:
+                        # Step without a '---' line
+                        entry = [pos, None, None]
+                    if line.startswith(b'timestep:'):
+                        entry[1] = self._parse_int(line)
+                    elif line.startswith(b'natoms:'):
+                        entry[2] = self._parse_int(line)
+
+        if entry is not None:
+            # Step not terminated at the end of the file
+            self._append(entry)
+
+    def load(self):
+        """
+        Loads the index from the sidecar file.
+
+        Returns
+        -------
+        bool
+            True if the sidecar file was loaded, False otherwise.
+        """
+        try:
+            with open(self.index_path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            # Missing or corrupted sidecar file
+            return False
+
+        if data.get('version') != self.VERSION:
+            return False
+
+        self.offsets = data['offsets']
+        self.timesteps = data['timesteps']
+        self.natoms = data['natoms']
+        self.size = data['size']
+        self.mtime = data['mtime']
+        self.scanned = data['scanned']
+        self.end = data['end']
+        self._timestep_map = None
+        return True
+
+    def save(self):
+        """
+        Saves the index to the sidecar file.
+        If the sidecar file cannot be written (e.g. read-only directory), the
+        index is kept in memory only.
+
+        Returns
+        -------
+        None
+        """
+        data = {
+            'version': self.VERSION,
+            'size': self.size,
+            'mtime': self.mtime,
+            'scanned': self.scanned,
+            'end': self.end,
+            'offsets': self.offsets,
+            'timesteps': self.timesteps,
+            'natoms': self.natoms
+        }
+        try:
+            with open(self.index_path, 'w') as file:
+                json.dump(data, file)
+        except OSError:
+            pass
+
+    def is_valid(self):
+        """
+        Checks if the index matches the current state of the YAML file.
+
+        Returns
+        -------
+        bool
+            True if the size and the modification time of the YAML file match
+            the ones recorded in the index, False otherwise.
+        """
+        stat = os.stat(self.filename)
+        return stat.st_size == self.size and stat.st_mtime == self.mtime
+
+    def find_timestep(self, timestep):
+        """
+        Returns the position of a timestep in the index.
+        If the same timestep appears more than once, the first occurrence is
+        returned.
+
+        Parameters
+        ----------
+        timestep : int
+            The timestep to look for.
+
+        Returns
+        -------
+        int
+            The position of the step in the index.
+
+        Raises
+        ------
+        ValueError
+            If the timestep is not found in the index.
+        """
+        if self._timestep_map is None:
+            self._timestep_map = {}
+            for n, value in enumerate(self.timesteps):
+                self._timestep_map.setdefault(value, n)
+
+        if timestep not in self._timestep_map:
+            raise ValueError(f"Timestep {timestep} not found in "
+                             f"'{self.filename}'.")
+        return self._timestep_map[timestep]
+
+    def _is_prefix_unchanged(self, stat):
+        """
+        Checks if the already indexed part of the YAML file is unchanged, so
+        that the index can be extended instead of rebuilt.
+        """
+        if stat.st_size < self.size or (stat.st_size == self.size and
+                                        stat.st_mtime != self.mtime):
+            # The file shrunk or was rewritten in place
+            return False
+
+        if not self.offsets:
+            return True
+
+        # The last indexed step must still start where it used to
+        with open_binary(self.filename, detect_compression(self.filename),
+                         self.checkpoints) as file:
+            file.seek(self.offsets[-1])
+            line = file.readline()
+        return line.startswith(b'---') or line[:1] not in (b'', b' ', b'\n')
+
+    def _reset(self):
+        """
+        Empties the index.
+        """
+        self.offsets = []
+        self.timesteps = []
+        self.natoms = []
+        self.size = 0
+        self.mtime = 0.0
+        self.scanned = 0
+        self.end = 0
+        self._timestep_map = None
+
+    def _truncate(self, offset):
+        """
+        Removes the steps starting at or after a byte offset from the index.
+        """
+        while self.offsets and self.offsets[-1] >= offset:
+            self.offsets.pop()
+            self.timesteps.pop()
+            self.natoms.pop()
+        self._timestep_map = None
+
+    def _append(self, entry):
+        """
+        Appends a step to the index.
+        """
+        self.offsets.append(entry[0])
+        self.timesteps.append(entry[1])
+        self.natoms.append(entry[2])
+
+    def _parse_int(self, line):
+        """
+        Extracts an integer value from a 'key: value' line.
+        """
+        try:
+            return int(line.split(b':', 1)[1])
+        except ValueError:
+            return None
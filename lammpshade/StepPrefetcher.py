@@ -0,0 +1,137 @@
+"""
+This module provides an iterator that reads the steps of a simulation in a
+background thread.
+"""
+import queue
+import threading
+
+
+# Marker of the end of the steps in the queue
+_END = object()
+
+
+class StepPrefetcher:
+    """
+    A class to read the steps of an iterable in a background thread and
+    hand them over through a bounded queue, so that reading the next steps
+    overlaps with the processing of the current one (e.g. waiting for the
+    writes of an XYZ file). Exceptions raised while reading are raised again
+    by the iterator.
+
+    ...
+
+    Attributes
+    ----------
+    depth : int
+        The maximum number of steps read in advance.
+
+    Methods
+    -------
+    __init__(steps, depth=4)
+        Initializes a StepPrefetcher object and starts the reading thread.
+    __iter__()
+        Returns the prefetcher itself as an iterator over the steps.
+    __next__()
+        Returns the next step.
+    close()
+        Stops the reading thread.
+    """
+
+    def __init__(self, steps, depth=4):
+        """
+        Initializes a StepPrefetcher object and starts the reading thread.
+
+        Parameters
+        ----------
+        steps : iterable
+            The steps to read (e.g. YAMLReader.iter_steps()).
+        depth : int, optional
+            The maximum number of steps read in advance. Default is 4.
+
+        Raises
+        ------
+        ValueError
+            If depth is not a positive integer.
+        """
+        if depth < 1:
+            raise ValueError("depth must be a positive integer.")
+        self.depth = depth  # Maximum number of steps read in advance
+        self._queue = queue.Queue(maxsize=depth)  # Steps read in advance
+        self._stop = threading.Event()  # Set to stop the reading thread
+        self._done = False  # Flag to check if the end has been returned
+        self._thread = threading.Thread(target=self._read, args=(steps,),
+                                        daemon=True)
+        self._thread.start()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """
+        Returns the next step.
+
+        Raises
+        ------
+        StopIteration
+            If all the steps have been returned.
+        """
+        if self._done:
+            raise StopIteration
+        item = self._queue.get()
+        if item is _END:
+            self._done = True
+            raise StopIteration
+        if isinstance(item, BaseException):
+            # Exception raised while reading the steps
+            self._done = True
+            raise item
+        return item
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Stops the reading thread and waits for it to end.
+
+        Returns
+        -------
+        None
+        """
+        self._stop.set()
+        self._done = True
+        # Free a slot in case the thread is waiting to put a step
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        self._thread.join()
+
+    def _read(self, steps):
+        """
+        Reads the steps into the queue (thread target).
+        """
+        try:
+            for step in steps:
+                if not self._put(step):
+                    return
+            self._put(_END)
+        except BaseException as exception:
+            self._put(exception)
+
+    def _put(self, item):
+        """
+        Puts an item in the queue, waiting for a free slot unless the
+        thread is stopped. Returns False if the thread was stopped.
+        """
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
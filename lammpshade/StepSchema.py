@@ -0,0 +1,213 @@
+"""
+This module provides the schema of the steps of a YAML file, which is learned
+from a step and parses the following steps with the same layout.
+"""
+
+
+class StepSchema:
+    """
+    A class to parse the steps of a YAML file that have a known layout.
+    Every step of a LAMMPS dump has the same keys in the same order
+    ('creator', 'timestep', ..., 'keywords', 'data'): the layout of a step
+    parsed by the generic parser of YAMLReader is learned, and the following
+    steps are parsed by expecting each key at its place instead of
+    classifying every line.
+    A step that deviates from the layout (a missing, extra or moved key, an
+    empty block, a line the generic parser would read differently) is
+    rejected, so that the reader parses it again with the generic parser:
+    the steps returned are always the same as those of the generic parser.
+
+    ...
+
+    Attributes
+    ----------
+    fields : list
+        The (key, kind) pairs of the step, in order. The kind is 'value'
+        for a 'key: value' line, 'items' for a block of 'key: value' items
+        (e.g. 'thermo') and 'rows' for a block of list items (e.g. 'box' and
+        'data').
+
+    Methods
+    -------
+    __init__(fields)
+        Initializes a StepSchema object.
+    learn(step)
+        Returns the schema of a step parsed by the generic parser.
+    parse(reader, skip_data=False)
+        Parses the next step of a reader with the schema.
+    """
+
+    MAX_DEVIATIONS = 4  # Deviating steps after which no schema is learned
+
+    def __init__(self, fields):
+        """
+        Initializes a StepSchema object.
+
+        Parameters
+        ----------
+        fields : list
+            The (key, kind) pairs of the step, in order.
+        """
+        self.fields = list(fields)  # (key, kind) pairs of the step
+
+    def __eq__(self, other):
+        return isinstance(other, StepSchema) and self.fields == other.fields
+
+    @staticmethod
+    def learn(step):
+        """
+        Returns the schema of a step parsed by the generic parser. The kind
+        of each key is deduced from its value: a dictionary comes from a
+        block of items, a non-empty list of lists (or a NumPy array) from a
+        block of list items, and any other value from a 'key: value' line.
+
+        Parameters
+        ----------
+        step : dict
+            A complete step, as returned by YAMLReader.get_next_step.
+
+        Returns
+        -------
+        schema : StepSchema
+            The schema of the step, or None if the step is empty.
+        """
+        if not step:
+            return None
+        fields = []
+        for key, value in step.items():
+            if isinstance(value, dict):
+                kind = 'items'
+            elif hasattr(value, 'dtype') or (
+                    isinstance(value, list) and value and
+                    all(isinstance(row, list) for row in value)):
+                kind = 'rows'
+            else:
+                kind = 'value'
+            fields.append((key, kind))
+        return StepSchema(fields)
+
+    def parse(self, reader, skip_data=False):
+        """
+        Parses the next step of a reader with the schema. The step must
+        start at the current position of the reader.
+
+        Parameters
+        ----------
+        reader : YAMLReader
+            The reader of the YAML file.
+        skip_data : bool, optional
+            If True, the atom rows ('data' key) are skipped without being
+            converted. Defaults to False.
+
+        Returns
+        -------
+        step : dict
+            A dictionary containing data from the next step (empty if the
+            end of the file is reached, the file is then closed), or None if
+            the step deviates from the schema. The position of the reader is
+            then undefined.
+        """
+        readline = reader.file.readline
+        line = readline()
+        while line and not line.strip():
+            # Skip blank lines
+            line = readline()
+        if not line:
+            # Close the file when done reading
+            reader.file.close()
+            return {}
+        if not line.startswith('---'):
+            return None
+
+        step = {}
+        line = readline()
+        for key, kind in self.fields:
+            if not line.startswith(key) or \
+                    not line.startswith(':', len(key)):
+                return None
+            value = line[len(key) + 1:].strip()
+
+            if kind == 'value':
+                if value == '':
+                    return None
+                step[key] = reader.convert_value(value, key)
+                line = readline()
+                continue
+            if value != '':
+                return None
+
+            if key == 'data' and skip_data:
+                # Skip the atom rows, of the selected keywords
+                reader.project_keywords(step)
+                line = reader.skip_rows()
+                continue
+            if key == 'data' and reader.array_data and 'keywords' in step:
+                # Decode the atom rows in bulk
+                keywords = step['keywords']
+                data_array, line = reader.process_array(
+                    readline(), keywords, reader.project_keywords(step))
+                if data_array is None:
+                    return None
+                step[key] = data_array
+                continue
+
+            if kind == 'items':
+                step[key], line = reader.process_dictionary(readline())
+                if key == 'thermo':
+                    reader.project_thermo(step[key])
+            elif key == 'data':
+                # Convert the selected atom columns of the selected atoms
+                keywords = step.get('keywords')
+                step[key], line = self._parse_rows(
+                    reader, key, readline(), reader.project_keywords(step),
+                    keywords)
+            else:
+                step[key], line = self._parse_rows(reader, key, readline())
+            # An empty block (the rows of a block are checked before their
+            # atoms are selected), or a block that goes on with lines the
+            # generic parser would read as a part of it
+            if step[key] is None or kind == 'items' and not step[key] or \
+                    '-' in line:
+                return None
+
+        if not line.startswith('...'):
+            return None
+        return step
+
+    def _parse_rows(self, reader, key, line, positions=None, keywords=None):
+        """
+        Converts the list items of a block (the elements at the given
+        positions), which must all have the indentation of the first one,
+        like process_list. Returns None instead of the rows if the block is
+        empty or if an item would be read differently by process_list. With
+        the atom keywords of the rows, the atoms selected by the atom filter
+        of the reader are kept before the rows are converted. In
+        memory-mapped mode the block is decoded at once.
+        """
+        dash = line.find('- ')
+        if dash < 0 or line[:dash].strip():
+            return None, line
+        prefix = line[:dash + 2]  # Indentation and dash of the items
+        start = dash + 2
+
+        if reader.use_mmap:
+            lines, line = reader.read_rows(line)
+            values = [row[start:].strip() for row in lines
+                      if row.startswith(prefix)]
+            if len(values) != len(lines):
+                return None, line
+        else:
+            values = []
+            readline = reader.file.readline
+            while line.startswith(prefix):
+                values.append(line[start:].strip())
+                line = readline()
+
+        # Items that process_list would split differently or end the block at
+        block = '\n'.join(values)
+        if not values or ':' in block or '- ' in block:
+            return None, line
+        if keywords is not None and reader.atom_filter is not None:
+            values = reader.select_rows(values, keywords)
+        return reader.tokenizer.convert_rows(values, ('rows', key),
+                                             positions), line
@@ -0,0 +1,201 @@
+"""
+This module provides a columnar, growable store for the thermo data of a
+simulation.
+"""
+import numpy as np
+
+
+class ThermoBuffer:
+    """
+    A class to accumulate the thermo data of a simulation column by column.
+    Each thermo keyword is stored in its own NumPy array, preallocated and
+    grown by doubling, so that appending a row is amortized O(1) and the
+    numbers are stored unboxed. A column starts as int64, is upgraded to
+    float64 when a float (or a missing value) is appended, and to object when
+    any other value is appended, so that the DataFrame built from the buffer
+    has the same dtypes as one built from a list of rows.
+
+    ...
+
+    Attributes
+    ----------
+    keywords : list
+        The thermo keywords, one per column.
+    columns : list
+        The NumPy arrays of the columns. Only the first len(self) values of
+        each array are meaningful.
+    capacity : int
+        The number of rows that can be stored before growing the arrays.
+
+    Methods
+    -------
+    __init__(keywords, capacity=1024)
+        Initializes a ThermoBuffer object.
+    __len__()
+        Returns the number of rows stored.
+    append(row)
+        Appends a row of thermo data.
+    extend(rows)
+        Appends several rows of thermo data.
+    to_dataframe()
+        Returns the thermo data as a pandas DataFrame.
+    tolist()
+        Returns the thermo data as a list of rows.
+    nbytes()
+        Returns the number of bytes used by the columns.
+    """
+
+    def __init__(self, keywords, capacity=1024):
+        """
+        Initializes a ThermoBuffer object.
+
+        Parameters
+        ----------
+        keywords : list
+            The thermo keywords, one per column.
+        capacity : int, optional
+            The initial number of rows to allocate. Default is 1024.
+        """
+        self.keywords = list(keywords)  # Thermo keywords
+        self.capacity = max(int(capacity), 1)  # Allocated rows
+        # One array per keyword, int64 until another type is appended
+        self.columns = [np.empty(self.capacity, dtype=np.int64)
+                        for _ in self.keywords]
+        self._size = 0  # Number of rows stored
+
+    def __len__(self):
+        return self._size
+
+    def __eq__(self, other):
+        if isinstance(other, ThermoBuffer):
+            return (self.keywords == other.keywords and
+                    self.tolist() == other.tolist())
+        return NotImplemented
+
+    def append(self, row):
+        """
+        Appends a row of thermo data.
+
+        Parameters
+        ----------
+        row : list
+            The thermo values of a step, one per keyword.
+
+        Raises
+        ------
+        ValueError
+            If the row does not have one value per keyword.
+        """
+        if len(row) != len(self.keywords):
+            raise ValueError(f"{len(self.keywords)} thermo keywords, but the "
+                             f"row has {len(row)} values.")
+        if self._size == self.capacity:
+            self._grow()
+
+        for i, value in enumerate(row):
+            column = self.columns[i]
+            try:
+                column[self._size] = self._coerce(value, column.dtype)
+            except (TypeError, ValueError, OverflowError):
+                # The value does not fit the column: upgrade it
+                column = self._upgrade(i, value)
+                column[self._size] = self._coerce(value, column.dtype)
+        self._size += 1
+
+    def extend(self, rows):
+        """
+        Appends several rows of thermo data.
+
+        Parameters
+        ----------
+        rows : iterable
+            The rows of thermo data.
+        """
+        for row in rows:
+            self.append(row)
+
+    def to_dataframe(self):
+        """
+        Returns the thermo data as a pandas DataFrame. The numeric columns
+        are views of the buffer, so no data is copied.
+
+        Returns
+        -------
+        thermo : DataFrame
+            The thermo data, one column per keyword.
+        """
+        # pandas is imported only when a DataFrame is built
+        import pandas as pd
+
+        data = {}
+        for keyword, column in zip(self.keywords, self.columns):
+            if column.dtype == object:
+                # Let pandas infer the type of non-numeric columns
+                data[keyword] = pd.Series(column[:self._size].tolist())
+            else:
+                data[keyword] = column[:self._size]
+        return pd.DataFrame(data, columns=self.keywords, copy=False)
+
+    def tolist(self):
+        """
+        Returns the thermo data as a list of rows of Python values.
+
+        Returns
+        -------
+        rows : list
+            The thermo data, one list per step.
+        """
+        columns = [column[:self._size].tolist() for column in self.columns]
+        return [list(row) for row in zip(*columns)]
+
+    def nbytes(self):
+        """
+        Returns the number of bytes used by the columns, including the
+        allocated but unused rows.
+
+        Returns
+        -------
+        int
+            The size of the arrays of the columns in bytes.
+        """
+        return sum(column.nbytes for column in self.columns)
+
+    def _coerce(self, value, dtype):
+        """
+        Returns a value if it can be stored in a column of a given dtype
+        without changing its type, or raises a TypeError.
+        """
+        if dtype == np.int64:
+            if type(value) is not int:
+                raise TypeError(value)
+        elif dtype == np.float64:
+            if value is None:
+                return np.nan
+            if type(value) not in (int, float):
+                raise TypeError(value)
+        return value
+
+    def _upgrade(self, i, value):
+        """
+        Converts the column i to the dtype required to store a value and
+        returns it.
+        """
+        column = self.columns[i]
+        numeric = value is None or type(value) in (int, float)
+        if column.dtype == np.int64 and numeric and type(value) is not int:
+            upgraded = column.astype(np.float64)
+        else:
+            upgraded = np.empty(self.capacity, dtype=object)
+            upgraded[:self._size] = column[:self._size].tolist()
+        self.columns[i] = upgraded
+        return upgraded
+
+    def _grow(self):
+        """
+        Doubles the capacity of the columns.
+        """
+        self.capacity *= 2
+        for i, column in enumerate(self.columns):
+            grown = np.empty(self.capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self.columns[i] = grown
@@ -0,0 +1,309 @@
+"""
+This module provides the conversion of the scalar and list values of a YAML
+file to Python values.
+"""
+import re
+
+
+# Integer and floating-point tokens (a float has a dot or an exponent)
+INT_PATTERN = r'[-+]?[0-9]+'
+FLOAT_PATTERN = (r'[-+]?(?:[0-9]+\.[0-9]*(?:[eE][-+]?[0-9]+)?'
+                 r'|\.[0-9]+(?:[eE][-+]?[0-9]+)?'
+                 r'|[0-9]+[eE][-+]?[0-9]+)')
+# Any non-empty token, and string tokens, which must not be numbers
+TOKEN_PATTERN = r'[^,\s](?:[^,]*[^,\s])?'
+STRING_PATTERN = (rf'(?!(?:{INT_PATTERN}|{FLOAT_PATTERN})\s*[,\]])'
+                  rf'({TOKEN_PATTERN})')
+# A token that does not span lines, and the separator of the elements of a row
+LINE_TOKEN_PATTERN = r'[^,\s](?:[^,\n]*[^,\s])?'
+LINE_SEPARATOR = r'[^\S\n]*,[^\S\n]*'
+# Classification of a token in a single match: group 1 for integers,
+# group 2 for floats
+NUMBER = re.compile(rf'({INT_PATTERN})\Z|({FLOAT_PATTERN})\Z')
+
+
+def convert_token(token):
+    """
+    Converts a stripped token to an int or a float if it is a number.
+
+    Parameters
+    ----------
+    token : str
+        The token to convert.
+
+    Returns
+    -------
+    int, float or str
+        The converted token, or the token itself if it is not a number.
+    """
+    match = NUMBER.match(token)
+    if match is None:
+        return token
+    if match.lastindex == 1:
+        return int(token)
+    return float(token)
+
+
+class Tokenizer:
+    """
+    A class to convert the values of a YAML file ('timestep: 0',
+    '[ 1 , 2 , H2 , 0.3 , ]', ...) to Python values.
+    Tokens are classified with a single regular expression match: integers
+    become int, numbers with a dot or an exponent (e.g. '1e5') float, and
+    other tokens remain strings.
+    The lists of a given key (e.g. the atom rows) have the same types from
+    one row to the next: the types of the elements of the first row are
+    learned, and a regular expression matching a whole row with these types
+    is compiled. The following rows are split and validated by a single
+    match of this expression, and their elements are converted with the
+    learned converters without being classified again. A row that does not
+    match (e.g. a float column containing integers) is classified element by
+    element, and its types are learned as well.
+    The elements to keep can be given as a projection (their positions, in
+    increasing order): the layouts of a projection only capture and convert
+    the kept elements, the other ones being matched as untyped tokens.
+
+    ...
+
+    Attributes
+    ----------
+    max_layouts : int
+        The maximum number of row layouts learned for each key.
+
+    Methods
+    -------
+    __init__(max_layouts=4)
+        Initializes a Tokenizer object.
+    convert(value, key=None, positions=None)
+        Converts a stripped value to an int, a float, a list or a string.
+    convert_list(value, key=None, positions=None)
+        Converts a list value to a list of elements.
+    convert_rows(values, key=None, positions=None)
+        Converts the values of the rows of a block.
+    split_columns(values, positions)
+        Splits the elements of the rows of a block at some positions.
+    """
+
+    # Patterns and converters of the element types
+    TYPES = {int: (INT_PATTERN, int), float: (FLOAT_PATTERN, float),
+             str: (STRING_PATTERN, None)}
+
+    def __init__(self, max_layouts=4):
+        """
+        Initializes a Tokenizer object.
+
+        Parameters
+        ----------
+        max_layouts : int, optional
+            The maximum number of row layouts learned for each key.
+            Defaults to 4.
+        """
+        self.max_layouts = max_layouts  # Layouts learned for each key
+        # Learned layouts, by key (and projection), most recent first
+        self._layouts = {}
+        self._splitters = {}  # Patterns of split_columns, by positions
+
+    def convert(self, value, key=None, positions=None):
+        """
+        Converts a stripped value to an int, a float, a list or a string.
+
+        Parameters
+        ----------
+        value : str
+            The value to convert.
+        key : hashable, optional
+            The key of the value, under which the layout of a list is
+            learned. Defaults to None (no layout is learned).
+        positions : tuple, optional
+            The positions of the elements of a list to keep, in increasing
+            order. Defaults to None (all the elements are kept).
+
+        Returns
+        -------
+        int, float, list or str
+            The converted value.
+        """
+        if value.startswith('[') and value.endswith(']'):
+            return self.convert_list(value, key, positions)
+        return convert_token(value)
+
+    def convert_list(self, value, key=None, positions=None):
+        """
+        Converts a list value ('[a, b, c]') to a list of elements. Empty
+        elements are dropped.
+
+        Parameters
+        ----------
+        value : str
+            The list value, starting with '[' and ending with ']'.
+        key : hashable, optional
+            The key of the value, under which the layout of the list is
+            learned. Defaults to None (no layout is learned).
+        positions : tuple, optional
+            The positions of the elements to keep, in increasing order.
+            Defaults to None (all the elements are kept).
+
+        Returns
+        -------
+        list
+            The converted elements.
+
+        Raises
+        ------
+        ValueError
+            If the list has no element at one of the positions.
+        """
+        if key is None:
+            return self._select(self._convert_elements(value), positions)
+
+        layouts = self._layouts.setdefault(
+            key if positions is None else (key, positions), [])
+        for n, (pattern, segments) in enumerate(layouts):
+            match = pattern.match(value)
+            if match is not None:
+                if n:
+                    # Try this layout first for the next rows
+                    layouts.insert(0, layouts.pop(n))
+                tokens = match.groups()
+                elements = []
+                for convert, start, stop in segments:
+                    # Convert the runs of columns of the same type at once
+                    elements += map(convert, tokens[start:stop]) if convert \
+                        else tokens[start:stop]
+                return elements
+
+        # Classify the elements and learn the layout of the row
+        elements = self._convert_elements(value)
+        selected = self._select(elements, positions)
+        layouts.insert(0, self._layout(elements, positions))
+        del layouts[self.max_layouts:]
+        return selected
+
+    def convert_rows(self, values, key=None, positions=None):
+        """
+        Converts the stripped values of the rows of a block, as convert
+        would one by one. The rows matching the most recent layout of the
+        key are converted in a single loop, without a method call per row.
+
+        Parameters
+        ----------
+        values : iterable
+            The stripped values of the rows.
+        key : hashable, optional
+            The key of the rows, under which their layout is learned.
+            Defaults to None (no layout is learned).
+        positions : tuple, optional
+            The positions of the elements of the rows to keep, in increasing
+            order. Defaults to None (all the elements are kept).
+
+        Returns
+        -------
+        rows : list
+            The converted values.
+        """
+        if key is None:
+            return [self.convert(value, None, positions) for value in values]
+
+        layouts = self._layouts.setdefault(
+            key if positions is None else (key, positions), [])
+        rows = []
+        match = None  # Matcher of the most recent layout
+        for value in values:
+            row = match(value) if match else None
+            if row is None:
+                # Other layout or other value, which may update the layouts
+                rows.append(self.convert(value, key, positions))
+                if layouts:
+                    pattern, segments = layouts[0]
+                    match = pattern.match
+                continue
+            tokens = row.groups()
+            elements = []
+            for convert, start, stop in segments:
+                elements += map(convert, tokens[start:stop]) if convert \
+                    else tokens[start:stop]
+            rows.append(elements)
+        return rows
+
+    def split_columns(self, values, positions):
+        """
+        Splits the elements of the rows of a block at some positions,
+        without converting them. The rows are joined and scanned by a single
+        regular expression search, so that a few columns of a large block
+        are extracted without a Python loop over the rows (e.g. to select
+        rows before converting them).
+
+        Parameters
+        ----------
+        values : list
+            The stripped values of the rows, each starting with '['.
+        positions : tuple
+            The positions of the elements to extract, in increasing order.
+
+        Returns
+        -------
+        columns : list
+            The elements of the rows at each position, as lists of strings,
+            or None if a row has no element at one of the positions.
+        """
+        pattern = self._splitters.get(positions)
+        if pattern is None:
+            groups = [f'({LINE_TOKEN_PATTERN})' if n in positions else
+                      LINE_TOKEN_PATTERN for n in range(positions[-1] + 1)]
+            pattern = re.compile(r'^\[[^\S\n]*' + LINE_SEPARATOR.join(groups)
+                                 + r'[^\S\n]*[,\]]', re.MULTILINE)
+            self._splitters[positions] = pattern
+        found = pattern.findall('\n'.join(values))
+        if len(found) != len(values):
+            return None
+        if len(positions) == 1:
+            return [found]
+        return [list(column) for column in zip(*found)]
+
+    def _convert_elements(self, value):
+        """
+        Converts the elements of a list value one by one.
+        """
+        elements = []
+        for element in value[1:-1].split(','):
+            element = element.strip()
+            if element != '':
+                elements.append(convert_token(element))
+        return elements
+
+    def _select(self, elements, positions):
+        """
+        Returns the elements at the given positions (all of them if
+        positions is None).
+        """
+        if positions is None:
+            return elements
+        if positions and positions[-1] >= len(elements):
+            raise ValueError(f"The list of {len(elements)} elements has no "
+                             f"element at position {positions[-1]}.")
+        return [elements[position] for position in positions]
+
+    def _layout(self, elements, positions=None):
+        """
+        Returns the regular expression matching the rows with the types of
+        the given elements, and the (converter, start, stop) segments of
+        consecutive kept elements of the same type (no converter for
+        strings). The elements that are not kept are matched as untyped
+        tokens.
+        """
+        kept = range(len(elements)) if positions is None else positions
+        groups = [f'(?:{TOKEN_PATTERN})'] * len(elements)
+        for n in kept:
+            group, _ = self.TYPES[type(elements[n])]
+            # Number groups are captured, string groups capture themselves
+            groups[n] = group if type(elements[n]) is str else f'({group})'
+        pattern = r'\[\s*' + r'\s*,\s*'.join(groups) + r'\s*,?\s*\]\Z'
+        types = [type(elements[n]) for n in kept]
+        segments = []
+        for n, kind in enumerate(types):
+            if n and kind is types[n - 1]:
+                convert, start, _ = segments.pop()
+            else:
+                convert, start = self.TYPES[kind][1], n
+            segments.append((convert, start, n + 1))
+        return re.compile(pattern), segments
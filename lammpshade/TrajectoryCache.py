@@ -0,0 +1,534 @@
+"""
+This module provides a binary cache of a LAMMPS YAML dump, made of NumPy
+.npy files that are memory-mapped when the cache is loaded.
+"""
+import hashlib
+import json
+import os
+import shutil
+import struct
+import numpy as np
+from lammpshade.YAMLReader import YAMLReader
+
+
+class TrajectoryCache:
+    """
+    A class to store the steps of a YAML file in a binary cache directory, so
+    that later sessions do not need to parse the text again.
+    The cache contains a table with one row per frame (frames.npy), the
+    headers of the frames (headers.json), and one .npy file per atom keyword
+    and per thermo keyword with the values of all the frames concatenated.
+    Numeric columns mixing integers and floats are stored as floats with a
+    mask of the integer values, so that the steps read from the cache are
+    identical to the ones parsed from the text.
+    The cache is valid as long as the size, the modification time and the
+    hash of the beginning of the YAML file are unchanged.
+
+    ...
+
+    Attributes
+    ----------
+    filename : str
+        The path to the YAML file.
+    path : str
+        The path to the cache directory.
+    frames : numpy.ndarray
+        The table of the frames, with the timestep, natoms, time, first atom
+        row, number of atom rows and thermo row of each frame (-1 or NaN if
+        missing).
+    headers : list
+        The headers of the frames (every key but the atom and thermo data).
+    atom_keywords : list
+        The atom keywords, shared by all the frames.
+    thermo_keywords : list
+        The thermo keywords, shared by all the frames.
+    atom_columns : list
+        The memory-mapped arrays of the atom columns.
+    thermo_columns : list
+        The memory-mapped arrays of the thermo columns.
+    pos : int
+        The position of the next frame to read.
+    closed : bool
+        True if the end of the frames has been reached.
+    loaded : bool
+        True if the cache has been loaded.
+
+    Methods
+    -------
+    __init__(filename, path=None)
+        Initializes a TrajectoryCache object.
+    __len__()
+        Returns the number of frames.
+    header_hash()
+        Returns the hash of the beginning of the YAML file.
+    is_valid(meta)
+        Checks if the metadata of a cache matches the YAML file.
+    load()
+        Loads the cache if it is valid.
+    build(use_mmap=False)
+        Parses the YAML file and writes the cache.
+    get_frame(n, skip_data=False, atom_positions=None,
+              thermo_positions=None)
+        Returns the step dictionary of a frame.
+    open()
+        Reopens the cache at the first frame.
+    tell()
+        Returns the position of the next frame.
+    seek(n)
+        Moves to a frame.
+    close()
+        Marks the end of the frames as reached.
+    """
+
+    VERSION = 1  # Version of the cache format
+    HASH_BYTES = 65536  # Bytes of the YAML file hashed for validation
+    HEADER_SIZE = 256  # Bytes reserved for the header of the column files
+    FRAME_DTYPE = np.dtype([('timestep', np.int64), ('natoms', np.int64),
+                            ('time', np.float64), ('row_start', np.int64),
+                            ('n_rows', np.int64), ('thermo_row', np.int64)])
+
+    def __init__(self, filename, path=None):
+        """
+        Initializes a TrajectoryCache object.
+
+        Parameters
+        ----------
+        filename : str
+            The path to the YAML file.
+        path : str, optional
+            The path to the cache directory. Defaults to the YAML file path
+            followed by '.cache'.
+        """
+        self.filename = filename  # Path to the YAML file
+        self.path = path or filename + '.cache'  # Path to the cache
+        self.frames = None  # Table of the frames
+        self.headers = []  # Headers of the frames
+        self.atom_keywords = None  # Atom keywords of the frames
+        self.thermo_keywords = None  # Thermo keywords of the frames
+        self.atom_columns = []  # Arrays of the atom columns
+        self.thermo_columns = []  # Arrays of the thermo columns
+        self._atom_masks = []  # Masks of the integer atom values
+        self._thermo_masks = []  # Masks of the integer thermo values
+        self.pos = 0  # Position of the next frame
+        self.closed = False  # Flag to check if the frames are exhausted
+        self.loaded = False  # Flag to check if the cache is loaded
+
+    def __len__(self):
+        return len(self.headers)
+
+    def header_hash(self):
+        """
+        Returns the SHA-1 hash of the first HASH_BYTES bytes of the YAML
+        file.
+        """
+        with open(self.filename, 'rb') as file:
+            return hashlib.sha1(file.read(self.HASH_BYTES)).hexdigest()
+
+    def is_valid(self, meta):
+        """
+        Checks if the metadata of a cache matches the YAML file.
+
+        Parameters
+        ----------
+        meta : dict
+            The metadata of the cache.
+
+        Returns
+        -------
+        bool
+            True if the version of the cache format and the size,
+            modification time and header hash of the YAML file match.
+        """
+        stat = os.stat(self.filename)
+        return (meta.get('version') == self.VERSION and
+                meta.get('size') == stat.st_size and
+                meta.get('mtime') == stat.st_mtime and
+                meta.get('header_hash') == self.header_hash())
+
+    def load(self):
+        """
+        Loads the cache if it exists and is valid. The columns are
+        memory-mapped, so they are read from the disk only when used.
+
+        Returns
+        -------
+        bool
+            True if the cache was loaded.
+        """
+        try:
+            with open(os.path.join(self.path, 'meta.json'), 'r') as file:
+                meta = json.load(file)
+            if not self.is_valid(meta):
+                return False
+            with open(os.path.join(self.path, 'headers.json'), 'r') as file:
+                headers = json.load(file)
+            self.frames = self._load_array('frames')
+            self.atom_columns, self._atom_masks = self._load_columns(
+                'atoms', meta['atom_masks'])
+            self.thermo_columns, self._thermo_masks = self._load_columns(
+                'thermo', meta['thermo_masks'])
+        except (OSError, ValueError, KeyError):
+            # Missing, incomplete or corrupted cache
+            return False
+
+        self.headers = headers
+        self.atom_keywords = meta['atom_keywords']
+        self.thermo_keywords = meta['thermo_keywords']
+        self.open()
+        self.loaded = True
+        return True
+
+    def build(self, use_mmap=False):
+        """
+        Parses every step of the YAML file and writes the cache, then loads
+        it. The atom columns of each step are appended to their .npy files
+        as the steps are parsed, so that the trajectory is not held in
+        memory; the headers of the files are rewritten once the number of
+        rows and the dtype of the columns are known, as with BinaryWriter.
+        The cache is not written if the steps cannot be stored in columns:
+        atom or thermo keywords changing between steps, atom rows not
+        matching the keywords, or values that are neither numbers nor
+        strings.
+
+        Parameters
+        ----------
+        use_mmap : bool, optional
+            If True, the YAML file is read through a memory map.
+            Defaults to False.
+
+        Returns
+        -------
+        bool
+            True if the cache was written and loaded.
+        """
+        stat = os.stat(self.filename)
+        meta = {'version': self.VERSION, 'size': stat.st_size,
+                'mtime': stat.st_mtime, 'header_hash': self.header_hash()}
+        # The cache is written in a temporary directory and moved in place
+        temp_path = self.path + '.tmp'
+        shutil.rmtree(temp_path, ignore_errors=True)
+        try:
+            os.makedirs(temp_path)
+            with YAMLReader(self.filename, use_mmap=use_mmap) as reader:
+                arrays, headers, meta = self._collect(reader, meta,
+                                                      temp_path)
+            self._write(arrays, headers, meta, temp_path)
+        except (ValueError, OverflowError, OSError):
+            # The steps cannot be cached
+            shutil.rmtree(temp_path, ignore_errors=True)
+            return False
+        return self.load()
+
+    def get_frame(self, n, skip_data=False, atom_positions=None,
+                  thermo_positions=None):
+        """
+        Returns the step dictionary of a frame, as get_next_step would
+        return it. Only the selected columns are read from the cache.
+
+        Parameters
+        ----------
+        n : int
+            The position of the frame.
+        skip_data : bool, optional
+            If True, the atom data is not returned. Defaults to False.
+        atom_positions : tuple, optional
+            The positions of the atom keywords to return. Defaults to None
+            (all the keywords).
+        thermo_positions : tuple, optional
+            The positions of the thermo keywords to return. Defaults to None
+            (all the keywords).
+
+        Returns
+        -------
+        step : dict
+            A dictionary containing data from the frame.
+        """
+        if atom_positions is None:
+            atom_positions = range(len(self.atom_columns))
+        if thermo_positions is None:
+            thermo_positions = range(len(self.thermo_columns))
+        frame = self.frames[n]
+        step = {}
+        for key, value in self.headers[n].items():
+            if key == 'thermo':
+                row = int(frame['thermo_row'])
+                step[key] = {
+                    'keywords': [self.thermo_keywords[i]
+                                 for i in thermo_positions],
+                    'data': [self._values(self.thermo_columns[i],
+                                          self._thermo_masks[i],
+                                          row, row + 1)[0]
+                             for i in thermo_positions]
+                }
+            elif key == 'data':
+                if not skip_data:
+                    start = int(frame['row_start'])
+                    stop = start + int(frame['n_rows'])
+                    columns = [self._values(self.atom_columns[i],
+                                            self._atom_masks[i], start, stop)
+                               for i in atom_positions]
+                    step[key] = [list(row) for row in zip(*columns)]
+            elif key == 'keywords' and value == self.atom_keywords:
+                step[key] = [value[i] for i in atom_positions]
+            else:
+                step[key] = value
+        return step
+
+    def open(self):
+        """
+        Reopens the cache at the first frame.
+        """
+        self.pos = 0
+        self.closed = False
+
+    def tell(self):
+        """
+        Returns the position of the next frame.
+        """
+        return self.pos
+
+    def seek(self, n):
+        """
+        Moves to a frame.
+
+        Parameters
+        ----------
+        n : int
+            The position of the frame.
+        """
+        self.pos = n
+
+    def close(self):
+        """
+        Marks the end of the frames as reached.
+        """
+        self.closed = True
+
+    def _collect(self, reader, meta, temp_path):
+        """
+        Collects the frames table, the headers and the thermo columns of the
+        steps of a reader, and appends their atom columns to the column
+        files of temp_path.
+        """
+        frames = []
+        headers = []
+        atom_files = None  # Files of the atom columns, one per keyword
+        thermo_values = None  # Thermo values, one list per keyword
+        n_rows = 0
+        try:
+            for step in reader:
+                header = {}
+                frame = [-1, -1, np.nan, n_rows, 0, -1]
+                for key, value in step.items():
+                    if key == 'thermo':
+                        keywords, row = self._thermo_row(value)
+                        if thermo_values is None:
+                            meta['thermo_keywords'] = keywords
+                            thermo_values = [[] for _ in keywords]
+                        elif keywords != meta['thermo_keywords']:
+                            raise ValueError("Thermo keywords change.")
+                        frame[5] = len(thermo_values[0])
+                        for values, value in zip(thermo_values, row):
+                            values.append(value)
+                        header[key] = None
+                    elif key == 'data':
+                        keywords = step.get('keywords')
+                        if not isinstance(keywords, list) or \
+                                set(map(len, value)) != {len(keywords)}:
+                            raise ValueError("Atom rows do not match "
+                                             "keywords.")
+                        if atom_files is None:
+                            meta['atom_keywords'] = keywords
+                            atom_files = []
+                            for i in range(len(keywords)):
+                                atom_files.append(self._open_column(
+                                    os.path.join(temp_path, f'atoms_{i}')))
+                        elif keywords != meta['atom_keywords']:
+                            raise ValueError("Atom keywords change.")
+                        for column, values in zip(atom_files, zip(*value)):
+                            self._append_column(column, values)
+                        frame[4] = len(value)
+                        n_rows += len(value)
+                        header[key] = None
+                    else:
+                        header[key] = value
+                for i, key in [(0, 'timestep'), (1, 'natoms'), (2, 'time')]:
+                    if type(step.get(key)) in (int, float):
+                        frame[i] = step[key]
+                frames.append(tuple(frame))
+                headers.append(header)
+        finally:
+            for column in atom_files or []:
+                column['file'].close()
+                column['mask_file'].close()
+
+        meta.setdefault('atom_keywords', None)
+        meta.setdefault('thermo_keywords', None)
+        arrays = {'frames': np.array(frames, dtype=self.FRAME_DTYPE)}
+        meta['atom_masks'] = [self._finish_column(column)
+                              for column in atom_files or []]
+        meta['thermo_masks'] = self._add_columns(
+            arrays, 'thermo', [self._encode(values)
+                               for values in thermo_values or []])
+        return arrays, headers, meta
+
+    def _thermo_row(self, thermo):
+        """
+        Returns the keywords and the data of a thermo dictionary.
+        """
+        if list(thermo) != ['keywords', 'data'] or \
+                len(thermo['keywords']) != len(thermo['data']):
+            raise ValueError("Unsupported thermo data.")
+        return thermo['keywords'], thermo['data']
+
+    def _encode(self, column):
+        """
+        Encodes a column of Python values as a NumPy array and the mask of
+        its integer values (None if the array is not a float array).
+        """
+        kinds = set(map(type, column))
+        if kinds <= {int}:
+            return np.array(column, dtype=np.int64), None
+        if kinds <= {int, float}:
+            mask = np.array([type(value) is int for value in column])
+            if any(abs(value) > 2 ** 53 for value in column
+                   if type(value) is int):
+                raise ValueError("Integer not representable as a float.")
+            return np.array(column, dtype=np.float64), mask
+        if kinds <= {str}:
+            return np.array(column, dtype=str), None
+        raise ValueError("Unsupported values.")
+
+    def _open_column(self, base):
+        """
+        Opens the file of a column and the file of its mask, with headers
+        reserved for the final dtype and number of rows, and returns the
+        state of the column.
+        """
+        column = {'path': base + '.npy', 'mask_path': base + '_mask.npy',
+                  'dtype': None, 'chunks': [], 'rows': 0, 'masked': False}
+        column['file'] = open(column['path'], 'wb')
+        column['file'].write(self._header(np.dtype(np.int64), 0))
+        column['mask_file'] = open(column['mask_path'], 'wb')
+        column['mask_file'].write(self._header(np.dtype(bool), 0))
+        return column
+
+    def _append_column(self, column, values):
+        """
+        Encodes the values of a column in a step and appends them to the
+        file of the column, with their mask for numeric values.
+        """
+        array, mask = self._encode(values)
+        dtype = column['dtype']
+        if dtype is not None and (dtype.kind == 'U') != \
+                (array.dtype.kind == 'U'):
+            raise ValueError("Column mixing strings and numbers.")
+        column['file'].write(array.tobytes())
+        if array.dtype.kind != 'U':
+            # The integers of an integer array are all flagged
+            if mask is None:
+                mask = np.ones(len(array), dtype=bool)
+            column['mask_file'].write(mask.tobytes())
+            column['masked'] = column['masked'] or bool(mask.any())
+        column['chunks'].append((array.dtype, len(array)))
+        column['rows'] += len(array)
+        # Integers promoted to floats, strings to the longest one
+        column['dtype'] = array.dtype if dtype is None else \
+            np.promote_types(dtype, array.dtype)
+
+    def _finish_column(self, column):
+        """
+        Writes the final header of the file of a column, converting the
+        chunks written with another dtype, and returns True if the column
+        has a mask of integer values (the mask file is removed otherwise).
+        """
+        dtype = column['dtype']
+        if all(chunk == dtype for chunk, _ in column['chunks']):
+            with open(column['path'], 'r+b') as file:
+                file.write(self._header(dtype, column['rows']))
+        else:
+            # Rewrite the column one chunk at a time with the final dtype
+            temp_path = column['path'] + '.tmp'
+            with open(column['path'], 'rb') as source, \
+                    open(temp_path, 'wb') as file:
+                source.seek(self.HEADER_SIZE)
+                file.write(self._header(dtype, column['rows']))
+                for chunk, count in column['chunks']:
+                    array = np.fromfile(source, dtype=chunk, count=count)
+                    file.write(array.astype(dtype).tobytes())
+            os.replace(temp_path, column['path'])
+
+        has_mask = dtype.kind == 'f' and column['masked']
+        if has_mask:
+            with open(column['mask_path'], 'r+b') as file:
+                file.write(self._header(np.dtype(bool), column['rows']))
+        else:
+            os.remove(column['mask_path'])
+        return has_mask
+
+    def _header(self, dtype, n_rows):
+        """
+        Returns the header of a column file (NumPy format 1.0), padded to
+        HEADER_SIZE bytes so that it can be rewritten in place.
+        """
+        header = repr({'descr': np.lib.format.dtype_to_descr(dtype),
+                       'fortran_order': False, 'shape': (n_rows,)})
+        # Magic string, version and length of the header
+        prefix = b'\x93NUMPY\x01\x00' + struct.pack('<H',
+                                                    self.HEADER_SIZE - 10)
+        return prefix + header.ljust(self.HEADER_SIZE - 11).encode() + b'\n'
+
+    def _add_columns(self, arrays, prefix, columns):
+        """
+        Adds the arrays and masks of the columns to the arrays to write, and
+        returns the flags of the columns that have a mask.
+        """
+        has_mask = []
+        for i, (array, mask) in enumerate(columns):
+            arrays[f'{prefix}_{i}'] = array
+            has_mask.append(mask is not None and bool(mask.any()))
+            if has_mask[-1]:
+                arrays[f'{prefix}_{i}_mask'] = mask
+        return has_mask
+
+    def _write(self, arrays, headers, meta, temp_path):
+        """
+        Writes the other files of the cache in the temporary directory and
+        moves it in place.
+        """
+        for name, array in arrays.items():
+            np.save(os.path.join(temp_path, name + '.npy'), array)
+        with open(os.path.join(temp_path, 'headers.json'), 'w') as file:
+            json.dump(headers, file)
+        # The metadata is written last, so that a partial cache is invalid
+        with open(os.path.join(temp_path, 'meta.json'), 'w') as file:
+            json.dump(meta, file)
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(temp_path, self.path)
+
+    def _load_array(self, name):
+        """
+        Memory-maps an array of the cache.
+        """
+        return np.load(os.path.join(self.path, name + '.npy'), mmap_mode='r')
+
+    def _load_columns(self, prefix, has_mask):
+        """
+        Memory-maps the arrays and masks of the columns of the cache.
+        """
+        columns = [self._load_array(f'{prefix}_{i}')
+                   for i in range(len(has_mask))]
+        masks = [self._load_array(f'{prefix}_{i}_mask') if mask else None
+                 for i, mask in enumerate(has_mask)]
+        return columns, masks
+
+    def _values(self, column, mask, start, stop):
+        """
+        Returns the Python values of a slice of a column, restoring the
+        integers of float columns.
+        """
+        values = column[start:stop].tolist()
+        if mask is not None:
+            for i in np.flatnonzero(mask[start:stop]):
+                values[i] = int(values[i])
+        return values
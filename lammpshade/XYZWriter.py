@@ -1,4 +1,5 @@
-import pandas as pd
+from lammpshade.BlockCompressor import BlockCompressor
+from lammpshade.FrameFormatter import FrameFormatter
 import os
 
 
@@ -19,10 +20,19 @@ class XYZWriter:
     ----------
     output : file object
         The output file where the data will be written.
+    compression : str
+        'gzip' or 'xz' if the output file ends with .xyz.gz or .xyz.xz,
+        None for a plain .xyz file.
+    threads : int
+        The number of threads compressing the output file.
+    formatter : FrameFormatter
+        The formatter of the atom data.
+    columns : list
+        The atom keywords read from the steps (the ones written).
 
     Methods
     -------
-    __init__(filepath)
+    __init__(filepath, threads=None)
         Initializes the XYZWriter object with the specified output file path.
     __enter__()
         Opens the output file for writing when the object is used as a context
@@ -44,15 +54,21 @@ class XYZWriter:
     process_box_data(step, thermo_data)
         Processes box data to be written to the output file.
     create_and_write_atom_data(step)
-        Creates a DataFrame from the atom data and writes it to the output
-        file.
+        Formats the atom data and writes it to the output file.
     process_atom_data_df(atoms_df)
         Processes the atom data DataFrame to match the required format.
     data_check(step, keys, data_type)
         Checks if the required keys are present in the step dictionary.
     """
 
-    def __init__(self, filepath):
+    # Atom keywords written to the output file, in order
+    ATOM_KEYWORDS = ['element', 'x', 'y', 'z', 'vx', 'vy', 'vz', 'fx', 'fy',
+                     'fz', 'type']
+
+    # Compressions of the output file, by suffix
+    COMPRESSIONS = {'.xyz': None, '.xyz.gz': 'gzip', '.xyz.xz': 'xz'}
+
+    def __init__(self, filepath, threads=None):
         """
         Initializes the XYZWriter object with the specified output file path.
 
@@ -61,16 +77,22 @@ class XYZWriter:
         filepath : str
             The path to the output file where the data will be written.
             If only the filename is given, the file will be created in the
-            "./xyz/" subdirectory.
+            "./xyz/" subdirectory. Files ending with .xyz.gz or .xyz.xz are
+            compressed in independent blocks on a pool of threads.
+        threads : int, optional
+            The number of threads compressing the output file. Defaults to
+            the number of CPUs.
 
         Raises
         ------
         ValueError
-            If the file format is not .xyz.
+            If the file format is not .xyz, .xyz.gz or .xyz.xz.
         """
-        # Check if the file ends with the right format (.xyz)
-        if not filepath.lower().endswith('.xyz'):
-            raise ValueError("File format must be .xyz")
+        # Check if the file ends with the right format (.xyz, .xyz.gz, ...)
+        suffix = next((suffix for suffix in self.COMPRESSIONS
+                       if filepath.lower().endswith(suffix)), None)
+        if suffix is None:
+            raise ValueError("File format must be .xyz, .xyz.gz or .xyz.xz")
 
         # If only the filename is given, create it in the "./xyz/" subdirectory
         if not os.path.exists(filepath):
@@ -78,8 +100,13 @@ class XYZWriter:
 
         self.filepath = filepath  # Path to the output file
         self.output = None  # File object to write data to
+        self.compression = self.COMPRESSIONS[suffix]  # Output compression
+        self.threads = threads  # Number of compression threads
         self.has_written = False  # Flag to check if the file has been written
         self.thermo_check = [True]*2  # Flag to check for thermo and box data
+        # Formatter of the atom data
+        self.formatter = FrameFormatter(self.ATOM_KEYWORDS)
+        self.columns = list(self.ATOM_KEYWORDS)  # Atom keywords read
 
     def __enter__(self):
         """
@@ -91,7 +118,13 @@ class XYZWriter:
         """
         mode = 'a' if self.has_written else 'w'
         os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
-        self.output = open(self.filepath, mode)
+        if self.compression:
+            # Appended blocks are new gzip members or xz streams
+            self.output = BlockCompressor(self.filepath, mode,
+                                          self.compression,
+                                          threads=self.threads)
+        else:
+            self.output = open(self.filepath, mode)
         self.has_written = True
         return self
 
@@ -357,8 +390,9 @@ class XYZWriter:
 
     def create_and_write_atom_data(self, step):
         """
-        Creates a DataFrame from the atom data, filters it, and writes it to
-        the output file with a specific format.
+        Filters and reorders the atom data, formats it and writes it to the
+        output file in a single buffer.
+        The atom data can be a list of lists or a NumPy structured array.
 
         Parameters
         ----------
@@ -369,21 +403,16 @@ class XYZWriter:
         -------
         None
         """
-        # Create a DataFrame from the atom data
-        atoms_df = pd.DataFrame(step['data'], columns=step['keywords'])
-
-        # Reorder the DataFrame columns
-        atoms_df = self.process_atom_data_df(atoms_df)
-
-        # Write the atom data to the file
-        atoms_df.to_csv(self.output, mode='a', index=False, header=False,
-                        sep=" ", lineterminator='\n')
+        # Format the selected atom columns and write them at once
+        self.output.write(self.formatter.format(step['data'],
+                                                step['keywords']))
 
     def process_atom_data_df(self, atoms_df):
         """
         Filters the DataFrame columns to include only the keywords needed for
         writing the atom data to the output file.
-        The keywords are reordered to match the required format.
+        The keywords are reordered to match the required format, with the
+        same layout as the lines written by the formatter.
 
         Parameters
         ----------
@@ -395,12 +424,9 @@ class XYZWriter:
         atoms_df : DataFrame
             A DataFrame containing the filtered atom data.
         """
-        # List of keywords to be used for reordering the DataFrame columns
-        keywords_lst = ['element', 'x', 'y', 'z', 'vx', 'vy', 'vz', 'fx', 'fy',
-                        'fz', 'type']
-
-        # Filter the DataFrame columns to include only the keywords in the list
-        atoms_df = atoms_df.filter(keywords_lst, axis=1)
+        # Columns selected and ordered by the formatter
+        layout = self.formatter.layout(list(atoms_df.columns))
+        atoms_df = atoms_df[[keyword for _, keyword in layout]]
 
         return atoms_df
 
@@ -2,11 +2,23 @@
 This module provides a class for reading YAML-formatted files and extracting
 data.
 """
+import itertools
+import os
+import time
+import numpy as np
+from numpy.lib.recfunctions import repack_fields
+from lammpshade.Compression import detect_compression, open_text
+from lammpshade.MappedFile import MappedFile
+from lammpshade.StepIndex import StepIndex
+from lammpshade.StepSchema import StepSchema
+from lammpshade.Tokenizer import NUMBER, Tokenizer
 
 
 class YAMLReader:
     """
     A class to read YAML-formatted files and extract data.
+    It can be used as an iterator over the steps of the file and as a
+    context manager that closes the file.
 
     ...
 
@@ -14,24 +26,110 @@ class YAMLReader:
     ----------
     filename : str
         The path to the YAML file.
-    file : file
+    file : file or MappedFile
         The file object representing the opened YAML file.
     current_step : dict
         A dictionary containing data from the current step.
+    index : StepIndex
+        The index of the steps of the YAML file (None until it is built).
+    array_data : bool
+        If True, the atom data of each step is returned as a NumPy structured
+        array instead of a list of lists.
+    use_mmap : bool
+        If True, the YAML file is read through a memory map.
+    compression : str
+        The compression of the YAML file ('gzip', 'bz2', 'xz' or 'zstd'),
+        or None for a plain file.
+    schema : StepSchema
+        The layout of the steps, learned from the first step and used to
+        parse the following ones (None until it is learned).
+    columns : list
+        The atom keywords to keep (None to keep all of them).
+    thermo_columns : list
+        The thermo keywords to keep (None to keep all of them).
+    atom_filter : AtomFilter
+        The selection of the atoms to keep (None to keep all of them).
 
     Methods
     -------
-    __init__(filename)
+    __init__(filename, array_data=False, use_mmap=False, columns=None,
+             thermo_columns=None, atom_filter=None)
         Initializes a YAMLReader object.
-    convert_value(value)
+    open_file()
+        Opens the YAML file for reading.
+    __iter__()
+        Returns the reader itself as an iterator over the steps.
+    __next__()
+        Returns the next step of the YAML file.
+    __enter__()
+        Returns the reader when used as a context manager.
+    __exit__()
+        Closes the file when used as a context manager.
+    close()
+        Closes the YAML file.
+    iter_steps(start=0, stop=None, stride=1, start_timestep=None,
+               stop_timestep=None, thermo_only=False)
+        Iterates over a selection of the steps of the YAML file.
+    follow(poll_interval=0.1, max_interval=5.0, timeout=None)
+        Iterates over the complete steps of a file that is still being
+        written, waiting for new steps at the end of the file.
+    skip_step()
+        Skips the next step without parsing it.
+    peek_timestep()
+        Returns the timestep of the next step without moving the reader.
+    convert_value(value, key=None, positions=None)
         Converts a string variable to an INT, FLOAT, or LIST based on its
         content.
-    get_next_step()
+    get_next_step(skip_data=False)
         Reads the next step from the YAML file and returns its data.
+    parse_step(skip_data=False)
+        Reads the next step from the YAML file with the generic parser.
+    get_next_thermo()
+        Reads the header and the thermo data of the next step, skipping the
+        rest of the step.
+    get_next_header()
+        Reads the header of the next step, skipping its thermo data and its
+        atom rows.
+    skip_document()
+        Skips the rest of the current step.
+    read_rows(initial_line)
+        Reads the list items of a block.
+    skip_rows(count=None)
+        Skips the list items of a block without processing them.
+    process_list(initial_line, key=None, positions=None)
+        Processes the items of a list block.
+    process_array(initial_line, keywords, positions=None)
+        Processes the atom rows of a step into a NumPy structured array.
+    convert_column(column)
+        Converts a column of strings to a NumPy array.
+    select_columns(keywords, columns)
+        Resolves a selection of columns against the keywords of a step.
+    project_keywords(step)
+        Keeps the selected atom keywords of a step.
+    project_thermo(thermo)
+        Keeps the selected thermo keywords and values of a step.
+    selected_columns()
+        Returns the atom keywords to read from the steps.
+    filter_atoms(step)
+        Keeps the atoms of a step selected by the atom filter.
+    select_rows(values, keywords)
+        Keeps the atom rows selected by the atom filter, before converting
+        them.
+    build_index(index_path=None, rebuild=False)
+        Builds or updates the index of the steps of the YAML file.
+    get_step(n)
+        Reads the n-th step of the YAML file and returns its data.
+    seek_timestep(timestep)
+        Moves the reader to the step with the given timestep.
+    seek(offset)
+        Moves the reader to a byte offset of the YAML file.
+    tell()
+        Returns the byte offset of the next line to be read.
 
     """
 
-    def __init__(self, filename):
+    def __init__(self, filename, array_data=False, use_mmap=False,
+                 columns=None, thermo_columns=None, atom_filter=None):
         """
         Initializes a YAMLReader object.
 
@@ -39,6 +137,31 @@ class YAMLReader:
         ---------
         filename : str
             The path to the YAML file. Defaults to None.
+        array_data : bool, optional
+            If True, the atom data of each step ('data' key) is returned as a
+            NumPy structured array with one field per atom keyword, instead
+            of a list of lists. Defaults to False.
+        use_mmap : bool, optional
+            If True, the YAML file is read through a memory map: lines are
+            decoded only when they are parsed, blocks of atom rows are decoded
+            in one slice and skipped atom rows are never decoded.
+            Ignored for compressed files. Defaults to False.
+        columns : list, optional
+            The atom keywords to keep (e.g. ['element', 'x', 'y', 'z']). The
+            selection is resolved once against the atom keywords of the
+            file, the 'keywords' of the steps only contain the kept ones, in
+            the order of the file, and only their values are converted: the
+            other values of the atom rows are only split. Keywords missing
+            from the file are ignored. Defaults to None (all the keywords
+            are kept).
+        thermo_columns : list, optional
+            The thermo keywords to keep, in the same way. Defaults to None.
+        atom_filter : AtomFilter, optional
+            The selection of the atoms to keep. The rows of the other atoms
+            are dropped from the atom data of the steps as soon as it is
+            decoded, and 'natoms' is set to the number of atoms kept. The
+            steps read without their atom data are not filtered.
+            Defaults to None (all the atoms are kept).
 
         Raises
         ------
@@ -47,32 +170,338 @@ class YAMLReader:
         """
         self.filename = filename  # Path to the YAML file
         self.current_step = None  # Data from the current step
+        self.index = None  # Index of the steps of the YAML file
+        self.array_data = array_data  # Return atom data as NumPy arrays
+        self.use_mmap = use_mmap  # Read the file through a memory map
+        self.compression = None  # Compression of the YAML file
+        self._checkpoints = []  # Checkpoints of a gzip-compressed file
+        self.tokenizer = Tokenizer()  # Converter of the values
+        self.columns = columns  # Atom keywords to keep
+        self.thermo_columns = thermo_columns  # Thermo keywords to keep
+        self.atom_filter = atom_filter  # Selection of the atoms to keep
+        self._projections = {}  # Resolved selections, by keywords
+        self.schema = None  # Layout of the steps, learned from a step
+        self._deviations = 0  # Steps that deviated from the schema
+        self.file = self.open_file()  # File object of the YAML file
+
+    def open_file(self):
+        """
+        Opens the YAML file for reading.
+        Compressed files (gzip, bz2, xz and zstd) are detected from their
+        first bytes and decompressed while they are read. Byte offsets (tell,
+        seek and the index) are then positions in the decompressed data.
+
+        Returns
+        -------
+        file : file or MappedFile
+            The file object representing the opened YAML file.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the specified file is not found.
+        """
         try:
+            self.compression = detect_compression(self.filename)
+            if self.compression is not None:
+                # Compressed files cannot be memory-mapped
+                self.use_mmap = False
             # Open the file
-            self.file = open(filename, 'r')
+            if self.use_mmap:
+                return MappedFile(self.filename)
+            return open_text(self.filename, self.compression,
+                             self._checkpoints)
 
         # Handle FileNotFoundError
         except FileNotFoundError:
-            raise FileNotFoundError(f"File '{filename}' not found.")
+            raise FileNotFoundError(f"File '{self.filename}' not found.")
+
+    def __iter__(self):
+        """
+        Returns the reader itself as an iterator over the steps of the YAML
+        file.
+        """
+        return self
+
+    def __next__(self):
+        """
+        Returns the next step of the YAML file.
+
+        Raises
+        ------
+        StopIteration
+            If the end of the file is reached.
+        """
+        if self.file.closed:
+            raise StopIteration
+        step = self.get_next_step()
+        if not step:
+            raise StopIteration
+        return step
+
+    def __enter__(self):
+        """
+        Returns the reader when it is used as a context manager.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Closes the YAML file when the reader is used as a context manager.
+        """
+        self.close()
+
+    def close(self):
+        """
+        Closes the YAML file.
+
+        Returns
+        -------
+        None
+        """
+        self.file.close()
+
+    def iter_steps(self, start=0, stop=None, stride=1, start_timestep=None,
+                   stop_timestep=None, thermo_only=False):
+        """
+        Iterates over a selection of the steps of the YAML file, starting
+        from the current position of the reader, like itertools.islice.
+        The steps that are not selected are skipped without being parsed.
+        If a timestep range is given, only the steps inside the range are
+        considered and start, stop and stride are applied to them. Timesteps
+        are assumed to increase along the file: the iteration ends at the
+        first step after stop_timestep.
+
+        Parameters
+        ----------
+        start : int, optional
+            The position of the first step to return. Defaults to 0.
+        stop : int, optional
+            The position at which to stop (excluded). Defaults to None, which
+            means the end of the file.
+        stride : int, optional
+            The distance between two returned steps. Defaults to 1.
+        start_timestep : int, optional
+            The first timestep to consider (included). Defaults to None.
+        stop_timestep : int, optional
+            The last timestep to consider (included). Defaults to None.
+        thermo_only : bool, optional
+            If True, the selected steps are read with get_next_thermo instead
+            of get_next_step. Defaults to False.
+
+        Yields
+        ------
+        step : dict
+            A dictionary containing data from a selected step.
+
+        Raises
+        ------
+        ValueError
+            If start or stop are negative or stride is not positive.
+        """
+        if start < 0 or (stop is not None and stop < 0) or stride < 1:
+            raise ValueError("start and stop must be None or non-negative "
+                             "integers and stride a positive integer.")
+
+        read_step = self.get_next_thermo if thermo_only else \
+            self.get_next_step
+        timestep_range = start_timestep is not None or \
+            stop_timestep is not None
+
+        n = 0  # Position of the next step
+        while stop is None or n < stop:
+            if timestep_range:
+                timestep = self.peek_timestep()
+                if not isinstance(timestep, int) or (
+                        start_timestep is not None and
+                        timestep < start_timestep):
+                    # Step outside the timestep range, skip it
+                    if not self.skip_step():
+                        return
+                    continue
+                if stop_timestep is not None and timestep > stop_timestep:
+                    return
+
+            if n < start or (n - start) % stride:
+                # Step not selected, skip it
+                if not self.skip_step():
+                    return
+            else:
+                if self.file.closed:
+                    return
+                step = read_step()
+                if not step:
+                    return
+                yield step
+            n += 1
+
+    def follow(self, poll_interval=0.1, max_interval=5.0, timeout=None):
+        """
+        Iterates over the complete steps of a file that is still being
+        written (e.g. by a running LAMMPS job), like 'tail -f'.
+        Only the steps terminated by a '...' line are returned: the reader
+        stays at the end of the last complete step and the file is polled
+        until the next step is complete, with an interval that doubles from
+        poll_interval up to max_interval while no step is found. The bytes
+        of a partial step are scanned only once, so waiting for a large step
+        does not re-read it at each poll.
+        The iteration starts from the current position of the reader and can
+        be resumed with another call after a timeout.
+
+        Parameters
+        ----------
+        poll_interval : float, optional
+            The initial interval between two polls, in seconds.
+            Defaults to 0.1.
+        max_interval : float, optional
+            The maximum interval between two polls, in seconds.
+            Defaults to 5.0.
+        timeout : float, optional
+            The time in seconds after which the iteration ends if no new
+            step is complete. Defaults to None (wait forever).
+
+        Yields
+        ------
+        step : dict
+            A dictionary containing data from a complete step.
+
+        Raises
+        ------
+        ValueError
+            If the file is compressed.
+        """
+        if self.compression is not None:
+            raise ValueError(f"Compressed file '{self.filename}' cannot be "
+                             "followed.")
+        if self.use_mmap or self.file.closed:
+            # A memory map has the size of the file when it was opened: the
+            # file is read as text from the same position
+            start = self.tell()
+            self.file.close()
+            self.use_mmap = False
+            self.file = self.open_file()
+            self.file.seek(start)
+
+        start = self.file.tell()  # End of the last complete step
+        scan = start  # End of the complete lines scanned after it
+        interval = poll_interval  # Current interval between two polls
+        last_step = time.monotonic()  # Time of the last complete step
+        with open(self.filename, 'rb') as raw:
+            while True:
+                # Look for the end of the step in the new complete lines
+                complete = False
+                raw.seek(scan)
+                line = raw.readline()
+                while line:
+                    if line.startswith(b'...'):
+                        # The end of the step may not be followed by a
+                        # newline at the end of the file
+                        scan += len(line)
+                        complete = True
+                        break
+                    if not line.endswith(b'\n'):
+                        # Line still being written
+                        break
+                    scan += len(line)
+                    line = raw.readline()
+
+                if complete:
+                    # Parse the complete step
+                    self.file.seek(start)
+                    step = self.get_next_step()
+                    start = scan
+                    self.file.seek(start)
+                    interval = poll_interval
+                    last_step = time.monotonic()
+                    yield step
+                    continue
+
+                # Wait for new bytes, without exceeding the timeout
+                delay = interval
+                if timeout is not None:
+                    delay = min(delay, last_step + timeout - time.monotonic())
+                    if delay <= 0:
+                        return
+                time.sleep(delay)
+                interval = min(2 * interval, max_interval)
+
+    def skip_step(self):
+        """
+        Skips the next step of the YAML file without parsing it.
+
+        Returns
+        -------
+        bool
+            True if a step was skipped, False if the end of the file was
+            reached (the file is then closed).
+        """
+        if self.file.closed:
+            return False
+
+        line = self.file.readline()
+        while line and not line.strip():
+            # Skip blank lines
+            line = self.file.readline()
+
+        if not line:
+            # Close the file when done reading
+            self.file.close()
+            return False
+
+        if not line.startswith('...'):
+            self.skip_document()
+        return True
+
+    def peek_timestep(self):
+        """
+        Returns the timestep of the next step without moving the reader.
+        Only the first lines of the step, before any block, are read.
+
+        Returns
+        -------
+        timestep : int
+            The timestep of the next step, or None if it is not found or if
+            the end of the file is reached.
+        """
+        if self.file.closed:
+            return None
+
+        timestep = None
+        pos = self.file.tell()
+        line = self.file.readline()
+        while line and not line.startswith(('...', ' ')):
+            if line.startswith('timestep:'):
+                timestep = self.convert_value(line.split(':', 1)[1])
+                break
+            line = self.file.readline()
+        self.file.seek(pos)
+        return timestep
 
-    def convert_value(self, value):
+    def convert_value(self, value, key=None, positions=None):
         """
         Converts a string variable to an INT, FLOAT, or LIST based on its
-        content.
+        content (see Tokenizer).
 
         Parameters
         ----------
         value : str
             String that needs to be converted.
+        key : hashable, optional
+            The key of the value, under which the layout of a list is learned
+            so that the following lists of the same key are converted
+            without classifying their elements again. Defaults to None.
+        positions : tuple, optional
+            The positions of the elements of a list to keep (see
+            Tokenizer). Defaults to None (all the elements are kept).
 
         Returns
         -------
         int(value) : int
-            If the content of the string contains only digits, it's converted
-            to an integer.
+            If the content of the string is an integer, it's converted to an
+            integer.
         float(value) : float
-            If the string contains a dot ('.') and the content is in a valid
-            floating-point format, it's converted to a float.
+            If the string is a number with a dot ('.') or an exponent (e.g.
+            '1e5'), it's converted to a float.
         converted_elements : list
             If the string starts and ends with square brackets ('[', ']'),
             it's converted to a list of elements. Elements in the list are
@@ -83,21 +512,7 @@ class YAMLReader:
             original string is returned unchanged.
         """
         # Assure right formatting of the value
-        value = value.strip()
-
-        int_value = self.convert_to_int(value)
-        if int_value is not None:
-            return int_value
-
-        float_value = self.convert_to_float(value)
-        if float_value is not None:
-            return float_value
-
-        list_value = self.convert_to_list(value)
-        if list_value is not None:
-            return list_value
-
-        return value
+        return self.tokenizer.convert(value.strip(), key, positions)
 
     def convert_to_int(self, value):
         """
@@ -111,10 +526,11 @@ class YAMLReader:
         Returns
         -------
         int(value) : int
-            If the content of the string contains only digits, it's converted
-            to an integer.
+            If the content of the string is an integer (digits with an
+            optional sign), it's converted to an integer.
         None : None"""
-        if value.isdigit() or (value.startswith('-') and value[1:].isdigit()):
+        match = NUMBER.match(value)
+        if match is not None and match.lastindex == 1:
             return int(value)
         return None
 
@@ -130,19 +546,16 @@ class YAMLReader:
         Returns
         -------
         float(value) : float
-            If the string contains a dot ('.') and the content is in a valid
-            floating-point format, it's converted to a float.
+            If the string is a number with a dot ('.') or an exponent (e.g.
+            '1e5'), it's converted to a float.
         None : None
         """
-        if '.' in value:
-            # Try to convert it into float
-            try:
-                return float(value)
-            except ValueError:
-                pass
+        match = NUMBER.match(value)
+        if match is not None and match.lastindex == 2:
+            return float(value)
         return None
 
-    def convert_to_list(self, value):
+    def convert_to_list(self, value, key=None):
         """
         Converts a string variable to a LIST based on its content.
 
@@ -150,6 +563,9 @@ class YAMLReader:
         ----------
         value : str
             String that needs to be converted.
+        key : hashable, optional
+            The key under which the layout of the list is learned.
+            Defaults to None.
 
         Returns
         -------
@@ -162,34 +578,66 @@ class YAMLReader:
         """
         # Check if the value is a list
         if value.startswith('[') and value.endswith(']'):
-            elements = value[1:-1].split(',')
-            elements = [elem.strip() for elem in elements]
-            converted_elements = []
-            for elem in elements:
-                # Try to convert to int
-                int_value = self.convert_to_int(elem)
-                if int_value is not None:
-                    converted_elements.append(int_value)
-                else:
-                    # Try to convert to float
-                    float_value = self.convert_to_float(elem)
-                    if float_value is not None:
-                        converted_elements.append(float_value)
-                    else:
-                        # If the element is not a number, keep it as a string
-                        converted_elem = elem
-                        # Check if the element is empty
-                        if converted_elem != '':
-                            converted_elements.append(converted_elem)
-            # Return the list
-            return converted_elements
+            return self.tokenizer.convert_list(value, key)
         # Return None if the value is not a list
         return None
 
-    def get_next_step(self):
+    def get_next_step(self, skip_data=False):
         """
         Reads the next step from the YAML file and returns its data.
         The data is stored in a dictionary.
+        The layout of the first step (its keys, in order, and their kinds) is
+        learned as a StepSchema, and the following steps are parsed with it.
+        A step that deviates from the schema is parsed again with the
+        generic parser (parse_step), and the schema is learned again from
+        it. After StepSchema.MAX_DEVIATIONS deviations, the generic parser
+        is used for the rest of the file.
+
+        Parameters
+        ----------
+        skip_data : bool, optional
+            If True, the atom rows ('data' key) are skipped without being
+            converted and the step is returned without them.
+            Defaults to False.
+
+        Returns
+        -------
+        step :  dict
+            A dictionary containing data from the next step.
+        """
+        if self.schema is not None and not self.file.closed:
+            start = self.file.tell()
+            step = self.schema.parse(self, skip_data)
+            if step is not None:
+                if step:
+                    self.filter_atoms(step)
+                    self.current_step = step
+                return step
+            # The step deviates from the schema, parse it again
+            self.file.seek(start)
+            self.schema = None
+            self._deviations += 1
+
+        step = self.parse_step(skip_data)
+        if (self.schema is None and not skip_data and
+                not self.file.closed and
+                self._deviations < StepSchema.MAX_DEVIATIONS):
+            # Learn the layout of the complete step
+            self.schema = StepSchema.learn(step)
+        self.filter_atoms(step)
+        return step
+
+    def parse_step(self, skip_data=False):
+        """
+        Reads the next step from the YAML file with the generic parser,
+        which classifies every line, and returns its data.
+
+        Parameters
+        ----------
+        skip_data : bool, optional
+            If True, the atom rows ('data' key) are skipped without being
+            converted and the step is returned without them.
+            Defaults to False.
 
         Returns
         -------
@@ -216,9 +664,24 @@ class YAMLReader:
             if ':' in line:
                 # Check for a key-value pair
                 key, value = self.process_key_value_pair(line)
-                if value:
+                # Compare with '' so that zero values (e.g. 'timestep: 0')
+                # are not mistaken for the start of a list or dictionary
+                if value != '':
                     step[key] = value
                     line = self.file.readline()
+                elif key == 'data' and skip_data:
+                    # Skip the atom rows, of the selected keywords
+                    self.project_keywords(step)
+                    line = self.skip_rows()
+                elif (key == 'data' and self.array_data and
+                      'keywords' in step):
+                    # Decode the atom rows in bulk
+                    line = self.file.readline()
+                    keywords = step['keywords']
+                    data_array, line = self.process_array(
+                        line, keywords, self.project_keywords(step))
+                    if data_array is not None:
+                        step[key] = data_array
                 else:
                     # Check for a key - list or key - dictionary pair
                     line = self.file.readline()
@@ -232,12 +695,17 @@ class YAMLReader:
                             return step
                         elif '-' in line:
                             if ':' not in line:
-                                # Get list
-                                data_list, line = self.process_list(line)
+                                # Get list, with the selected atom columns
+                                positions = self.project_keywords(step) \
+                                    if key == 'data' else None
+                                data_list, line = self.process_list(
+                                    line, key, positions)
                                 step[key] = data_list
                             else:
                                 # Get dictionary
                                 data_dic, line = self.process_dictionary(line)
+                                if key == 'thermo':
+                                    self.project_thermo(data_dic)
                                 step[key] = data_dic
                         else:
                             # Exit loop
@@ -250,6 +718,200 @@ class YAMLReader:
         self.file.close()
         return step
 
+    def get_next_thermo(self):
+        """
+        Reads the header and the thermo data of the next step, skipping the
+        rest of the step.
+        The scalar keys of the header (e.g. 'timestep', 'natoms') and the
+        'thermo' block are parsed. Other blocks (e.g. 'box') are skipped and,
+        once the thermo data is found, the reader jumps straight past the
+        '...' line that ends the step, so that the atom rows are never
+        converted.
+
+        Returns
+        -------
+        step : dict
+            A dictionary containing the header and the thermo data of the
+            next step. Empty if the end of the file is reached.
+        """
+        step = {}
+        line = self.file.readline()
+        while line:
+            if line.startswith('...'):
+                # End of the current step, exit
+                self.current_step = step
+                return step
+
+            if line.startswith('thermo:'):
+                # Get the thermo data and skip the rest of the step
+                step['thermo'], line = self.process_dictionary(
+                    self.file.readline())
+                self.project_thermo(step['thermo'])
+                if not line.startswith('...'):
+                    self.skip_document()
+                self.current_step = step
+                return step
+
+            if ':' in line and not line.startswith((' ', '-')):
+                key, value = self.process_key_value_pair(line)
+                if value != '':
+                    step[key] = value
+                    line = self.file.readline()
+                else:
+                    # Skip blocks other than thermo
+                    line = self.skip_rows()
+            else:
+                # Ensure reading proceeds
+                line = self.file.readline()
+
+        # Close the file when done reading
+        self.file.close()
+        return step
+
+    def get_next_header(self):
+        """
+        Reads the header of the next step: its scalar keys (e.g. 'timestep',
+        'natoms') and its blocks other than 'thermo' and 'data' (e.g.
+        'box'). The thermo items are skipped, and the atom rows are skipped
+        by line count (see skip_rows), so that they are never converted.
+
+        Returns
+        -------
+        step : dict
+            A dictionary containing the header of the next step. Empty if
+            the end of the file is reached.
+        """
+        step = {}
+        line = self.file.readline()
+        while line:
+            if line.startswith('...'):
+                # End of the current step, exit
+                self.filter_atoms(step)
+                self.current_step = step
+                return step
+
+            if ':' in line and not line.startswith((' ', '-')):
+                key, value = self.process_key_value_pair(line)
+                if value != '':
+                    step[key] = value
+                    line = self.file.readline()
+                elif key == 'data':
+                    # Skip the atom rows by line count
+                    self.project_keywords(step)
+                    line = self.skip_rows(step.get('natoms'))
+                elif key == 'thermo':
+                    line = self.skip_rows()
+                else:
+                    # Get a block of list items or of key-value items
+                    line = self.file.readline()
+                    if '- ' in line and ':' in line:
+                        step[key], line = self.process_dictionary(line)
+                    elif '- ' in line:
+                        step[key], line = self.process_list(line, key)
+            else:
+                # Ensure reading proceeds
+                line = self.file.readline()
+
+        # Close the file when done reading
+        self.file.close()
+        return step
+
+    def skip_document(self):
+        """
+        Skips the rest of the current step, up to and including the '...'
+        line that ends it, without processing it.
+
+        Returns
+        -------
+        None
+        """
+        if self.use_mmap:
+            self.file.skip_past(b'...')
+            return
+
+        line = self.file.readline()
+        while line and not line.startswith('...'):
+            line = self.file.readline()
+
+    def read_rows(self, initial_line):
+        """
+        Reads the list items ('- ...' lines) of a block. In memory-mapped
+        mode the block is located on the raw bytes and decoded at once.
+
+        Parameters
+        ----------
+        initial_line : str
+            A string containing the first line of the block.
+
+        Returns
+        -------
+        rows : list
+            The lines of the block.
+        line : str
+            The next line after the block.
+        """
+        if not initial_line.lstrip().startswith('- '):
+            return [], initial_line
+
+        if self.use_mmap:
+            rows = [initial_line] + self.file.read_rows()
+            return rows, self.file.readline()
+
+        rows = []
+        line = initial_line
+        while line.lstrip().startswith('- '):
+            rows.append(line)
+            line = self.file.readline()
+        return rows, line
+
+    def skip_rows(self, count=None):
+        """
+        Skips the list items ('- ...' lines) of a block starting at the
+        current position, without processing them. In memory-mapped mode
+        the skipped lines are not even decoded.
+
+        Parameters
+        ----------
+        count : int, optional
+            The expected number of items (e.g. 'natoms' for the atom rows).
+            The items are then read by line count, without checking each
+            of them, and the block is skipped line by line if its size
+            differs. Ignored in memory-mapped mode. Defaults to None.
+
+        Returns
+        -------
+        line : str
+            The next line after the block.
+        """
+        if self.use_mmap:
+            self.file.skip_rows()
+            return self.file.readline()
+
+        if isinstance(count, int) and count > 0:
+            start = self.file.tell()
+            readline = self.file.readline
+            while count > 0:
+                # Read the items by chunks, none of which may end the step
+                lines = [readline() for _ in range(min(count, 4096))]
+                count -= len(lines)
+                if lines[0].startswith('...') or \
+                        '\n...' in ''.join(lines):
+                    break
+            else:
+                if lines[-1].lstrip().startswith('- '):
+                    # Skip the items that may follow the expected ones
+                    line = readline()
+                    while line.lstrip().startswith('- '):
+                        line = readline()
+                    return line
+            # Fewer items than expected, skip them one by one
+            self.file.seek(start)
+
+        line = self.file.readline()
+        while line.lstrip().startswith('- '):
+            line = self.file.readline()
+        return line
+
     def process_key_value_pair(self, line):
         """
         Processes a line containing a key-value pair.
@@ -270,10 +932,10 @@ class YAMLReader:
         key = key.strip()
         value = value.strip()
         if value:
-            value = self.convert_value(value)
+            value = self.convert_value(value, key)
         return key, value
 
-    def process_list(self, initial_line):
+    def process_list(self, initial_line, key=None, positions=None):
         """
         Processes a line containing a list.
 
@@ -281,6 +943,12 @@ class YAMLReader:
         ----------
         initial_line : str
             A string containing the first element of the list.
+        key : str, optional
+            The key of the list, under which the layout of its rows is
+            learned. Defaults to None.
+        positions : tuple, optional
+            The positions of the elements of the rows to keep. Defaults to
+            None (all the elements are kept).
 
         Returns
         -------
@@ -293,11 +961,113 @@ class YAMLReader:
         line = initial_line
         while '- ' in line and ':' not in line:
             d_value = line.split('- ')[1].strip()
-            d_value = self.convert_value(d_value)
+            d_value = self.convert_value(d_value, ('rows', key), positions)
             data_list.append(d_value)
             line = self.file.readline()
         return data_list, line
 
+    def process_array(self, initial_line, keywords, positions=None):
+        """
+        Processes the atom rows of a step into a NumPy structured array.
+        The rows are split in bulk and every column is converted at once:
+        columns containing only integers are stored as int64, numeric
+        columns as float64 and the remaining ones (e.g. 'element') as
+        fixed-width strings. With an atom filter, the columns it needs are
+        converted first, and only the values of the selected atoms are
+        converted in the other columns.
+
+        Parameters
+        ----------
+        initial_line : str
+            A string containing the first atom row.
+        keywords : list
+            The atom keywords of the step, used as field names.
+        positions : tuple, optional
+            The positions of the columns to convert, the other ones are
+            only split. Defaults to None (all the columns are converted).
+
+        Returns
+        -------
+        data_array : numpy.ndarray
+            A structured array with one field per keyword, or None if no atom
+            row was found.
+        line : str
+            The next line after the atom rows.
+
+        Raises
+        ------
+        ValueError
+            If the number of values of the atom rows does not match the
+            number of keywords.
+        """
+        rows, line = self.read_rows(initial_line)
+        if not rows:
+            return None, line
+
+        # Keep only the content between the square brackets
+        rows = [row[row.index('[') + 1:row.rindex(']')] for row in rows]
+
+        # Split all the rows at once, removing the spaces around the commas
+        text = ','.join(rows).replace(' ,', ',').replace(', ', ',').strip(' ')
+        cells = text.split(',')
+        if ' ' in text:
+            # Uneven spacing or string values with spaces
+            cells = [cell.strip() for cell in cells]
+        n_values = len(cells) // len(rows)
+        if (len(cells) % len(rows) or
+                n_values not in (len(keywords), len(keywords) + 1)):
+            raise ValueError("Atom rows do not match the atom keywords "
+                             f"{keywords}.")
+
+        mask = None  # Atoms selected by the atom filter
+        names = [] if self.atom_filter is None else self.atom_filter.columns
+        if names and all(name in keywords for name in names):
+            mask = self.atom_filter.mask({
+                name: self.convert_column(
+                    cells[keywords.index(name)::n_values])
+                for name in names})
+        if positions is None:
+            positions = range(len(keywords))
+        keywords = [keywords[i] for i in positions]
+        columns = []
+        for i in positions:
+            # Take the i-th value of every row (of the selected atoms)
+            column = cells[i::n_values]
+            if mask is not None:
+                column = list(itertools.compress(column, mask))
+            columns.append(self.convert_column(column))
+
+        natoms = len(rows) if mask is None else int(np.count_nonzero(mask))
+        data_array = np.empty(natoms, dtype=[
+            (keyword, column.dtype)
+            for keyword, column in zip(keywords, columns)
+        ])
+        for keyword, column in zip(keywords, columns):
+            data_array[keyword] = column
+        return data_array, line
+
+    def convert_column(self, column):
+        """
+        Converts a column of strings to a NumPy array of the narrowest
+        matching type among int64, float64 and fixed-width string.
+
+        Parameters
+        ----------
+        column : list
+            A list of strings.
+
+        Returns
+        -------
+        numpy.ndarray
+            The converted column.
+        """
+        for converter, dtype in ((int, np.int64), (float, np.float64)):
+            try:
+                return np.array(list(map(converter, column)), dtype=dtype)
+            except ValueError:
+                continue
+        return np.array(column)
+
     def process_dictionary(self, initial_line):
         """
         Processes a line containing a dictionary.
@@ -319,7 +1089,285 @@ class YAMLReader:
         while '- ' in line and ':' in line:
             d_key, d_value = line.replace(' ', '').split(':', 1)
             d_key = d_key.replace('-', '').strip()
-            d_value = self.convert_value(d_value.strip())
+            d_value = self.convert_value(d_value.strip(), ('items', d_key))
             data_dic[d_key] = d_value
             line = self.file.readline()
         return data_dic, line
+
+    def select_columns(self, keywords, columns):
+        """
+        Resolves a selection of columns against the keywords of a step. The
+        result is cached for each list of keywords, so that the selection is
+        resolved once per file.
+
+        Parameters
+        ----------
+        keywords : list
+            The keywords of the step.
+        columns : list
+            The keywords to keep. Keywords missing from the step are
+            ignored.
+
+        Returns
+        -------
+        projection : tuple
+            The positions of the kept keywords, in the order of the step,
+            and the kept keywords, or None if every keyword is kept.
+        """
+        if columns is None or not isinstance(keywords, list):
+            return None
+        key = (tuple(keywords), tuple(columns))
+        if key not in self._projections:
+            positions = tuple(n for n, keyword in enumerate(keywords)
+                              if keyword in columns)
+            self._projections[key] = None \
+                if len(positions) == len(keywords) else \
+                (positions, [keywords[n] for n in positions])
+        return self._projections[key]
+
+    def project_keywords(self, step):
+        """
+        Keeps the selected atom keywords (columns) in the 'keywords' of a
+        step, before its atom rows are converted.
+
+        Parameters
+        ----------
+        step : dict
+            The step being read.
+
+        Returns
+        -------
+        positions : tuple
+            The positions of the atom columns to convert, or None if every
+            column is kept.
+        """
+        projection = self.select_columns(step.get('keywords'),
+                                         self.selected_columns())
+        if projection is None:
+            return None
+        step['keywords'] = list(projection[1])
+        return projection[0]
+
+    def project_thermo(self, thermo):
+        """
+        Keeps the selected thermo keywords (thermo_columns) and their values
+        in the thermo data of a step.
+
+        Parameters
+        ----------
+        thermo : dict
+            The thermo data of the step, with 'keywords' and 'data' lists.
+
+        Returns
+        -------
+        None
+        """
+        projection = self.select_columns(thermo.get('keywords'),
+                                         self.thermo_columns)
+        data = thermo.get('data')
+        if projection is None or not isinstance(data, list) or \
+                len(data) != len(thermo['keywords']):
+            return
+        positions, keywords = projection
+        thermo['keywords'] = list(keywords)
+        thermo['data'] = [data[n] for n in positions]
+
+    def selected_columns(self):
+        """
+        Returns the atom keywords to read from the steps: the selected
+        columns and the keywords needed by the atom filter.
+
+        Returns
+        -------
+        columns : list
+            The atom keywords to read, or None to read all of them.
+        """
+        if self.columns is None or self.atom_filter is None:
+            return self.columns
+        return list(self.columns) + [name for name in self.atom_filter.columns
+                                     if name not in self.columns]
+
+    def filter_atoms(self, step):
+        """
+        Keeps the atoms of a step selected by the atom filter, and sets its
+        number of atoms accordingly. The keywords read only for the filter
+        are then dropped.
+
+        Parameters
+        ----------
+        step : dict
+            The step read, with or without its atom data.
+
+        Returns
+        -------
+        None
+        """
+        if self.atom_filter is None or 'keywords' not in step:
+            return
+        data = step.get('data')
+        if data is not None:
+            data = self.atom_filter.apply(data, step['keywords'])
+            step['natoms'] = len(data)
+        projection = self.select_columns(step['keywords'], self.columns)
+        if projection is not None:
+            # Drop the keywords of the filter that were not selected
+            positions, keywords = projection
+            if hasattr(data, 'dtype'):
+                data = repack_fields(data[keywords])
+            elif data is not None:
+                data = [[row[n] for n in positions] for row in data]
+            step['keywords'] = list(keywords)
+        if data is not None:
+            step['data'] = data
+
+    def select_rows(self, values, keywords):
+        """
+        Keeps the atom rows selected by the atom filter, before converting
+        them: only the columns needed by the filter are extracted from the
+        rows (see Tokenizer.split_columns) and converted.
+
+        Parameters
+        ----------
+        values : list
+            The stripped atom rows of a step.
+        keywords : list
+            The atom keywords of the rows.
+
+        Returns
+        -------
+        values : list
+            The atom rows selected, or all the rows if they cannot be
+            selected before being converted (they are then selected by
+            filter_atoms).
+        """
+        names = self.atom_filter.columns
+        if not names or not values or \
+                any(name not in keywords for name in names):
+            return values
+        positions = tuple(sorted(keywords.index(name) for name in names))
+        cells = self.tokenizer.split_columns(values, positions)
+        if cells is None:
+            return values
+        columns = {keywords[n]: self.convert_column(column)
+                   for n, column in zip(positions, cells)}
+        return list(itertools.compress(values,
+                                       self.atom_filter.mask(columns)))
+
+    def build_index(self, index_path=None, rebuild=False):
+        """
+        Builds the index of the steps of the YAML file, or updates it if the
+        file has grown since it was last indexed.
+        The index is persisted in a sidecar file next to the YAML file, so
+        that it can be reused by later sessions.
+
+        Parameters
+        ----------
+        index_path : str, optional
+            The path to the sidecar file. Defaults to the YAML file path
+            followed by '.idx'.
+        rebuild : bool, optional
+            If True, the index is rebuilt from scratch. Defaults to False.
+
+        Returns
+        -------
+        index : StepIndex
+            The up-to-date index of the YAML file.
+        """
+        if self.index is None or (index_path and
+                                  index_path != self.index.index_path):
+            self.index = StepIndex(self.filename, index_path,
+                                   checkpoints=self._checkpoints)
+        return self.index.update(rebuild=rebuild)
+
+    def get_step(self, n):
+        """
+        Reads the n-th step of the YAML file and returns its data.
+        The reader jumps straight to the step using the index of the file, so
+        the steps before it are not parsed. Subsequent calls to get_next_step
+        continue from the following step.
+
+        Parameters
+        ----------
+        n : int
+            The position of the step in the file (negative values count
+            from the end of the file).
+
+        Returns
+        -------
+        step : dict
+            A dictionary containing data from the n-th step.
+
+        Raises
+        ------
+        IndexError
+            If the file has no n-th step.
+        """
+        index = self.build_index()
+        try:
+            offset = index.offsets[n]
+        except IndexError:
+            raise IndexError(f"Step {n} not found in '{self.filename}', "
+                             f"which contains {len(index)} steps.")
+        self.seek(offset)
+        return self.get_next_step()
+
+    def seek_timestep(self, timestep):
+        """
+        Moves the reader to the step with the given timestep, so that the
+        next call to get_next_step returns it.
+
+        Parameters
+        ----------
+        timestep : int
+            The timestep to move to.
+
+        Returns
+        -------
+        n : int
+            The position of the step in the file.
+
+        Raises
+        ------
+        ValueError
+            If the timestep is not found in the file.
+        """
+        index = self.build_index()
+        n = index.find_timestep(timestep)
+        self.seek(index.offsets[n])
+        return n
+
+    def seek(self, offset):
+        """
+        Moves the reader to a byte offset of the YAML file. The file is
+        opened again if it was closed at the end of a previous reading.
+
+        Parameters
+        ----------
+        offset : int
+            The byte offset of the beginning of a line.
+
+        Returns
+        -------
+        None
+        """
+        if self.file.closed:
+            self.file = self.open_file()
+        self.file.seek(offset)
+
+    def tell(self):
+        """
+        Returns the byte offset of the next line to be read. If the file was
+        closed at the end of a previous reading, the offset of the end of
+        the file is returned: its size, or the size of the decompressed data
+        (from the index) for a compressed file.
+
+        Returns
+        -------
+        offset : int
+            The byte offset of the next line to be read.
+        """
+        if self.file.closed:
+            if self.compression is not None:
+                return self.build_index().end
+            return os.path.getsize(self.filename)
+        return self.file.tell()
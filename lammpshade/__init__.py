@@ -1,11 +1,14 @@
-_hard_dependencies = ["pandas", "matplotlib"]
+from importlib import import_module
+from importlib.util import find_spec
+
+_hard_dependencies = ["numpy", "pandas", "matplotlib"]
 _missing_dependencies = []
 
 for _dependency in _hard_dependencies:
-    try:
-        __import__(_dependency)
-    except ImportError as _e:  # pragma: no cover
-        _missing_dependencies.append(f"{_dependency}: {_e}")
+    # Only look the dependencies up: they are imported when first needed
+    if find_spec(_dependency) is None:  # pragma: no cover
+        _missing_dependencies.append(f"{_dependency}: No module named "
+                                     f"'{_dependency}'")
 
 if _missing_dependencies:  # pragma: no cover
     raise ImportError(
@@ -14,7 +17,30 @@ if _missing_dependencies:  # pragma: no cover
         )
 del _hard_dependencies, _dependency, _missing_dependencies
 
-from lammpshade.YAMLReader import YAMLReader
-from lammpshade.XYZWriter import XYZWriter
-from lammpshade.Constructor import Simulation
-from lammpshade.GraphMaker import GraphMaker
+# Public names and the submodules defining them, imported on first access so
+# that e.g. a YAML to XYZ conversion does not load pandas and matplotlib
+_lazy_imports = {
+    "YAMLReader": "lammpshade.YAMLReader",
+    "XYZWriter": "lammpshade.XYZWriter",
+    "BinaryWriter": "lammpshade.BinaryWriter",
+    "AtomFilter": "lammpshade.AtomFilter",
+    "AtomSeries": "lammpshade.AtomSeries",
+    "MSDAnalyzer": "lammpshade.MSDAnalyzer",
+    "Simulation": "lammpshade.Constructor",
+    "GraphMaker": "lammpshade.GraphMaker",
+}
+
+__all__ = list(_lazy_imports)
+
+
+def __getattr__(name):
+    if name in _lazy_imports:
+        value = getattr(import_module(_lazy_imports[name]), name)
+        # Cache the attribute so that later accesses skip __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,84 @@
+import unittest
+import numpy as np
+from lammpshade.AtomFilter import AtomFilter
+
+
+class Test_AtomFilter_mask(unittest.TestCase):
+    """
+    Tests the mask method of the AtomFilter class.
+    """
+    def setUp(self):
+        """
+        Create the columns of five atoms.
+        """
+        self.columns = {'id': [1, 2, 3, 4, 5], 'type': [1, 2, 1, 2, 1],
+                        'element': ['O', 'H', 'O', 'H', 'C'],
+                        'x': [0.5, 1.5, 2.5, 3.5, 4.5], 'y': [0.0] * 5,
+                        'z': [0.0] * 5}
+
+    def test_mask_criteria(self):
+        """
+        Test if the atoms are selected by id, type and element.
+
+        Steps:
+        1. Create filters with a set of ids, a range of ids, types and
+           elements.
+        2. Assert the masks of the atoms.
+        """
+        cases = [(AtomFilter(ids={2, 5}), [0, 1, 0, 0, 1]),
+                 (AtomFilter(ids=range(2, 6, 2)), [0, 1, 0, 1, 0]),
+                 (AtomFilter(ids=range(5, 0, -2)), [1, 0, 1, 0, 1]),
+                 (AtomFilter(ids=range(3, 3)), [0, 0, 0, 0, 0]),
+                 (AtomFilter(types=[1]), [1, 0, 1, 0, 1]),
+                 (AtomFilter(elements=['H', 'C']), [0, 1, 0, 1, 1]),
+                 (AtomFilter(), [1, 1, 1, 1, 1])]
+        for atom_filter, expected in cases:
+            self.assertEqual(atom_filter.mask(self.columns).tolist(),
+                             [bool(keep) for keep in expected])
+
+    def test_mask_where(self):
+        """
+        Test if the expression and the other criteria select the atoms
+        together.
+        """
+        atom_filter = AtomFilter(types=[1], where=lambda atoms: atoms['x'] > 1)
+        self.assertEqual(atom_filter.columns, ['type', 'x', 'y', 'z'])
+        self.assertEqual(atom_filter.mask(self.columns).tolist(),
+                         [False, False, True, False, True])
+
+
+class Test_AtomFilter_apply(unittest.TestCase):
+    """
+    Tests the apply method of the AtomFilter class.
+    """
+    def test_apply(self):
+        """
+        Test if the rows of the selected atoms are kept, as lists and as
+        structured arrays.
+
+        Steps:
+        1. Apply a filter to a list of rows and to a structured array.
+        2. Assert that the selected rows are kept, in order.
+        3. Assert that an empty list of rows is kept.
+        """
+        keywords = ['id', 'type', 'x']
+        data = [[1, 1, 0.5], [2, 2, 1.5], [3, 1, 2.5]]
+        atom_filter = AtomFilter(types=[1])
+        self.assertEqual(atom_filter.apply(data, keywords),
+                         [[1, 1, 0.5], [3, 1, 2.5]])
+        array = np.array([tuple(row) for row in data],
+                         dtype=[('id', 'i8'), ('type', 'i8'), ('x', 'f8')])
+        self.assertEqual(atom_filter.apply(array, keywords)['id'].tolist(),
+                         [1, 3])
+        self.assertEqual(atom_filter.apply([], keywords), [])
+
+    def test_apply_missing_keyword(self):
+        """
+        Test if a KeyError is raised if a keyword of the filter is missing.
+        """
+        with self.assertRaises(KeyError):
+            AtomFilter(elements=['H']).apply([[1, 0.5]], ['id', 'x'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from lammpshade.AtomSeries import AtomSeries
+
+
+def make_step(timestep, rows):
+    """
+    Returns a step with the given (id, x, y, z) rows.
+    """
+    return {'timestep': timestep, 'time': timestep / 10, 'natoms': len(rows),
+            'boundary': ['p', 'p', 'p', 'p', 'p', 'p'],
+            'box': [[0, 10], [0, 10], [0, 10]],
+            'keywords': ['id', 'x', 'y', 'z'], 'data': rows}
+
+
+class Test_AtomSeries_write_step(unittest.TestCase):
+    """
+    Tests the writing and the loading of the AtomSeries class.
+    """
+    def setUp(self):
+        """
+        Create a temporary directory for the store.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'series')
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def test_write_and_load(self):
+        """
+        Test if the values of the atoms are stored by id, across blocks of
+        frames.
+
+        Steps:
+        1. Write three steps with unsorted ids, an atom missing from a frame
+           and an atom that is not in the first frame, with blocks of two
+           frames.
+        2. Load the store and assert the ids, the frames and the boundary.
+        3. Assert the time series of the atoms, with NaN for the missing
+           atom.
+        """
+        steps = [make_step(0, [[2, 0.2, 0, 0], [1, 0.1, 0, 0]]),
+                 make_step(10, [[1, 1.1, 0, 0], [2, 1.2, 0, 1]]),
+                 make_step(20, [[3, 2.3, 0, 0], [1, 2.1, 0, 0]])]
+        with AtomSeries(self.path, n_frames=3, block_frames=2) as series:
+            for step in steps:
+                series.write_step(step)
+
+        series = AtomSeries.load(self.path)
+        self.assertEqual(len(series), 3)
+        self.assertEqual(series.ids.tolist(), [1, 2])
+        self.assertEqual(series.frames['timestep'].tolist(), [0, 10, 20])
+        self.assertEqual(series.boundary, ['p'] * 6)
+        self.assertEqual(series.get(1, 'x').tolist(), [0.1, 1.1, 2.1])
+        np.testing.assert_array_equal(series.get(2, 'x'), [0.2, 1.2, np.nan])
+        self.assertEqual(series.get([2, 1])['z'][:, :2].tolist(),
+                         [[0, 1], [0, 0]])
+
+    def test_write_structured_array(self):
+        """
+        Test if the atom data read as a structured array is stored, and if
+        a store allocated for more frames is loaded with the frames written.
+        """
+        data = np.array([(2, 0.5, 1.5, 2.5), (1, 0.0, 1.0, 2.0)],
+                        dtype=[('id', 'i8'), ('x', 'f8'), ('y', 'f8'),
+                               ('z', 'f8')])
+        with AtomSeries(self.path, fields=['y'], n_frames=4) as series:
+            series.write_step(make_step(0, data))
+        series = AtomSeries.load(self.path)
+        self.assertEqual(series.series['y'].shape, (2, 1))
+        self.assertEqual(series.get([1, 2], 'y').tolist(), [[1.0], [1.5]])
+
+    def test_write_errors(self):
+        """
+        Test if the errors of the steps and of the selection are raised.
+
+        Steps:
+        1. Assert that a KeyError is raised for a step without a field.
+        2. Assert that a ValueError is raised for more frames than
+           allocated.
+        3. Assert that a KeyError is raised for an atom not in the store.
+        """
+        step = make_step(0, [[1, 0.1, 0, 0]])
+        with AtomSeries(self.path, fields=['vx'], n_frames=1) as series:
+            with self.assertRaises(KeyError):
+                series.write_step(step)
+        with AtomSeries(self.path, n_frames=1) as series:
+            series.write_step(step)
+            with self.assertRaises(ValueError):
+                series.write_step(step)
+        with self.assertRaises(KeyError):
+            AtomSeries.load(self.path).get([1, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
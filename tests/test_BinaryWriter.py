@@ -0,0 +1,117 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+from lammpshade.BinaryWriter import BinaryWriter
+from lammpshade.YAMLReader import YAMLReader
+
+
+class Test_BinaryWriter(unittest.TestCase):
+    """
+    Tests the writing of binary trajectories by the BinaryWriter class.
+    """
+    def setUp(self):
+        """
+        Create a temporary directory and read the steps of the test file.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'test.npy')
+        self.steps = list(YAMLReader(os.path.join('tests', 'test.yaml')))
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def test_file_endswith_npy(self):
+        """
+        Test if a file that does not end with '.npy' raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            BinaryWriter('example.xyz')
+
+    def test_write_and_load(self):
+        """
+        Test if the frames, the frame headers and the atoms are written and
+        memory-mapped back.
+
+        Steps:
+        1. Write the steps of the test file.
+        2. Load the trajectory with BinaryWriter.load and numpy.load.
+        3. Assert that the frames match the coordinates of the steps.
+        4. Assert that the frame headers and the atom table are correct.
+        """
+        with BinaryWriter(self.path) as writer:
+            for step in self.steps:
+                writer.write_to_xyz(step)
+
+        frames, headers, atoms = BinaryWriter.load(self.path)
+        self.assertIsInstance(frames, np.memmap)
+        self.assertEqual(frames.shape, (3, 3, 3))
+        self.assertEqual(frames.dtype, np.float32)
+        self.assertTrue(np.array_equal(np.load(self.path), frames))
+        positions = [self.steps[0]['keywords'].index(key)
+                     for key in 'xyz']
+        expected = [[[row[i] for i in positions] for row in step['data']]
+                    for step in self.steps]
+        self.assertTrue(np.allclose(frames, expected))
+
+        self.assertEqual(headers['timestep'].tolist(), [0, 20, 40])
+        self.assertEqual(headers['time'].tolist(), [0, 1, 2])
+        self.assertEqual(headers['box'][0].tolist(), self.steps[0]['box'])
+        self.assertEqual(atoms['id'].tolist(), [1, 2, 3])
+        self.assertEqual(atoms['element'].tolist(), ['H2'] * 3)
+
+    def test_append(self):
+        """
+        Test if the frames written in a second with-block are appended and
+        if the numpy array data is written like the list data.
+        """
+        arrays = list(YAMLReader(os.path.join('tests', 'test.yaml'),
+                                 array_data=True))
+        writer = BinaryWriter(self.path, fields=['x', 'vx'])
+        with writer:
+            writer.write_step(arrays[0])
+        with writer:
+            writer.write_step(self.steps[1])
+        frames, headers, _ = BinaryWriter.load(self.path)
+        self.assertEqual(frames.shape, (2, 3, 2))
+        self.assertEqual(headers['timestep'].tolist(), [0, 20])
+        self.assertAlmostEqual(float(frames[0, 1, 1]), 0.000622342)
+
+    def test_sorted_by_id(self):
+        """
+        Test if the atoms of a frame are sorted by id.
+        """
+        step = dict(self.steps[0], data=self.steps[0]['data'][::-1])
+        with BinaryWriter(self.path) as writer:
+            writer.write_step(self.steps[0])
+            writer.write_step(step)
+        frames, _, atoms = BinaryWriter.load(self.path)
+        self.assertTrue(np.array_equal(frames[0], frames[1]))
+        self.assertEqual(atoms['id'].tolist(), [1, 2, 3])
+
+    def test_natoms_changed(self):
+        """
+        Test if a frame with a different number of atoms raises a
+        ValueError.
+        """
+        step = dict(self.steps[1], data=self.steps[1]['data'][:2])
+        with BinaryWriter(self.path) as writer:
+            writer.write_step(self.steps[0])
+            with self.assertRaises(ValueError):
+                writer.write_step(step)
+
+    def test_missing_field(self):
+        """
+        Test if a missing stored field raises a KeyError.
+        """
+        with BinaryWriter(self.path, fields=['x', 'q']) as writer:
+            with self.assertRaises(KeyError):
+                writer.write_step(self.steps[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
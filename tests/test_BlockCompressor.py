@@ -0,0 +1,87 @@
+import unittest
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+from lammpshade.BlockCompressor import BlockCompressor
+from lammpshade.GzipReader import GzipReader
+
+
+class Test_BlockCompressor(unittest.TestCase):
+    """
+    Tests the writing of compressed files in independent blocks by the
+    BlockCompressor class.
+    """
+    def setUp(self):
+        """
+        Create a temporary directory and the text to write.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.lines = [f'H {i} {i * 0.5} {-i}\n' for i in range(5000)]
+        self.text = ''.join(self.lines)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, filename, compression, mode='w', lines=None):
+        """
+        Writes the lines with small blocks and returns the file path.
+        """
+        path = os.path.join(self.temp_dir, filename)
+        with BlockCompressor(path, mode, compression, block_size=1000,
+                             threads=3) as output:
+            for line in self.lines if lines is None else lines:
+                output.write(line)
+        return path
+
+    def test_gzip_members(self):
+        """
+        Test if the gzip file is made of several members whose concatenation
+        is the text, readable by gzip and by GzipReader.
+
+        Steps:
+        1. Write the lines with blocks of 1000 characters.
+        2. Assert that the file contains several gzip members.
+        3. Assert that gzip and GzipReader read back the text.
+        """
+        path = self.write('test.xyz.gz', 'gzip')
+        with open(path, 'rb') as file:
+            self.assertGreater(file.read().count(b'\x1f\x8b\x08'), 10)
+        with gzip.open(path, 'rt') as file:
+            self.assertEqual(file.read(), self.text)
+        with GzipReader(path) as reader:
+            self.assertEqual(reader.read().decode(), self.text)
+
+    def test_xz_streams(self):
+        """
+        Test if the concatenated xz streams are read back as the text.
+        """
+        path = self.write('test.xyz.xz', 'xz')
+        with lzma.open(path, 'rt') as file:
+            self.assertEqual(file.read(), self.text)
+
+    def test_append(self):
+        """
+        Test if appending writes new blocks after the existing ones.
+        """
+        for compression, module in [('gzip', gzip), ('xz', lzma)]:
+            path = self.write('append', compression, lines=self.lines[:10])
+            self.write('append', compression, 'a', lines=self.lines[10:])
+            with module.open(path, 'rt') as file:
+                self.assertEqual(file.read(), self.text)
+
+    def test_invalid_compression(self):
+        """
+        Test if an unsupported compression raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            BlockCompressor(os.path.join(self.temp_dir, 'test.bz2'),
+                            compression='bz2')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import shutil
+import tempfile
+from lammpshade.CachedReader import CachedReader
+from lammpshade.TrajectoryCache import TrajectoryCache
+from lammpshade.YAMLReader import YAMLReader
+
+
+class Test_CachedReader(unittest.TestCase):
+    """
+    Tests the reading methods of the CachedReader class.
+    """
+    def setUp(self):
+        """
+        Build the cache of the test file in a temporary directory.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'test.yaml')
+        shutil.copy(os.path.join('tests', 'test.yaml'), self.filename)
+        self.cache = TrajectoryCache(self.filename)
+        self.cache.build()
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def test_iterate(self):
+        """
+        Test if iterating over the reader returns the same steps as
+        YAMLReader and ends with an empty step.
+        """
+        reader = CachedReader(self.cache)
+        self.assertEqual(list(reader), list(YAMLReader(self.filename)))
+        self.assertEqual(reader.get_next_step(), {})
+        self.assertTrue(reader.file.closed)
+
+    def test_iter_steps(self):
+        """
+        Test if iter_steps selects the steps by position and timestep.
+        """
+        reader = CachedReader(self.cache)
+        steps = reader.iter_steps(stride=2, thermo_only=True)
+        self.assertEqual([step['timestep'] for step in steps], [0, 40])
+        reader = CachedReader(self.cache)
+        steps = reader.iter_steps(start_timestep=10, stop_timestep=30)
+        self.assertEqual([step['timestep'] for step in steps], [20])
+
+    def test_random_access(self):
+        """
+        Test if get_step and seek_timestep move the reader to a frame.
+
+        Steps:
+        1. Instantiate the CachedReader class.
+        2. Assert that get_step returns the last step for -1.
+        3. Assert that get_step raises an IndexError for a missing step.
+        4. Seek a timestep and assert that the next step has it.
+        5. Assert that seek_timestep raises a ValueError for a missing
+           timestep.
+        """
+        reader = CachedReader(self.cache)
+        self.assertEqual(reader.get_step(-1)['timestep'], 40)
+        with self.assertRaises(IndexError):
+            reader.get_step(3)
+        self.assertEqual(reader.seek_timestep(20), 1)
+        self.assertEqual(reader.get_next_step()['timestep'], 20)
+        with self.assertRaises(ValueError):
+            reader.seek_timestep(30)
+
+    def test_columns(self):
+        """
+        Test if the selected columns are read from the cache as from the
+        YAML file.
+        """
+        kwargs = {'columns': ['element', 'x'], 'thermo_columns': ['Time']}
+        for skip_data in (False, True):
+            reader = CachedReader(self.cache, **kwargs)
+            yaml_reader = YAMLReader(self.filename, **kwargs)
+            self.assertEqual(reader.get_next_step(skip_data=skip_data),
+                             yaml_reader.get_next_step(skip_data=skip_data))
+            yaml_reader.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+from lammpshade.Compression import detect_compression, open_text
+
+
+class Test_Compression(unittest.TestCase):
+    """
+    Tests the detection and opening of compressed files.
+    """
+    def setUp(self):
+        """
+        Write the test file with every supported standard compression.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join('tests', 'test.yaml'), 'rb') as file:
+            self.data = file.read()
+        self.files = {}
+        for compression, compress in [('gzip', gzip.compress),
+                                      ('bz2', bz2.compress),
+                                      ('xz', lzma.compress)]:
+            # The extension is irrelevant for the detection
+            filename = os.path.join(self.temp_dir, compression + '.yaml')
+            with open(filename, 'wb') as file:
+                file.write(compress(self.data))
+            self.files[compression] = filename
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def test_detect_compression(self):
+        """
+        Test if the compression is detected from the first bytes and if
+        plain and missing files are reported as not compressed.
+        """
+        for compression, filename in self.files.items():
+            self.assertEqual(detect_compression(filename), compression)
+        self.assertIsNone(detect_compression(os.path.join('tests',
+                                                          'test.yaml')))
+        self.assertIsNone(detect_compression('missing.yaml'))
+
+    def test_open_text(self):
+        """
+        Test if the decompressed text is read, and if seeking back to an
+        offset returned by tell returns the same line.
+        """
+        for compression, filename in self.files.items():
+            with open_text(filename, compression) as file:
+                file.readline()
+                offset = file.tell()
+                line = file.readline()
+                file.seek(offset)
+                self.assertEqual(file.readline(), line)
+                file.seek(0)
+                self.assertEqual(file.read().encode(), self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,21 @@
 import unittest
+import contextlib
+import gzip
+import lzma
 import os
+import shutil
+import tempfile
+from lammpshade.AtomFilter import AtomFilter
+from lammpshade.AtomSeries import AtomSeries
 from lammpshade.Constructor import Simulation
+from lammpshade.BinaryWriter import BinaryWriter
+from lammpshade.XYZWriter import XYZWriter
+from lammpshade.CachedReader import CachedReader
 from lammpshade.YAMLReader import YAMLReader
 from lammpshade.GraphMaker import GraphMaker
+from lammpshade.MSDAnalyzer import MSDAnalyzer
 from unittest.mock import patch
+import numpy as np
 import pandas as pd
 
 
@@ -214,6 +226,340 @@ class Test_Simulation_convert_to_xyz(unittest.TestCase):
             test.convert_to_xyz(output_path)
 
 
+class Test_Simulation_convert_to_xyz_parallel(unittest.TestCase):
+    """
+    Test the convert_to_xyz method of Simulation class with several workers
+    """
+    def setUp(self):
+        """
+        Copy the test files in a temporary directory, so that the sidecar
+        files of the index and the outputs are not created in the tests
+        directory.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        for filename in ['test.yaml', 'test_nothermo.yaml']:
+            shutil.copy(os.path.join('tests', filename),
+                        os.path.join(self.temp_dir, filename))
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def convert(self, filename, output, cache=False, **kwargs):
+        """
+        Converts a file of the temporary directory and returns the output
+        content and the Simulation object.
+        """
+        test = Simulation(os.path.join(self.temp_dir, filename), cache=cache)
+        output_path = os.path.join(self.temp_dir, output)
+        test.convert_to_xyz(output_path, **kwargs)
+        with open(output_path, 'r') as f:
+            return f.read(), test
+
+    def test_convert_to_xyz_parallel_same_output(self):
+        """
+        Test if the parallel conversion writes the same output and collects
+        the same thermo data as the serial conversion.
+
+        Steps:
+        1. Convert the test file serially.
+        2. Convert the test file with two workers and one step per chunk.
+        3. Assert that the outputs and the thermo data are the same.
+        """
+        serial, serial_sim = self.convert('test.yaml', 'serial.xyz')
+        parallel, parallel_sim = self.convert('test.yaml', 'parallel.xyz',
+                                              workers=2, chunk_steps=1,
+                                              max_chunks=1)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial_sim.thermo_data, parallel_sim.thermo_data)
+        self.assertEqual(serial_sim.thermo_keywords,
+                         parallel_sim.thermo_keywords)
+
+    def test_convert_to_xyz_selection(self):
+        """
+        Test if only the selected steps are converted, serially and with
+        several workers.
+
+        Steps:
+        1. Convert the test file with a stride of 2, serially and with two
+           workers.
+        2. Assert that the outputs are the same and contain two frames.
+        3. Convert the test file with a range of timesteps.
+        4. Assert that only the thermo data of the selected steps is kept.
+        """
+        serial, _ = self.convert('test.yaml', 'serial.xyz', stride=2)
+        parallel, _ = self.convert('test.yaml', 'parallel.xyz', stride=2,
+                                   workers=2, chunk_steps=1)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial.count('Step='), 2)
+        self.assertIn('Step=40;', serial)
+
+        for workers in (1, 2):
+            output, test = self.convert('test.yaml', f'range{workers}.xyz',
+                                        start_timestep=20, stop_timestep=40,
+                                        workers=workers)
+            self.assertEqual(output.count('Step='), 2)
+            self.assertEqual([row[0] for row in test.thermo_data.tolist()],
+                             [20, 40])
+
+    def test_convert_to_xyz_prefetch(self):
+        """
+        Test if the conversion with a background reading thread writes the
+        same output and collects the same thermo data as the serial one.
+        """
+        serial, serial_sim = self.convert('test.yaml', 'serial.xyz')
+        prefetched, test = self.convert('test.yaml', 'prefetch.xyz',
+                                        prefetch=1)
+        self.assertEqual(serial, prefetched)
+        self.assertEqual(serial_sim.thermo_data, test.thermo_data)
+
+    def test_convert_to_xyz_cache(self):
+        """
+        Test if the conversion served from the binary cache writes the same
+        output and collects the same thermo data.
+
+        Steps:
+        1. Convert the test file without cache.
+        2. Convert it with the cache enabled, which builds the cache.
+        3. Convert it again with a new Simulation object, which loads the
+           cache.
+        4. Assert that the outputs and the thermo data are the same.
+        5. Assert that get_thermodata returns the same DataFrame.
+        """
+        plain, plain_sim = self.convert('test.yaml', 'plain.xyz')
+        built, built_sim = self.convert('test.yaml', 'built.xyz', cache=True)
+        self.assertTrue(os.path.isdir(
+            os.path.join(self.temp_dir, 'test.yaml.cache')))
+
+        test = Simulation(os.path.join(self.temp_dir, 'test.yaml'),
+                          cache=True)
+        self.assertIsInstance(test.file, CachedReader)
+        cached, cached_sim = self.convert('test.yaml', 'cached.xyz',
+                                          cache=True, workers=2)
+        self.assertEqual(plain, built)
+        self.assertEqual(plain, cached)
+        self.assertEqual(plain_sim.thermo_data, cached_sim.thermo_data)
+        self.assertTrue(test.get_thermodata().equals(
+            Simulation(os.path.join('tests', 'test.yaml')).get_thermodata()))
+
+    def test_convert_to_xyz_columns(self):
+        """
+        Test if the conversion only reads the atom keywords written, without
+        changing the output, and restores the selection of the reader.
+
+        Steps:
+        1. Convert the test file, serially, with two workers and from the
+           cache.
+        2. Assert that the outputs are the same as the one of the previous
+           version of the conversion (all the columns read).
+        3. Assert that the selection of the reader is restored.
+        """
+        with patch('lammpshade.Constructor.Simulation.project_columns',
+                   lambda self, *args: contextlib.nullcontext()):
+            expected, _ = self.convert('test.yaml', 'all.xyz')
+        for kwargs in ({}, {'workers': 2, 'chunk_steps': 1}, {'cache': True}):
+            output, test = self.convert('test.yaml', 'projected.xyz',
+                                        **kwargs)
+            self.assertEqual(output, expected)
+            self.assertIsNone(test.file.columns)
+
+    def test_convert_to_xyz_atom_filter(self):
+        """
+        Test if only the selected atoms are converted, serially, with two
+        workers and from the cache.
+
+        Steps:
+        1. Convert the test file with an atom filter.
+        2. Assert that each frame has the number of atoms kept and their
+           rows.
+        3. Assert that the outputs are the same with two workers and from
+           the cache, and that the reader keeps no atom filter.
+        """
+        atom_filter = AtomFilter(ids={2})
+        expected, _ = self.convert('test.yaml', 'serial.xyz',
+                                   atom_filter=atom_filter)
+        lines = expected.splitlines()
+        self.assertEqual(lines[0], '1')
+        self.assertEqual(len(lines), 9)
+        self.assertTrue(lines[2].startswith('H2 0.316172 4.69719 '))
+        for kwargs in ({'workers': 2, 'chunk_steps': 1}, {'cache': True}):
+            output, test = self.convert('test.yaml', 'filtered.xyz',
+                                        atom_filter=atom_filter, **kwargs)
+            self.assertEqual(output, expected)
+            self.assertIsNone(test.file.atom_filter)
+
+    def test_convert_to_xyz_compressed_output(self):
+        """
+        Test if the compressed outputs, written serially and with several
+        workers, decompress to the plain output.
+        """
+        plain, _ = self.convert('test.yaml', 'plain.xyz')
+        for output, module in [('out.xyz.gz', gzip), ('out.xyz.xz', lzma)]:
+            for workers in (1, 2):
+                test = Simulation(os.path.join(self.temp_dir, 'test.yaml'))
+                output_path = os.path.join(self.temp_dir, output)
+                test.convert_to_xyz(output_path, workers=workers)
+                with module.open(output_path, 'rt') as f:
+                    self.assertEqual(f.read(), plain)
+
+    def test_convert_to_xyz_binary_output(self):
+        """
+        Test if a .npy output is written as a binary trajectory, even with
+        several workers, and if the thermo data is collected.
+        """
+        for workers in (1, 2):
+            test = Simulation(os.path.join(self.temp_dir, 'test.yaml'))
+            output_path = os.path.join(self.temp_dir, f'out{workers}.npy')
+            test.convert_to_xyz(output_path, workers=workers)
+            frames, headers, _ = BinaryWriter.load(output_path)
+            self.assertEqual(frames.shape, (3, 3, 3))
+            self.assertEqual(headers['timestep'].tolist(), [0, 20, 40])
+            self.assertEqual(len(test.thermo_data), 3)
+
+    def interrupted_conversion(self, output, **kwargs):
+        """
+        Converts the test file with checkpoints after every step and
+        interrupts the conversion while the step of timestep 40 is written.
+        """
+        original = XYZWriter.write_to_xyz
+
+        def write_to_xyz(writer, step):
+            if step['timestep'] == 40:
+                writer.output.write('partial frame')
+                raise RuntimeError('Interrupted')
+            original(writer, step)
+
+        test = Simulation(os.path.join(self.temp_dir, 'test.yaml'))
+        with patch.object(XYZWriter, 'write_to_xyz', write_to_xyz):
+            with self.assertRaises(RuntimeError):
+                test.convert_to_xyz(output, resume=True,
+                                    checkpoint_interval=0, **kwargs)
+        self.assertTrue(os.path.exists(output + '.ckpt'))
+
+    def test_convert_to_xyz_resume(self):
+        """
+        Test if an interrupted conversion is resumed from its checkpoint,
+        serially and with several workers, with the same output and thermo
+        data as an uninterrupted one.
+
+        Steps:
+        1. Convert the test file without interruption.
+        2. Interrupt a conversion with checkpoints at the last step.
+        3. Resume it and assert that the output and the thermo data are the
+           same and that the checkpoint is removed.
+        4. Repeat with a stride of 2, which skips a step after the
+           checkpoint.
+        """
+        for kwargs in ({}, {'workers': 2, 'chunk_steps': 1},
+                       {'stride': 2}, {'stride': 2, 'workers': 2}):
+            plain, plain_sim = self.convert('test.yaml', 'plain.xyz',
+                                            **kwargs)
+            output = os.path.join(self.temp_dir, 'resumed.xyz')
+            self.interrupted_conversion(output, stride=kwargs.get('stride',
+                                                                  1))
+            resumed, test = self.convert('test.yaml', 'resumed.xyz',
+                                         resume=True, **kwargs)
+            self.assertEqual(plain, resumed)
+            self.assertEqual(plain_sim.thermo_data, test.thermo_data)
+            self.assertFalse(os.path.exists(output + '.ckpt'))
+
+    def test_convert_to_xyz_resume_other_selection(self):
+        """
+        Test if the checkpoint of a conversion with another selection is
+        ignored.
+        """
+        plain, _ = self.convert('test.yaml', 'plain.xyz')
+        output = os.path.join(self.temp_dir, 'resumed.xyz')
+        self.interrupted_conversion(output, stride=2)
+        resumed, _ = self.convert('test.yaml', 'resumed.xyz', resume=True)
+        self.assertEqual(plain, resumed)
+
+    def test_convert_to_xyz_resume_filter_expression(self):
+        """
+        Test if a ValueError is raised when a conversion with an atom filter
+        expression is resumed, since the expression of the checkpoint cannot
+        be compared.
+        """
+        test = Simulation(os.path.join(self.temp_dir, 'test.yaml'))
+        output = os.path.join(self.temp_dir, 'resumed.xyz')
+        atom_filter = AtomFilter(where=lambda atoms: atoms['x'] > 1)
+        with self.assertRaises(ValueError):
+            test.convert_to_xyz(output, resume=True, atom_filter=atom_filter)
+        self.assertFalse(os.path.exists(output + '.ckpt'))
+
+    def test_convert_to_xyz_parallel_no_thermo_data(self):
+        """
+        Test if the parallel conversion writes the same output as the serial
+        conversion when no thermo data is present.
+        """
+        serial, _ = self.convert('test_nothermo.yaml', 'serial.xyz')
+        parallel, test = self.convert('test_nothermo.yaml', 'parallel.xyz',
+                                      workers=2, chunk_steps=2)
+        self.assertEqual(serial, parallel)
+        self.assertIsNone(test.thermo_data)
+
+
+class Test_Simulation_follow(unittest.TestCase):
+    """
+    Test the follow method of Simulation class
+    """
+    def setUp(self):
+        """
+        Write the first step and a half of the test file in a temporary
+        directory.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'test.yaml')
+        with open(os.path.join('tests', 'test.yaml'), 'r') as file:
+            self.data = file.read()
+        self.middle = self.data.index('...\n') + 100
+        with open(self.filename, 'w') as file:
+            file.write(self.data[:self.middle])
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def test_follow_appends(self):
+        """
+        Test if the steps are appended to the thermo data and to the output
+        as the file grows, and if the result is the same as a conversion of
+        the complete file.
+
+        Steps:
+        1. Follow the partial file with a null timeout.
+        2. Assert that one step is processed and written.
+        3. Write the rest of the file and follow it again.
+        4. Assert that the output and the thermo data are the same as the
+           ones of convert_to_xyz.
+        """
+        output = os.path.join(self.temp_dir, 'follow.xyz')
+        test = Simulation(self.filename)
+        steps = []
+        self.assertEqual(test.follow(output, timeout=0,
+                                     callback=steps.append), 1)
+        self.assertEqual(len(test.get_thermodata()), 1)
+        with open(output, 'r') as f:
+            self.assertEqual(f.read().count('Step='), 1)
+
+        with open(self.filename, 'a') as file:
+            file.write(self.data[self.middle:])
+        self.assertEqual(test.follow(output, timeout=0,
+                                     callback=steps.append), 2)
+        self.assertEqual([step['timestep'] for step in steps], [0, 20, 40])
+
+        expected = Simulation(os.path.join('tests', 'test.yaml'))
+        expected.convert_to_xyz(os.path.join(self.temp_dir, 'convert.xyz'))
+        with open(output, 'r') as f, \
+                open(os.path.join(self.temp_dir, 'convert.xyz'), 'r') as g:
+            self.assertEqual(f.read(), g.read())
+        self.assertEqual(test.thermo_data, expected.thermo_data)
+
+
 class Test_Simulation_get_thermodata(unittest.TestCase):
     """
     Test the get_thermodata method of Simulation
@@ -271,11 +617,51 @@ class Test_Simulation_get_thermodata(unittest.TestCase):
         test = Simulation(os.path.join('tests', 'test.yaml'))
         thermo_data = test.get_thermodata()
         self.assertEqual(test.thermo_keywords, check_thermo_keywords)
-        self.assertTrue(test.thermo_data == check_thermo_data)
+        self.assertTrue(test.thermo_data.tolist() == check_thermo_data)
 
         self.assertIsInstance(thermo_data, pd.DataFrame)
         self.assertTrue(thermo_data.equals(check_thermo_data_df))
 
+    def test_get_thermodata_mmap(self):
+        """
+        Test if the get_thermodata method returns the same DataFrame when the
+        file is read through a memory map.
+        """
+        text_df = Simulation(os.path.join('tests',
+                                          'test.yaml')).get_thermodata()
+        mmap_df = Simulation(os.path.join('tests', 'test.yaml'),
+                             use_mmap=True).get_thermodata()
+        self.assertTrue(text_df.equals(mmap_df))
+
+    def test_get_thermodata_selection(self):
+        """
+        Test if the get_thermodata method only reads the selected steps.
+
+        Steps:
+        1. Create Simulation objects with the test file.
+        2. Call the get_thermodata method with a stride and with a range of
+           timesteps.
+        3. Assert that only the rows of the selected steps are returned.
+        """
+        thermo_data = Simulation(os.path.join('tests', 'test.yaml')) \
+            .get_thermodata(stride=2)
+        self.assertEqual(thermo_data['Step'].tolist(), [0, 40])
+
+        thermo_data = Simulation(os.path.join('tests', 'test.yaml')) \
+            .get_thermodata(start_timestep=10, stop_timestep=20)
+        self.assertEqual(thermo_data['Step'].tolist(), [20])
+
+    def test_get_thermodata_thermo_columns(self):
+        """
+        Test if the get_thermodata method only returns the selected thermo
+        columns, in the order of the file.
+        """
+        test = Simulation(os.path.join('tests', 'test.yaml'),
+                          thermo_columns=['c_temp_up', 'Step'])
+        thermo_data = test.get_thermodata()
+        self.assertEqual(list(thermo_data.columns), ['Step', 'c_temp_up'])
+        self.assertEqual(thermo_data['Step'].tolist(), [0, 20, 40])
+
     def test_get_thermodata_empty_file(self):
         """
         Test if the get_thermodata method returns None when the file is empty.
@@ -354,7 +740,7 @@ class Test_Simulation_get_step_thermodata(unittest.TestCase):
         test = Simulation(os.path.join('tests', 'test.yaml'))
         thermo_flag = test.get_step_thermodata(step)
         thermo_data = test.thermo_data
-        self.assertTrue(thermo_data == check_thermo_data)
+        self.assertTrue(thermo_data.tolist() == check_thermo_data)
         self.assertTrue(thermo_flag)
 
     def test_get_step_thermodata_no_thermo_data(self):
@@ -444,6 +830,213 @@ class Test_Simulation_check_thermo_data(unittest.TestCase):
         self.assertFalse(test.check_thermo_data(step))
 
 
+class Test_Simulation_get_frame_table(unittest.TestCase):
+    """
+    Test the get_frame_table method of Simulation
+    """
+    def test_get_frame_table(self):
+        """
+        Test if the get_frame_table method returns the metadata of every
+        frame and restores the position of the reader.
+
+        Steps:
+        1. Create a Simulation object and read its first step.
+        2. Call the get_frame_table method.
+        3. Assert the columns, their types and their values.
+        4. Assert that the reading continues from the second step.
+        5. Assert that the memory-mapped reading gives the same table.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        test = Simulation(filename)
+        test.file.get_next_step()
+        frames = test.get_frame_table()
+
+        self.assertEqual(list(frames.columns), Simulation.FRAME_COLUMNS)
+        self.assertEqual(frames['timestep'].tolist(), [0, 20, 40])
+        self.assertEqual(str(frames['natoms'].dtype), 'Int64')
+        self.assertEqual(frames['time'].tolist(), [0.0, 1.0, 2.0])
+        self.assertEqual(frames['units'].tolist(), ['real'] * 3)
+        self.assertEqual(frames['boundary'][0], 'p p p p s s')
+        self.assertEqual(frames['xhi'][0], 53.116896629333496)
+        self.assertEqual(frames['zlo'][2], 0.43933719493705575)
+        self.assertEqual(test.file.get_next_step()['timestep'], 20)
+
+        mapped = Simulation(filename, use_mmap=True).get_frame_table()
+        self.assertTrue(mapped.equals(frames))
+
+    def test_get_frame_table_cache(self):
+        """
+        Test if the frame table read from the binary cache is the same as
+        the one read from the file.
+        """
+        temp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(temp_dir, 'test.yaml')
+            shutil.copy(os.path.join('tests', 'test.yaml'), filename)
+            Simulation(filename, cache=True).open_cache()
+            test = Simulation(filename, cache=True)
+            self.assertIsInstance(test.file, CachedReader)
+            self.assertTrue(test.get_frame_table().equals(
+                Simulation(filename).get_frame_table()))
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_get_frame_table_compressed_end(self):
+        """
+        Test if the reader of a compressed file stays at the end of the file
+        after the frame table is read, once the steps are exhausted.
+
+        Steps:
+        1. Compress the test file with gzip.
+        2. Read every step of it.
+        3. Call the get_frame_table method.
+        4. Assert that the reader is at the end of the decompressed data and
+           that no step is left to read.
+        """
+        temp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(temp_dir, 'test.yaml.gz')
+            with open(os.path.join('tests', 'test.yaml'), 'rb') as source:
+                data = source.read()
+            with gzip.open(filename, 'wb') as file:
+                file.write(data)
+            test = Simulation(filename)
+            while test.file.get_next_step():
+                pass
+            self.assertEqual(len(test.get_frame_table()), 3)
+            self.assertEqual(test.file.tell(), len(data))
+            self.assertFalse(test.file.get_next_step())
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_get_frame_row_missing_values(self):
+        """
+        Test if the missing or invalid values of a header are left empty.
+        """
+        row = Simulation(os.path.join('tests', 'test.yaml')).get_frame_row(
+            {'timestep': 5, 'time': 'n/a', 'box': [[0, 1]]})
+        self.assertEqual(row['timestep'], 5)
+        self.assertIsNone(row['time'])
+        self.assertIsNone(row['natoms'])
+        self.assertEqual((row['xlo'], row['xhi']), (0, 1))
+        self.assertIsNone(row['ylo'])
+
+
+class Test_Simulation_extract_atom_series(unittest.TestCase):
+    """
+    Test the extract_atom_series method of Simulation
+    """
+
+    def setUp(self):
+        """
+        Copy the test file in a temporary directory, for its index, its
+        cache and the stores.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'test.yaml')
+        shutil.copy(os.path.join('tests', 'test.yaml'), self.filename)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def test_extract_atom_series(self):
+        """
+        Test if the stored time series are the values of the atoms in the
+        steps, with and without the binary cache.
+
+        Steps:
+        1. Read the x values of the atoms in every step.
+        2. Extract the time series of x, with and without cache.
+        3. Assert that the series of each atom are the values of the steps.
+        4. Extract every other step of the atom 2 and assert the series.
+        """
+        steps = list(YAMLReader(self.filename))
+        expected = [[step['data'][n][4] for step in steps] for n in range(3)]
+        for cache in (False, True):
+            path = os.path.join(self.temp_dir, f'series{cache}')
+            series = Simulation(self.filename, cache=cache) \
+                .extract_atom_series(path, fields=['x'])
+            self.assertEqual(series.ids.tolist(), [1, 2, 3])
+            self.assertEqual(series.get([1, 2, 3], 'x').tolist(), expected)
+            self.assertEqual(series.frames['timestep'].tolist(), [0, 20, 40])
+
+        series = Simulation(self.filename).extract_atom_series(
+            os.path.join(self.temp_dir, 'stride'), stride=2,
+            atom_filter=AtomFilter(ids=[2]))
+        self.assertEqual(series.ids.tolist(), [2])
+        self.assertEqual(series.get(2, 'x').tolist(), expected[1][::2])
+
+    def test_extract_atom_series_restores_reader(self):
+        """
+        Test if the Simulation still converts the file and reports the thermo
+        data after an extraction.
+
+        Steps:
+        1. Extract the time series of the atoms.
+        2. Convert the file to XYZ and assert that the output is the check
+           file.
+        3. Assert that the thermo data of every step is reported.
+        """
+        test = Simulation(self.filename)
+        test.extract_atom_series(os.path.join(self.temp_dir, 'series'))
+        output_path = os.path.join(self.temp_dir, 'test.xyz')
+        test.convert_to_xyz(output_path)
+        with open(output_path, 'r') as f:
+            with open(os.path.join('tests', 'test_check.xyz'), 'r') as check:
+                self.assertEqual(f.read(), check.read())
+
+        test = Simulation(self.filename)
+        test.extract_atom_series(os.path.join(self.temp_dir, 'thermo'))
+        self.assertEqual(len(test.get_thermodata()), 3)
+
+    def test_get_msd(self):
+        """
+        Test if the MSD and the diffusion coefficients are computed by atom
+        type from the stored coordinates.
+
+        Steps:
+        1. Compute the MSD of the test file.
+        2. Assert that it has one column for the atom type and one row per
+           lag time.
+        3. Assert that it is the MSD of the unwrapped stored coordinates.
+        4. Assert that the diffusion coefficient is computed for the type.
+        """
+        test = Simulation(self.filename)
+        path = os.path.join(self.temp_dir, 'msd')
+        msd = test.get_msd(path)
+        self.assertEqual(list(msd.columns), [2])
+        self.assertEqual(msd.index.tolist(), [0.0, 1.0, 2.0])
+
+        analyzer = MSDAnalyzer(AtomSeries.load(path))
+        positions = np.stack([analyzer.series.series[axis][:]
+                              for axis in 'xyz'], axis=-1)
+        expected = MSDAnalyzer.msd_fft(analyzer.unwrap(positions))
+        np.testing.assert_allclose(msd[2], expected.mean(axis=0))
+
+        diffusion = test.get_diffusion(path, start=0, stop=1)
+        self.assertEqual(diffusion.index.tolist(), [2])
+
+    def test_get_msd_restores_reader(self):
+        """
+        Test if the Simulation still converts the file and reports the thermo
+        data after the computation of the MSD and of the diffusion
+        coefficients.
+        """
+        test = Simulation(self.filename)
+        test.get_msd(os.path.join(self.temp_dir, 'msd'))
+        test.get_diffusion(os.path.join(self.temp_dir, 'diffusion'), start=0,
+                           stop=1)
+        output_path = os.path.join(self.temp_dir, 'test.xyz')
+        test.convert_to_xyz(output_path)
+        with open(output_path, 'r') as f:
+            with open(os.path.join('tests', 'test_check.xyz'), 'r') as check:
+                self.assertEqual(f.read(), check.read())
+        self.assertEqual(len(test.get_thermodata()), 3)
+
+
 class Test_Simulation_make_graphs(unittest.TestCase):
     """
     Test the make_graphs method of Simulation
@@ -0,0 +1,137 @@
+import unittest
+import io
+import numpy as np
+import pandas as pd
+from lammpshade.FrameFormatter import FrameFormatter
+
+
+class Test_FrameFormatter_layout(unittest.TestCase):
+    """
+    Tests the layout method of the FrameFormatter class.
+    """
+    def test_layout(self):
+        """
+        Test if the layout contains the positions of the selected keywords in
+        output order, and if it is cached.
+
+        Steps:
+        1. Instantiate the FrameFormatter class.
+        2. Call the layout method with keywords in a different order.
+        3. Assert that the positions follow the output order.
+        4. Assert that the same object is returned on a second call.
+        """
+        formatter = FrameFormatter(['element', 'x', 'type'])
+        keywords = ['id', 'type', 'x', 'element']
+        layout = formatter.layout(keywords)
+        self.assertEqual(layout, [(3, 'element'), (2, 'x'), (1, 'type')])
+        self.assertIs(formatter.layout(keywords), layout)
+
+
+class Test_FrameFormatter_format(unittest.TestCase):
+    """
+    Tests the format method of the FrameFormatter class.
+    """
+    def to_csv(self, data, keywords, columns):
+        """
+        Formats the data with pandas, as XYZWriter used to do.
+        """
+        buffer = io.StringIO()
+        atoms_df = pd.DataFrame(data, columns=keywords)
+        atoms_df = atoms_df.filter(columns, axis=1)
+        atoms_df.to_csv(buffer, index=False, header=False, sep=" ",
+                        lineterminator='\n')
+        return buffer.getvalue()
+
+    def test_format_matches_pandas(self):
+        """
+        Test if the formatted text is the same as pandas' to_csv output for
+        integer, float, mixed and missing values.
+
+        Steps:
+        1. Instantiate the FrameFormatter class.
+        2. Format rows with different types of values.
+        3. Assert that the text is the same as the one written by pandas.
+        """
+        columns = ['element', 'x', 'y', 'z', 'vx', 'fx', 'type']
+        keywords = ['id', 'type', 'element', 'x', 'y', 'z', 'vx', 'fx']
+        data = [[1, 2, 'H2', 0.1, 0, 1e-05, None, 'test'],
+                [2, 3, 'C', 5, 1, 1e16, 2, 0.5],
+                [3, 1, 'N', -3.25, 2, float('nan'), 3, 7]]
+        formatter = FrameFormatter(columns)
+        self.assertEqual(formatter.format(data, keywords),
+                         self.to_csv(data, keywords, columns))
+
+    def test_format_quoted_and_mixed_matches_pandas(self):
+        """
+        Test if the strings with spaces or quotes, the mixed boolean and
+        numeric columns and the single empty fields are written as pandas'
+        to_csv writes them.
+
+        Steps:
+        1. Format rows with quoted strings, booleans mixed with numbers and
+           missing values.
+        2. Assert that the text is the same as the one written by pandas.
+        3. Format a single column with an empty string and a missing value
+           and assert that the text is the same as the one written by pandas.
+        """
+        keywords = ['element', 'x', 'y', 'z', 'q']
+        data = [['a b', True, 1, float('nan'), [1, 2]],
+                ['a"b', 2, 1.5, None, 'c'],
+                ['', 0.5, False, 3, 1]]
+        formatter = FrameFormatter(keywords)
+        self.assertEqual(formatter.format(data, keywords),
+                         self.to_csv(data, keywords, keywords))
+        data = [[''], [None], ['H']]
+        self.assertEqual(FrameFormatter(['element']).format(data,
+                                                            ['element']),
+                         self.to_csv(data, ['element'], ['element']))
+
+    def test_format_big_integers(self):
+        """
+        Test if the integers beyond the 64-bit range of a column with floats
+        are written as integers.
+        """
+        formatter = FrameFormatter(['x'])
+        self.assertEqual(formatter.format([[10**20], [1.5]], ['x']),
+                         '100000000000000000000\n1.5\n')
+
+    def test_format_array(self):
+        """
+        Test if a structured array is formatted as the equivalent list of
+        lists.
+
+        Steps:
+        1. Create a structured array and the equivalent list of lists.
+        2. Format both.
+        3. Assert that the texts are the same.
+        """
+        keywords = ['id', 'element', 'x']
+        array = np.array([(1, 'H', 0.5), (2, 'O', 1e-07)],
+                         dtype=[('id', 'i8'), ('element', 'U2'),
+                                ('x', 'f8')])
+        data = [[1, 'H', 0.5], [2, 'O', 1e-07]]
+        formatter = FrameFormatter(['element', 'x', 'id'])
+        self.assertEqual(formatter.format(array, keywords),
+                         formatter.format(data, keywords))
+        self.assertEqual(formatter.format(array, keywords),
+                         'H 0.5 1\nO 1e-07 2\n')
+
+    def test_format_empty(self):
+        """
+        Test if empty data is formatted as an empty string.
+        """
+        formatter = FrameFormatter(['x'])
+        self.assertEqual(formatter.format([], ['x']), '')
+
+    def test_format_wrong_row_length(self):
+        """
+        Test if a ValueError is raised when the rows do not match the
+        keywords.
+        """
+        formatter = FrameFormatter(['x'])
+        with self.assertRaises(ValueError):
+            formatter.format([[1, 2], [3]], ['id', 'x'])
+
+
+if __name__ == '__main__':
+    unittest.main()
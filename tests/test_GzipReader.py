@@ -0,0 +1,107 @@
+import unittest
+import gzip
+import io
+import os
+import random
+import shutil
+import tempfile
+from lammpshade.GzipReader import GzipReader
+
+
+class Test_GzipReader(unittest.TestCase):
+    """
+    Tests the reading and seeking of the GzipReader class.
+    """
+    def setUp(self):
+        """
+        Write a gzip file made of two members followed by padding.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'test.yaml.gz')
+        rng = random.Random(0)
+        self.data = ''.join(f'{rng.random()}\n'
+                            for _ in range(20000)).encode()
+        with open(self.filename, 'wb') as file:
+            file.write(gzip.compress(self.data[:200000]))
+            file.write(gzip.compress(self.data[200000:]))
+            file.write(b'\0' * 8)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def test_read(self):
+        """
+        Test if the decompressed data of all the members is read.
+        """
+        with GzipReader(self.filename) as reader:
+            self.assertEqual(reader.read(), self.data)
+            self.assertEqual(reader.read(), b'')
+
+    def test_seek(self):
+        """
+        Test if seeking backwards and forwards returns the right data and if
+        checkpoints are recorded.
+
+        Steps:
+        1. Read the whole file with a small checkpoint spacing.
+        2. Assert that checkpoints were recorded in order.
+        3. Seek to random offsets and assert that the data read matches.
+        """
+        reader = io.BufferedReader(GzipReader(self.filename, spacing=16384))
+        reader.read()
+        checkpoints = reader.raw.checkpoints
+        self.assertGreater(len(checkpoints), 2)
+        self.assertEqual(checkpoints, sorted(checkpoints,
+                                             key=lambda item: item[0]))
+
+        rng = random.Random(1)
+        for _ in range(50):
+            offset = rng.randrange(len(self.data))
+            self.assertEqual(reader.seek(offset), offset)
+            self.assertEqual(reader.read(100),
+                             self.data[offset:offset + 100])
+
+    def test_shared_checkpoints(self):
+        """
+        Test if a reader restores the checkpoints recorded by another one.
+        """
+        first = GzipReader(self.filename, spacing=16384)
+        first.read()
+        second = GzipReader(self.filename, checkpoints=first.checkpoints)
+        offset = first.checkpoints[-1][0] + 10
+        second.seek(offset)
+        self.assertEqual(second.read(50), self.data[offset:offset + 50])
+
+    def test_read_member_boundary_in_magic(self):
+        """
+        Test if a member ending one byte before the end of a chunk is
+        followed by the next member, whose magic is split between chunks.
+        """
+        rng = random.Random(1)
+        size = GzipReader.CHUNK_SIZE - 1  # Compressed size of the member
+        first = bytes(rng.getrandbits(8) for _ in range(size))
+        member = gzip.compress(first, mtime=0)
+        while len(member) != size:
+            # Adjust the incompressible data to the compressed size
+            first = first[:len(first) + size - len(member)]
+            member = gzip.compress(first, mtime=0)
+        second = b'second member\n' * 10
+        with open(self.filename, 'wb') as file:
+            file.write(member + gzip.compress(second, mtime=0))
+        with GzipReader(self.filename) as reader:
+            self.assertEqual(reader.read(), first + second)
+
+    def test_seek_end_unsupported(self):
+        """
+        Test if seeking from the end raises an io.UnsupportedOperation.
+        """
+        with GzipReader(self.filename) as reader:
+            with self.assertRaises(io.UnsupportedOperation):
+                reader.seek(0, io.SEEK_END)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from lammpshade.AtomSeries import AtomSeries
+from lammpshade.MSDAnalyzer import MSDAnalyzer
+
+
+def direct_msd(positions):
+    """
+    Returns the MSD of each atom by averaging over the time windows.
+    """
+    n_frames = positions.shape[1]
+    return np.array([[np.mean(np.sum((atom[m:] - atom[:n_frames - m]) ** 2,
+                                     axis=1))
+                      for m in range(n_frames)] for atom in positions])
+
+
+class Test_MSDAnalyzer_msd(unittest.TestCase):
+    """
+    Tests the computation of the MSD of the MSDAnalyzer class.
+    """
+    def setUp(self):
+        """
+        Create a temporary directory for the stores.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def write_series(self, rows, boundary):
+        """
+        Writes a store with one step per list of (id, type, x, y, z) rows,
+        in a box of length 10, and returns it loaded.
+        """
+        path = os.path.join(self.temp_dir, 'series')
+        with AtomSeries(path, ['x', 'y', 'z', 'type'], len(rows)) as series:
+            for n, data in enumerate(rows):
+                series.write_step({
+                    'timestep': 10 * n, 'time': 0.5 * n,
+                    'boundary': boundary, 'box': [[0, 10]] * 3,
+                    'keywords': ['id', 'type', 'x', 'y', 'z'], 'data': data})
+        return AtomSeries.load(path)
+
+    def test_msd_fft(self):
+        """
+        Test if the FFT algorithm gives the average over the time windows.
+        """
+        positions = np.cumsum(np.random.default_rng(0).normal(
+            size=(4, 50, 3)), axis=1)
+        np.testing.assert_allclose(MSDAnalyzer.msd_fft(positions),
+                                   direct_msd(positions), atol=1e-9)
+        self.assertEqual(MSDAnalyzer.msd_fft(np.zeros((0, 5, 3))).shape,
+                         (0, 5))
+
+    def test_msd_unwrapped_by_type(self):
+        """
+        Test if the MSD of the atoms crossing the periodic boundaries is
+        computed on the unwrapped coordinates, by type.
+
+        Steps:
+        1. Write atoms moving by 4 along x (periodic) and z (non periodic)
+           in a box of length 10, with two types and batches of one atom.
+        2. Assert that the MSD of the first type is (4 m)^2 along x only.
+        3. Assert that the atom missing from a frame is ignored.
+        4. Assert the lag times.
+        """
+        rows = []
+        for n in range(6):
+            x = 4.0 * n % 10
+            data = [[1, 1, x, 0.0, 0.0], [2, 2, x, 0.0, 4.0 * n % 10]]
+            if n != 3:
+                data.append([3, 2, 0.0, 0.0, 0.0])
+            rows.append(data)
+        series = self.write_series(rows, ['p', 'p', 'p', 'p', 's', 's'])
+        analyzer = MSDAnalyzer(series, batch_atoms=1)
+        self.assertEqual(analyzer.periodic, [True, True, False])
+
+        msd = analyzer.msd()
+        lags = np.arange(6)
+        self.assertEqual(list(msd.columns), [1, 2])
+        np.testing.assert_allclose(msd[1], (4 * lags) ** 2)
+        wrapped_z = 4.0 * lags % 10
+        np.testing.assert_allclose(
+            msd[2], (4 * lags) ** 2 + direct_msd(
+                wrapped_z[np.newaxis, :, np.newaxis])[0])
+        self.assertEqual(msd.index.tolist(), (0.5 * lags).tolist())
+
+
+class Test_MSDAnalyzer_diffusion(unittest.TestCase):
+    """
+    Tests the diffusion coefficients of the MSDAnalyzer class.
+    """
+    def test_diffusion(self):
+        """
+        Test if the diffusion coefficient is the slope of the MSD divided by
+        twice the number of coordinates, and if a ValueError is raised for
+        a fit range without enough lags.
+        """
+        series = AtomSeries('series', ['x', 'y', 'z'])
+        analyzer = MSDAnalyzer(series)
+        times = np.arange(20.0)
+        msd = pd.DataFrame({1: 6 * 0.25 * times + 3, 2: 6 * 2.0 * times},
+                           index=pd.Index(times, name='lag'))
+        diffusion = analyzer.diffusion(msd)
+        self.assertAlmostEqual(diffusion[1], 0.25)
+        self.assertAlmostEqual(diffusion[2], 2.0)
+        with self.assertRaises(ValueError):
+            analyzer.diffusion(msd, start=0.5, stop=0.55)
+
+    def test_no_coordinates(self):
+        """
+        Test if a KeyError is raised for a series without coordinates.
+        """
+        with self.assertRaises(KeyError):
+            MSDAnalyzer(AtomSeries('series', ['vx']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+import os
+from lammpshade.MappedFile import MappedFile
+
+
+class Test_MappedFile_init_(unittest.TestCase):
+    """
+    Tests the constructor of the MappedFile class.
+    """
+    def test_init_file_not_found(self):
+        """
+        Test if the constructor raises a FileNotFoundError when the specified
+        file is not found.
+        """
+        with self.assertRaises(FileNotFoundError):
+            MappedFile("non_existent_file.yaml")
+
+    def test_init_empty_file(self):
+        """
+        Test if an empty file can be opened and read.
+
+        Steps:
+        1. Instantiate the MappedFile class with an empty file.
+        2. Assert that readline returns an empty string.
+        """
+        with MappedFile(os.path.join('tests', 'test_empty.yaml')) as file:
+            self.assertEqual(file.readline(), '')
+            self.assertEqual(file.read_rows(), [])
+
+
+class Test_MappedFile_readline(unittest.TestCase):
+    """
+    Tests the readline and read_raw_line methods of the MappedFile class.
+    """
+    def test_readline_matches_text_mode(self):
+        """
+        Test if readline returns the same lines as a file opened in text mode.
+
+        Steps:
+        1. Open the test file with MappedFile and in text mode.
+        2. Assert that every line is the same.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        with MappedFile(filename) as file, open(filename, 'r') as check:
+            for check_line in check:
+                self.assertEqual(file.readline(), check_line)
+            self.assertEqual(file.readline(), '')
+
+    def test_seek_and_tell(self):
+        """
+        Test if seek and tell work with byte offsets.
+
+        Steps:
+        1. Read the first line of the test file.
+        2. Assert that tell returns its length in bytes.
+        3. Seek back to the beginning and read the first line again.
+        """
+        with MappedFile(os.path.join('tests', 'test.yaml')) as file:
+            line = file.read_raw_line()
+            self.assertEqual(file.tell(), len(line))
+            file.seek(0)
+            self.assertEqual(file.read_raw_line(), line)
+
+
+class Test_MappedFile_rows(unittest.TestCase):
+    """
+    Tests the read_rows and skip_rows methods of the MappedFile class.
+    """
+    def setUp(self):
+        """
+        Move a MappedFile object to the first atom row of the test file.
+        """
+        self.file = MappedFile(os.path.join('tests', 'test.yaml'))
+        while not self.file.readline().startswith('data:'):
+            pass
+
+    def tearDown(self):
+        """
+        Close the MappedFile object.
+        """
+        self.file.close()
+
+    def test_read_rows(self):
+        """
+        Test if read_rows returns the atom rows and stops at the end of the
+        block.
+
+        Steps:
+        1. Call read_rows at the first atom row.
+        2. Assert that the three atom rows are returned.
+        3. Assert that the next line is the end of the step.
+        """
+        rows = self.file.read_rows()
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(rows[0].startswith('  - [ 1 ,'))
+        self.assertEqual(self.file.readline(), '...\n')
+
+    def test_skip_rows(self):
+        """
+        Test if skip_rows moves to the line after the block.
+
+        Steps:
+        1. Call skip_rows at the first atom row.
+        2. Assert that the next line is the end of the step.
+        3. Call skip_rows on a line that is not a list item.
+        4. Assert that the position does not change.
+        """
+        self.file.skip_rows()
+        self.assertEqual(self.file.readline(), '...\n')
+        pos = self.file.tell()
+        self.file.skip_rows()
+        self.assertEqual(self.file.tell(), pos)
+
+    def test_skip_past(self):
+        """
+        Test if skip_past moves after the first line starting with a marker.
+
+        Steps:
+        1. Call skip_past with the '...' marker twice.
+        2. Assert that the reader is at the beginning of the third step.
+        3. Call skip_past with a missing marker.
+        4. Assert that False is returned and the end of the file is reached.
+        """
+        self.assertTrue(self.file.skip_past(b'...'))
+        self.assertTrue(self.file.skip_past(b'...'))
+        self.assertEqual(self.file.readline(), '---\n')
+        self.assertFalse(self.file.skip_past(b'missing'))
+        self.assertEqual(self.file.readline(), '')
+
+    def test_close(self):
+        """
+        Test if close sets the closed flag and can be called twice.
+        """
+        self.file.close()
+        self.file.close()
+        self.assertTrue(self.file.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
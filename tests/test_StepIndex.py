@@ -0,0 +1,178 @@
+import unittest
+import gzip
+import os
+import shutil
+import tempfile
+from lammpshade.StepIndex import StepIndex
+
+
+class Test_StepIndex_update(unittest.TestCase):
+    """
+    Tests the update method of the StepIndex class.
+    """
+    def setUp(self):
+        """
+        Copy the test file in a temporary directory, so that the sidecar file
+        is not created in the tests directory.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'test.yaml')
+        shutil.copy(os.path.join('tests', 'test.yaml'), self.filename)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def test_update_indexes_steps(self):
+        """
+        Test if the update method records the offset, timestep and number of
+        atoms of every step.
+
+        Steps:
+        1. Instantiate the StepIndex class and update it.
+        2. Assert that three steps are indexed with the right timesteps.
+        3. Assert that every offset points to a '---' line.
+        """
+        index = StepIndex(self.filename).update()
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.timesteps, [0, 20, 40])
+        self.assertEqual(index.natoms, [20286] * 3)
+        with open(self.filename, 'rb') as file:
+            for offset in index.offsets:
+                file.seek(offset)
+                self.assertEqual(file.readline(), b'---\n')
+
+    def test_update_saves_sidecar(self):
+        """
+        Test if the update method persists the index in the sidecar file and
+        if a new StepIndex object loads it.
+
+        Steps:
+        1. Instantiate the StepIndex class and update it.
+        2. Assert that the sidecar file exists.
+        3. Load the sidecar file with a new StepIndex object.
+        4. Assert that the loaded index is valid and equal to the first one.
+        """
+        index = StepIndex(self.filename).update()
+        self.assertTrue(os.path.exists(self.filename + '.idx'))
+
+        loaded = StepIndex(self.filename)
+        self.assertTrue(loaded.load())
+        self.assertTrue(loaded.is_valid())
+        self.assertEqual(loaded.offsets, index.offsets)
+
+    def test_update_end_offset(self):
+        """
+        Test if the end offset is the size of the file, or the size of the
+        decompressed data for a compressed file, and if it is saved.
+        """
+        with open(self.filename, 'rb') as file:
+            data = file.read()
+        self.assertEqual(StepIndex(self.filename).update().end, len(data))
+        filename = self.filename + '.gz'
+        with gzip.open(filename, 'wb') as file:
+            file.write(data)
+        self.assertEqual(StepIndex(filename).update().end, len(data))
+        loaded = StepIndex(filename)
+        self.assertTrue(loaded.load())
+        self.assertEqual(loaded.end, len(data))
+
+    def test_update_incremental(self):
+        """
+        Test if the update method extends the index when the file has grown.
+
+        Steps:
+        1. Instantiate the StepIndex class and update it.
+        2. Append a new step to the file.
+        3. Update the index again.
+        4. Assert that the new step is indexed after the previous ones.
+        """
+        index = StepIndex(self.filename).update()
+        offsets = list(index.offsets)
+        with open(self.filename, 'a') as file:
+            file.write('\n---\ntimestep: 60\nnatoms: 3\n...\n')
+        os.utime(self.filename, (0, index.mtime + 1))
+
+        index.update()
+        self.assertEqual(index.offsets[:3], offsets)
+        self.assertEqual(index.timesteps, [0, 20, 40, 60])
+        self.assertEqual(index.natoms[-1], 3)
+
+    def test_update_incomplete_step(self):
+        """
+        Test if a step that is not terminated by '...' is indexed and scanned
+        again once it is complete.
+
+        Steps:
+        1. Append an incomplete step to the file and update the index.
+        2. Assert that the incomplete step is indexed without its natoms.
+        3. Complete the step and update the index again.
+        4. Assert that the step is indexed only once with its natoms.
+        """
+        with open(self.filename, 'a') as file:
+            file.write('\n---\ntimestep: 60\n')
+        index = StepIndex(self.filename).update()
+        self.assertEqual(index.timesteps, [0, 20, 40, 60])
+        self.assertIsNone(index.natoms[-1])
+
+        with open(self.filename, 'a') as file:
+            file.write('natoms: 3\n...\n')
+        os.utime(self.filename, (0, index.mtime + 1))
+
+        index.update()
+        self.assertEqual(index.timesteps, [0, 20, 40, 60])
+        self.assertEqual(index.natoms[-1], 3)
+
+    def test_update_rewritten_file(self):
+        """
+        Test if the index is rebuilt when the file shrinks.
+
+        Steps:
+        1. Instantiate the StepIndex class and update it.
+        2. Overwrite the file with a single step.
+        3. Update the index again.
+        4. Assert that only the new step is indexed.
+        """
+        index = StepIndex(self.filename).update()
+        with open(self.filename, 'w') as file:
+            file.write('---\ntimestep: 5\n...\n')
+
+        index.update()
+        self.assertEqual(index.offsets, [0])
+        self.assertEqual(index.timesteps, [5])
+
+    def test_update_file_not_found(self):
+        """
+        Test if the update method raises a FileNotFoundError when the file
+        does not exist.
+        """
+        with self.assertRaises(FileNotFoundError):
+            StepIndex(os.path.join(self.temp_dir, 'missing.yaml')).update()
+
+
+class Test_StepIndex_find_timestep(unittest.TestCase):
+    """
+    Tests the find_timestep method of the StepIndex class.
+    """
+    def test_find_timestep(self):
+        """
+        Test if the position of a timestep is returned and if a ValueError is
+        raised for a missing timestep.
+
+        Steps:
+        1. Instantiate the StepIndex class and fill it manually.
+        2. Assert that the first occurrence of a timestep is returned.
+        3. Assert that a ValueError is raised for a missing timestep.
+        """
+        index = StepIndex('test.yaml')
+        index.timesteps = [0, 20, 20, 40]
+        self.assertEqual(index.find_timestep(20), 1)
+        self.assertEqual(index.find_timestep(40), 3)
+        with self.assertRaises(ValueError):
+            index.find_timestep(30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from lammpshade.StepPrefetcher import StepPrefetcher
+
+
+class Test_StepPrefetcher(unittest.TestCase):
+    """
+    Tests the iteration of the StepPrefetcher class.
+    """
+    def test_iterate_in_order(self):
+        """
+        Test if the steps are returned in order with a queue shorter than
+        the number of steps.
+        """
+        with StepPrefetcher(iter(range(100)), depth=2) as steps:
+            self.assertEqual(list(steps), list(range(100)))
+            self.assertEqual(list(steps), [])
+
+    def test_exception_raised_again(self):
+        """
+        Test if an exception raised while reading the steps is raised by
+        the iterator after the steps read before it.
+
+        Steps:
+        1. Instantiate the StepPrefetcher class with a generator raising a
+           ValueError after two steps.
+        2. Assert that the two steps are returned.
+        3. Assert that the ValueError is raised.
+        """
+        def steps():
+            yield 1
+            yield 2
+            raise ValueError('corrupted step')
+
+        prefetcher = StepPrefetcher(steps())
+        self.assertEqual(next(prefetcher), 1)
+        self.assertEqual(next(prefetcher), 2)
+        with self.assertRaises(ValueError):
+            next(prefetcher)
+        prefetcher.close()
+
+    def test_close_stops_thread(self):
+        """
+        Test if closing the prefetcher before the end stops the reading
+        thread.
+        """
+        def endless():
+            n = 0
+            while True:
+                yield n
+                n += 1
+
+        prefetcher = StepPrefetcher(endless(), depth=1)
+        self.assertEqual(next(prefetcher), 0)
+        prefetcher.close()
+        self.assertFalse(prefetcher._thread.is_alive())
+        with self.assertRaises(StopIteration):
+            next(prefetcher)
+
+    def test_invalid_depth(self):
+        """
+        Test if a ValueError is raised for a depth smaller than 1.
+        """
+        with self.assertRaises(ValueError):
+            StepPrefetcher(iter([]), depth=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
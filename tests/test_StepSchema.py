@@ -0,0 +1,146 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from lammpshade.StepSchema import StepSchema
+from lammpshade.YAMLReader import YAMLReader
+
+
+def read_generic(filename, **kwargs):
+    """
+    Reads all the steps of a file with the generic parser only.
+    """
+    reader = YAMLReader(filename, **kwargs)
+    reader._deviations = StepSchema.MAX_DEVIATIONS
+    return list(reader)
+
+
+class Test_StepSchema_learn(unittest.TestCase):
+    """
+    Tests the learning of the layout of a step.
+    """
+    def test_learn(self):
+        """
+        Test if the kinds of the keys of the test file are learned in order.
+
+        Steps:
+        1. Read the first step of the test file.
+        2. Assert the learned fields.
+        3. Assert that no schema is learned from an empty step.
+        """
+        reader = YAMLReader(os.path.join('tests', 'test.yaml'))
+        reader.get_next_step()
+        self.assertEqual(reader.schema.fields, [
+            ('creator', 'value'), ('timestep', 'value'), ('units', 'value'),
+            ('time', 'value'), ('natoms', 'value'), ('boundary', 'value'),
+            ('thermo', 'items'), ('box', 'rows'), ('keywords', 'value'),
+            ('data', 'rows')])
+        reader.close()
+        self.assertIsNone(StepSchema.learn({}))
+
+    def test_learn_array_data(self):
+        """
+        Test if the atom data read as a NumPy array is learned as rows.
+        """
+        schema = StepSchema.learn({'keywords': ['x'],
+                                   'data': np.zeros(2, dtype=[('x', 'f8')])})
+        self.assertEqual(schema.fields, [('keywords', 'value'),
+                                         ('data', 'rows')])
+
+
+class Test_StepSchema_parse(unittest.TestCase):
+    """
+    Tests the parsing of the steps with a schema.
+    """
+    def setUp(self):
+        """
+        Create a temporary directory for the YAML files.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def write_yaml(self, documents):
+        """
+        Writes YAML documents to a file and returns its path.
+        """
+        filename = os.path.join(self.temp_dir, 'steps.yaml')
+        with open(filename, 'w') as file:
+            for document in documents:
+                file.write('---\n' + document + '...\n')
+        return filename
+
+    def test_parse_same_steps(self):
+        """
+        Test if the steps parsed with the schema are the same as those of
+        the generic parser, in every reading mode.
+
+        Steps:
+        1. Read the test file with the generic parser only.
+        2. Read it with the schema, with and without memory map.
+        3. Assert that the steps are the same and that the schema is kept.
+        4. Compare the NumPy arrays and the steps without atom data.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        expected = read_generic(filename)
+        for use_mmap in (False, True):
+            reader = YAMLReader(filename, use_mmap=use_mmap)
+            self.assertEqual(list(reader), expected)
+            self.assertIsNotNone(reader.schema)
+            self.assertEqual(reader._deviations, 0)
+
+        expected_arrays = read_generic(filename, array_data=True)
+        steps = list(YAMLReader(filename, array_data=True))
+        for step, expected_step in zip(steps, expected_arrays):
+            np.testing.assert_array_equal(step['data'], expected_step['data'])
+            self.assertEqual(step['thermo'], expected_step['thermo'])
+
+        reader = YAMLReader(filename)
+        reader.get_next_step()
+        step = reader.get_next_step(skip_data=True)
+        self.assertNotIn('data', step)
+        self.assertEqual(step['timestep'], 20)
+        self.assertEqual(reader.get_next_step(), expected[2])
+
+    def test_parse_deviating_step(self):
+        """
+        Test if a step that deviates from the schema is parsed by the generic
+        parser and if the schema is learned again from it.
+
+        Steps:
+        1. Write steps with an extra key, a missing block and rows that the
+           generic parser splits differently.
+        2. Read them and assert that they are the same as with the generic
+           parser.
+        3. Assert that the deviations are counted.
+        """
+        documents = [
+            'timestep: 0\nbox:\n  - [ 0, 1 ]\ndata:\n  - [ 1 , 0.5 ]\n',
+            'timestep: 1\nbox:\n  - [ 0, 1 ]\ndata:\n  - [ 1 , 0.5 ]\n',
+            'timestep: 2\nunits: real\nbox:\n  - [ 0, 1 ]\n'
+            'data:\n  - [ 1 , 0.5 ]\n',
+            'timestep: 3\nunits: real\nbox:\n  - [ 0, 1 ]\n',
+            'timestep: 4\nunits: real\nbox:\n  - [ 0, 1 ]\n'
+            'data:\n  - [ 1 , a - b ]\n  - [ 2 , c:d ]\n',
+        ]
+        filename = self.write_yaml(documents)
+        reader = YAMLReader(filename)
+        self.assertEqual(list(reader), read_generic(filename))
+        self.assertEqual(reader._deviations, 3)
+
+    def test_parse_max_deviations(self):
+        """
+        Test if no schema is learned after MAX_DEVIATIONS deviations.
+        """
+        documents = [f'timestep: {n}\n' + 'units: real\n' * (n % 2)
+                     for n in range(2 * StepSchema.MAX_DEVIATIONS + 2)]
+        filename = self.write_yaml(documents)
+        reader = YAMLReader(filename)
+        self.assertEqual(list(reader), read_generic(filename))
+        self.assertEqual(reader._deviations, StepSchema.MAX_DEVIATIONS)
+        self.assertIsNone(reader.schema)
@@ -0,0 +1,95 @@
+import unittest
+import numpy as np
+import pandas as pd
+from lammpshade.ThermoBuffer import ThermoBuffer
+
+
+class Test_ThermoBuffer_append(unittest.TestCase):
+    """
+    Tests the append method of the ThermoBuffer class.
+    """
+    def test_append_grows(self):
+        """
+        Test if the buffer grows by doubling and keeps every row.
+
+        Steps:
+        1. Instantiate the ThermoBuffer class with a capacity of 1.
+        2. Append five rows.
+        3. Assert that the capacity has doubled up to 8 and that the rows
+           are returned in order.
+        """
+        buffer = ThermoBuffer(['Step', 'Temp'], capacity=1)
+        rows = [[i, 300.0 + i] for i in range(5)]
+        buffer.extend(rows)
+        self.assertEqual(len(buffer), 5)
+        self.assertEqual(buffer.capacity, 8)
+        self.assertEqual(buffer.tolist(), rows)
+
+    def test_append_upgrades_columns(self):
+        """
+        Test if the columns are upgraded from int to float and object.
+
+        Steps:
+        1. Instantiate the ThermoBuffer class.
+        2. Append rows mixing ints, floats, missing values and strings.
+        3. Assert that the dtypes of the columns have been upgraded.
+        4. Assert that the values are kept.
+        """
+        buffer = ThermoBuffer(['Step', 'Temp', 'Press', 'Name'])
+        buffer.append([0, 1, 2, 'a'])
+        buffer.append([20, 1.5, None, 3])
+        self.assertEqual([column.dtype for column in buffer.columns],
+                         [np.int64, np.float64, np.float64, object])
+        rows = buffer.tolist()
+        self.assertEqual(rows[0], [0, 1.0, 2.0, 'a'])
+        self.assertEqual(rows[1][:2], [20, 1.5])
+        self.assertTrue(np.isnan(rows[1][2]))
+        self.assertEqual(rows[1][3], 3)
+
+    def test_append_wrong_length(self):
+        """
+        Test if a ValueError is raised for a row with a wrong length.
+        """
+        buffer = ThermoBuffer(['Step', 'Temp'])
+        with self.assertRaises(ValueError):
+            buffer.append([0])
+
+
+class Test_ThermoBuffer_to_dataframe(unittest.TestCase):
+    """
+    Tests the to_dataframe method of the ThermoBuffer class.
+    """
+    def test_to_dataframe(self):
+        """
+        Test if the DataFrame is the same as the one built from the list of
+        rows and if the numeric columns are not copied.
+
+        Steps:
+        1. Instantiate the ThermoBuffer class and append rows.
+        2. Build the DataFrame.
+        3. Assert that it is equal to the DataFrame built from the rows.
+        4. Assert that the numeric columns share the memory of the buffer.
+        """
+        rows = [[0, 0, 300.5, 'a'], [20, 1, 301, 'b'], [40, 2, 299.25, 'c']]
+        keywords = ['Step', 'Time', 'Temp', 'Name']
+        buffer = ThermoBuffer(keywords)
+        buffer.extend(rows)
+
+        thermo = buffer.to_dataframe()
+        self.assertTrue(thermo.equals(pd.DataFrame(rows, columns=keywords)))
+        for keyword, column in zip(keywords[:3], buffer.columns):
+            self.assertTrue(np.shares_memory(thermo[keyword].to_numpy(),
+                                             column))
+
+    def test_to_dataframe_empty(self):
+        """
+        Test if an empty buffer returns an empty DataFrame with the keywords
+        as columns.
+        """
+        thermo = ThermoBuffer(['Step', 'Temp']).to_dataframe()
+        self.assertEqual(list(thermo.columns), ['Step', 'Temp'])
+        self.assertEqual(len(thermo), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+from lammpshade.Tokenizer import Tokenizer, convert_token
+
+
+class Test_Tokenizer_convert_token(unittest.TestCase):
+    """
+    Tests the classification of the tokens.
+    """
+    def test_convert_token(self):
+        """
+        Test if integers, floats with a dot or an exponent and strings are
+        classified.
+        """
+        self.assertEqual(convert_token('12'), 12)
+        self.assertIsInstance(convert_token('-12'), int)
+        self.assertEqual(convert_token('+7'), 7)
+        self.assertEqual(convert_token('1e5'), 100000.0)
+        self.assertIsInstance(convert_token('1e5'), float)
+        self.assertEqual(convert_token('-2.5E-03'), -0.0025)
+        self.assertEqual(convert_token('.5'), 0.5)
+        self.assertEqual(convert_token('3.'), 3.0)
+        for token in ['H2', 'nan', '1.2.3', 'e5', '1e', '-', '']:
+            self.assertEqual(convert_token(token), token)
+
+
+class Test_Tokenizer_convert_list(unittest.TestCase):
+    """
+    Tests the conversion of the lists with learned layouts.
+    """
+    def test_convert_list_layout(self):
+        """
+        Test if the rows of a key are converted with the learned layout and
+        if a row with other types falls back to the classification.
+
+        Steps:
+        1. Convert a row and assert that a layout is learned.
+        2. Convert a row with the same types and assert the result.
+        3. Convert a row with an integer in a float column and assert that
+           it is kept as an integer.
+        4. Convert a row with a string in a number column.
+        """
+        tokenizer = Tokenizer()
+        self.assertEqual(tokenizer.convert('[ 1 , 2 , H2 , 0.5 , 1e-05, ]',
+                                           'data'), [1, 2, 'H2', 0.5, 1e-05])
+        self.assertEqual(len(tokenizer._layouts['data']), 1)
+        self.assertEqual(tokenizer.convert('[ 3 , 1 , O H , -2.5 , 4.0, ]',
+                                           'data'), [3, 1, 'O H', -2.5, 4.0])
+        row = tokenizer.convert('[ 4 , 1 , C , 0 , 1.5, ]', 'data')
+        self.assertEqual(row, [4, 1, 'C', 0, 1.5])
+        self.assertIsInstance(row[3], int)
+        self.assertEqual(tokenizer.convert('[ 5 , 1 , 7 , nan , 1.5, ]',
+                                           'data'), [5, 1, 7, 'nan', 1.5])
+        self.assertEqual(len(tokenizer._layouts['data']), 3)
+
+    def test_convert_list_without_key(self):
+        """
+        Test if lists are converted without key and if empty elements are
+        dropped.
+        """
+        tokenizer = Tokenizer()
+        self.assertEqual(tokenizer.convert('[p, p, , s,]'),
+                         ['p', 'p', 's'])
+        self.assertEqual(tokenizer.convert('[]', 'empty'), [])
+        self.assertEqual(tokenizer.convert('[]', 'empty'), [])
+        self.assertEqual(len(tokenizer._layouts['empty']), 1)
+
+
+class Test_Tokenizer_convert_rows(unittest.TestCase):
+    """
+    Tests the conversion of the rows of a block.
+    """
+    def test_convert_rows(self):
+        """
+        Test if the rows are converted as convert would one by one.
+        """
+        values = ['[ 1 , H , 0.5 ]', '[ 2 , O , 1.5 ]', '[ 3 , 4 , 1 ]',
+                  '[ 4 , C , 2.5 ]', '7', 'text']
+        tokenizer = Tokenizer()
+        expected = [Tokenizer().convert(value) for value in values]
+        rows = tokenizer.convert_rows(values, 'data')
+        self.assertEqual(rows, expected)
+        self.assertEqual([[type(element) for element in row]
+                          for row in rows[:4]],
+                         [[type(element) for element in row]
+                          for row in expected[:4]])
+        self.assertEqual(tokenizer.convert_rows(values), expected)
+
+    def test_convert_rows_positions(self):
+        """
+        Test if the rows converted with a projection are the selected
+        elements of the rows converted entirely.
+
+        Steps:
+        1. Convert the rows entirely and with a projection.
+        2. Assert that the projected rows are the selected elements.
+        3. Assert that the layouts of the projection are learned apart.
+        4. Assert that a ValueError is raised for a row without the
+           selected elements.
+        """
+        values = ['[ 1 , H , 0.5 , 3 ]', '[ 2 , O , 1.5 , 4 ]',
+                  '[ 3 , 4 , 1 , 5 ]', '[ 4 , C , 2.5 , 6 ]']
+        positions = (1, 2)
+        tokenizer = Tokenizer()
+        expected = [[row[n] for n in positions]
+                    for row in tokenizer.convert_rows(values, 'data')]
+        self.assertEqual(tokenizer.convert_rows(values, 'data', positions),
+                         expected)
+        self.assertEqual(tokenizer.convert_rows(values, None, positions),
+                         expected)
+        self.assertIn(('data', positions), tokenizer._layouts)
+        self.assertEqual(len(tokenizer._layouts['data']), 2)
+        with self.assertRaises(ValueError):
+            tokenizer.convert_rows(['[ 1 , H ]'], 'data', (0, 2))
+
+    def test_split_columns(self):
+        """
+        Test if the elements of the rows are split at the given positions,
+        and if None is returned for a row without them.
+        """
+        values = ['[ 1 , 2 , H , 0.5 ]', '[ 2 , 3 , O , 1.5 , ]']
+        tokenizer = Tokenizer()
+        self.assertEqual(tokenizer.split_columns(values, (1, 3)),
+                         [['2', '3'], ['0.5', '1.5']])
+        self.assertEqual(tokenizer.split_columns(values, (2,)),
+                         [['H', 'O']])
+        self.assertIsNone(tokenizer.split_columns(values + ['[ 3 ]'], (1,)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import os
+import shutil
+import tempfile
+from lammpshade.TrajectoryCache import TrajectoryCache
+from lammpshade.YAMLReader import YAMLReader
+
+
+class Test_TrajectoryCache_build(unittest.TestCase):
+    """
+    Tests the build and load methods of the TrajectoryCache class.
+    """
+    def setUp(self):
+        """
+        Copy the test files in a temporary directory, so that the cache is
+        not created in the tests directory.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        for filename in ['test.yaml', 'test_noatomskeywords.yaml']:
+            shutil.copy(os.path.join('tests', filename),
+                        os.path.join(self.temp_dir, filename))
+        self.filename = os.path.join(self.temp_dir, 'test.yaml')
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def test_build_same_steps(self):
+        """
+        Test if the frames of the cache are identical to the parsed steps.
+
+        Steps:
+        1. Build the cache of the test file.
+        2. Load it with a new TrajectoryCache object.
+        3. Assert that every frame has the same values and types as the step
+           parsed by YAMLReader.
+        4. Assert that the frames table holds the timesteps and row ranges.
+        """
+        self.assertTrue(TrajectoryCache(self.filename).build())
+        cache = TrajectoryCache(self.filename)
+        self.assertTrue(cache.load())
+
+        steps = list(YAMLReader(self.filename))
+        self.assertEqual(len(cache), len(steps))
+        for n, step in enumerate(steps):
+            self.assertEqual(repr(cache.get_frame(n)), repr(step))
+        self.assertEqual(cache.frames['timestep'].tolist(), [0, 20, 40])
+        self.assertEqual(cache.frames['row_start'].tolist(), [0, 3, 6])
+
+    def test_build_mixed_column(self):
+        """
+        Test if the integers of a column mixing integers and floats are
+        restored.
+
+        Steps:
+        1. Write a file whose 'x' column holds integers in one step and
+           floats in the other.
+        2. Build the cache.
+        3. Assert that the frames have the same values and types as the
+           parsed steps.
+        """
+        with open(self.filename, 'w') as file:
+            for timestep, x in [(0, '1'), (10, '1.5')]:
+                file.write(f'---\ntimestep: {timestep}\n'
+                           'keywords: [ id, element, x, ]\ndata:\n'
+                           f'  - [ 1 , C , {x} , ]\n  - [ 2 , O , 2 , ]\n'
+                           '...\n')
+        cache = TrajectoryCache(self.filename)
+        self.assertTrue(cache.build())
+        for n, step in enumerate(YAMLReader(self.filename)):
+            self.assertEqual(repr(cache.get_frame(n)), repr(step))
+
+    def test_build_streamed_columns(self):
+        """
+        Test if the columns written step by step are converted to the dtype
+        of the whole column.
+
+        Steps:
+        1. Write a file whose 'element' column holds longer strings and whose
+           'x' column holds floats after integers in the last step.
+        2. Build the cache.
+        3. Assert that the frames have the same values and types as the
+           parsed steps, and that only the mask of 'x' is written.
+        4. Assert that a column mixing strings and numbers is not cached and
+           that no temporary directory is left.
+        """
+        rows = [('C', '1', '2'), ('Na', '2.5', '3'), ('O', '7', 'H')]
+        with open(self.filename, 'w') as file:
+            for timestep, (element, x, y) in enumerate(rows):
+                file.write(f'---\ntimestep: {timestep}\n'
+                           'keywords: [ id, element, x, y, ]\ndata:\n'
+                           f'  - [ 1 , {element} , {x} , {y} , ]\n'
+                           f'  - [ 2 , Cl , 3 , 1 , ]\n...\n')
+        cache = TrajectoryCache(self.filename)
+        self.assertFalse(cache.build())
+        self.assertFalse(os.path.exists(cache.path + '.tmp'))
+
+        with open(self.filename, 'r') as file:
+            text = file.read()
+        with open(self.filename, 'w') as file:
+            file.write(text.replace(', H ,', ', 4 ,'))
+        self.assertTrue(cache.build())
+        for n, step in enumerate(YAMLReader(self.filename)):
+            self.assertEqual(repr(cache.get_frame(n)), repr(step))
+        self.assertEqual(sorted(name for name in os.listdir(cache.path)
+                                if name.endswith('_mask.npy')),
+                         ['atoms_2_mask.npy'])
+
+    def test_build_not_cacheable(self):
+        """
+        Test if the cache is not written when the atom rows do not match the
+        keywords.
+        """
+        filename = os.path.join(self.temp_dir, 'test_noatomskeywords.yaml')
+        cache = TrajectoryCache(filename)
+        self.assertFalse(cache.build())
+        self.assertFalse(os.path.exists(cache.path))
+
+    def test_load_invalidated(self):
+        """
+        Test if the cache is not loaded once the YAML file has changed.
+
+        Steps:
+        1. Build the cache of the test file.
+        2. Append a step to the file.
+        3. Assert that the cache is not loaded.
+        """
+        self.assertTrue(TrajectoryCache(self.filename).build())
+        with open(self.filename, 'a') as file:
+            file.write('---\ntimestep: 60\n...\n')
+        self.assertFalse(TrajectoryCache(self.filename).load())
+
+    def test_load_missing(self):
+        """
+        Test if load returns False when there is no cache.
+        """
+        self.assertFalse(TrajectoryCache(self.filename).load())
+
+
+if __name__ == '__main__':
+    unittest.main()
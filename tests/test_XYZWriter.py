@@ -65,6 +65,16 @@ class Test_XYZWriter_init_(unittest.TestCase):
         """
         with self.assertRaises(ValueError):
             XYZWriter("example.txt")
+        with self.assertRaises(ValueError):
+            XYZWriter("example.xyz.bz2")
+
+    def test_file_compression(self):
+        """
+        Test if the compression of the output file is set from its suffix.
+        """
+        self.assertIsNone(XYZWriter("example.xyz").compression)
+        self.assertEqual(XYZWriter("example.xyz.gz").compression, 'gzip')
+        self.assertEqual(XYZWriter("example.XYZ.XZ").compression, 'xz')
 
     def test_file_created_in_output_directory(self):
         """
@@ -1,6 +1,13 @@
 import unittest
+import itertools
 import os
+import gzip
+import shutil
+import tempfile
+import threading
 from unittest.mock import patch, MagicMock, mock_open
+from lammpshade.AtomFilter import AtomFilter
+from lammpshade.StepSchema import StepSchema
 from lammpshade.YAMLReader import YAMLReader
 
 
@@ -61,6 +68,8 @@ class Test_YAMLReader_convert_value(unittest.TestCase):
         assert yaml_reader.convert_value("3.14e-2") == 3.14e-2
         assert yaml_reader.convert_value("-3.14e-2") == -3.14e-2
         assert yaml_reader.convert_value("3.14e2") == 3.14e2
+        assert yaml_reader.convert_value("1e5") == 1e5
+        assert isinstance(yaml_reader.convert_value("-1E-05"), float)
 
     def test_convert_value_list_integers(self):
         """
@@ -836,5 +845,775 @@ class Test_YAMLReader_process_dictionary(unittest.TestCase):
         self.assertEqual(next_line, line)
 
 
+class Test_YAMLReader_random_access(unittest.TestCase):
+    """
+    Tests the get_step and seek_timestep methods of the YAMLReader class.
+    """
+    def setUp(self):
+        """
+        Copy the test file in a temporary directory, so that the sidecar file
+        of the index is not created in the tests directory.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'test.yaml')
+        shutil.copy(os.path.join('tests', 'test.yaml'), self.filename)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_step(self):
+        """
+        Test if the get_step method returns the requested step and if the
+        reading continues from the following step.
+
+        Steps:
+        1. Instantiate the YAMLReader class.
+        2. Call the get_step method with positive and negative positions.
+        3. Assert that the right steps are returned.
+        4. Assert that get_next_step continues after the requested step.
+        """
+        yaml_reader = YAMLReader(self.filename)
+        self.assertEqual(yaml_reader.get_step(1)['timestep'], 20)
+        self.assertEqual(yaml_reader.get_next_step()['timestep'], 40)
+        self.assertEqual(yaml_reader.get_step(-3)['timestep'], 0)
+        self.assertEqual(yaml_reader.get_step(2)['data'][0][0], 1)
+
+    def test_get_step_after_end_of_file(self):
+        """
+        Test if the get_step method works after the file was read to its end.
+
+        Steps:
+        1. Instantiate the YAMLReader class and read all the steps.
+        2. Call the get_step method.
+        3. Assert that the requested step is returned.
+        """
+        yaml_reader = YAMLReader(self.filename)
+        while yaml_reader.get_next_step():
+            pass
+        self.assertEqual(yaml_reader.get_step(0)['timestep'], 0)
+
+    def test_get_step_out_of_range(self):
+        """
+        Test if the get_step method raises an IndexError when the step does
+        not exist.
+        """
+        yaml_reader = YAMLReader(self.filename)
+        with self.assertRaises(IndexError):
+            yaml_reader.get_step(3)
+
+    def test_seek_timestep(self):
+        """
+        Test if the seek_timestep method moves the reader to the requested
+        timestep.
+
+        Steps:
+        1. Instantiate the YAMLReader class.
+        2. Call the seek_timestep method.
+        3. Assert that the position of the step is returned.
+        4. Assert that get_next_step returns the requested timestep.
+        5. Assert that a ValueError is raised for a missing timestep.
+        """
+        yaml_reader = YAMLReader(self.filename)
+        self.assertEqual(yaml_reader.seek_timestep(40), 2)
+        self.assertEqual(yaml_reader.get_next_step()['timestep'], 40)
+        with self.assertRaises(ValueError):
+            yaml_reader.seek_timestep(30)
+
+
+class Test_YAMLReader_process_array(unittest.TestCase):
+    """
+    Tests the process_array method of the YAMLReader class.
+    """
+    def test_process_array(self):
+        """
+        Test if the process_array method converts atom rows into a structured
+        array with the right types.
+
+        Steps:
+        1. Instantiate the YAMLReader class.
+        2. Call the process_array method with two atom rows.
+        3. Assert that every column has the expected type and values.
+        4. Assert that the next line is returned.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'))
+        line = "  - [ 1 , 2 , H2 , 0.5 , 1e-05, ]\n"
+        yaml_reader.file = MagicMock()
+        yaml_reader.file.readline.side_effect = [
+            "  - [ 2 , 1 , O , 3 , -2, ]\n", "...\n"]
+        result, next_line = yaml_reader.process_array(
+            line, ['id', 'type', 'element', 'x', 'y'])
+        self.assertEqual(result.dtype['id'].kind, 'i')
+        self.assertEqual(result.dtype['element'].kind, 'U')
+        self.assertEqual(result.dtype['x'].kind, 'f')
+        self.assertEqual(result['id'].tolist(), [1, 2])
+        self.assertEqual(result['element'].tolist(), ['H2', 'O'])
+        self.assertEqual(result['x'].tolist(), [0.5, 3.0])
+        self.assertEqual(result['y'].tolist(), [1e-05, -2.0])
+        self.assertEqual(next_line, "...\n")
+
+    def test_process_array_spaces_in_strings(self):
+        """
+        Test if the spaces inside the string values are kept, while the
+        spaces around the separators are removed, whatever their number.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'))
+        line = "  - [ 1 , C  alpha , 0.5, ]\n"
+        yaml_reader.file = MagicMock()
+        yaml_reader.file.readline.side_effect = [
+            "  - [2,O,  3 , ]\n", "...\n"]
+        result, _ = yaml_reader.process_array(line, ['id', 'element', 'x'])
+        self.assertEqual(result['id'].tolist(), [1, 2])
+        self.assertEqual(result['element'].tolist(), ['C  alpha', 'O'])
+        self.assertEqual(result['x'].tolist(), [0.5, 3.0])
+
+    def test_process_array_no_rows(self):
+        """
+        Test if the process_array method returns None when there are no atom
+        rows.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'))
+        result, next_line = yaml_reader.process_array("...\n", ['id'])
+        self.assertIsNone(result)
+        self.assertEqual(next_line, "...\n")
+
+    def test_process_array_wrong_keywords(self):
+        """
+        Test if the process_array method raises a ValueError when the rows do
+        not match the keywords.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'))
+        yaml_reader.file = MagicMock()
+        yaml_reader.file.readline.return_value = "...\n"
+        with self.assertRaises(ValueError):
+            yaml_reader.process_array("  - [ 1 , 2 , 3, ]\n", ['id'])
+
+    def test_get_next_step_array_data(self):
+        """
+        Test if the get_next_step method returns the atom data as a structured
+        array matching the list of lists output.
+
+        Steps:
+        1. Instantiate the YAMLReader class with and without array_data.
+        2. Read the first step with both readers.
+        3. Assert that the other keys are the same.
+        4. Assert that the structured array matches the list of lists.
+        """
+        list_reader = YAMLReader(os.path.join('tests', 'test.yaml'))
+        array_reader = YAMLReader(os.path.join('tests', 'test.yaml'),
+                                  array_data=True)
+        list_step = list_reader.get_next_step()
+        array_step = array_reader.get_next_step()
+        self.assertEqual(list_step['thermo'], array_step['thermo'])
+        self.assertEqual(list_step['keywords'],
+                         list(array_step['data'].dtype.names))
+        self.assertEqual(list_step['data'],
+                         [list(row) for row in array_step['data'].tolist()])
+
+
+class Test_YAMLReader_mmap(unittest.TestCase):
+    """
+    Tests the memory-mapped mode and the skip_data option of the YAMLReader
+    class.
+    """
+    def test_mmap_same_steps(self):
+        """
+        Test if the memory-mapped mode returns the same steps as the text
+        mode.
+
+        Steps:
+        1. Instantiate the YAMLReader class with and without use_mmap.
+        2. Read all the steps with both readers.
+        3. Assert that the steps are the same.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        text_reader = YAMLReader(filename)
+        mmap_reader = YAMLReader(filename, use_mmap=True)
+        while True:
+            text_step = text_reader.get_next_step()
+            mmap_step = mmap_reader.get_next_step()
+            self.assertEqual(text_step, mmap_step)
+            if not text_step:
+                break
+        self.assertTrue(mmap_reader.file.closed)
+
+    def test_mmap_array_data(self):
+        """
+        Test if the memory-mapped mode decodes the atom rows as a structured
+        array.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'),
+                                 array_data=True, use_mmap=True)
+        step = yaml_reader.get_next_step()
+        self.assertEqual(step['data']['id'].tolist(), [1, 2, 3])
+
+    def test_skip_data(self):
+        """
+        Test if the skip_data option returns the steps without atom data.
+
+        Steps:
+        1. Instantiate the YAMLReader class in text and memory-mapped mode.
+        2. Read all the steps with skip_data.
+        3. Assert that the steps have no atom data but keep the other keys.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        for use_mmap in (False, True):
+            yaml_reader = YAMLReader(filename, use_mmap=use_mmap)
+            timesteps = []
+            while True:
+                step = yaml_reader.get_next_step(skip_data=True)
+                if not step:
+                    break
+                self.assertNotIn('data', step)
+                self.assertIn('thermo', step)
+                self.assertEqual(len(step['keywords']), 13)
+                timesteps.append(step['timestep'])
+            self.assertEqual(timesteps, [0, 20, 40])
+
+    def test_mmap_get_step(self):
+        """
+        Test if random access works in memory-mapped mode.
+        """
+        temp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(temp_dir, 'test.yaml')
+            shutil.copy(os.path.join('tests', 'test.yaml'), filename)
+            yaml_reader = YAMLReader(filename, use_mmap=True)
+            self.assertEqual(yaml_reader.get_step(2)['timestep'], 40)
+            self.assertEqual(yaml_reader.get_step(1)['timestep'], 20)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class Test_YAMLReader_get_next_thermo(unittest.TestCase):
+    """
+    Tests the get_next_thermo method of the YAMLReader class.
+    """
+    def test_get_next_thermo(self):
+        """
+        Test if the get_next_thermo method returns the header and the thermo
+        data of every step, without the other blocks.
+
+        Steps:
+        1. Instantiate the YAMLReader class in text and memory-mapped mode.
+        2. Read all the steps with get_next_thermo.
+        3. Assert that the thermo data matches the one of get_next_step.
+        4. Assert that the atom data and the box are not returned.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        for use_mmap in (False, True):
+            check_reader = YAMLReader(filename)
+            yaml_reader = YAMLReader(filename, use_mmap=use_mmap)
+            for timestep in [0, 20, 40]:
+                step = yaml_reader.get_next_thermo()
+                check_step = check_reader.get_next_step()
+                self.assertEqual(step['thermo'], check_step['thermo'])
+                self.assertEqual(step['timestep'], timestep)
+                self.assertEqual(step['natoms'], 20286)
+                self.assertNotIn('data', step)
+                self.assertNotIn('box', step)
+            self.assertEqual(yaml_reader.get_next_thermo(), {})
+            self.assertTrue(yaml_reader.file.closed)
+
+    def test_get_next_thermo_no_thermo(self):
+        """
+        Test if the get_next_thermo method returns the header of the steps
+        when no thermo data is present.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test_nothermo.yaml'))
+        step = yaml_reader.get_next_thermo()
+        self.assertNotIn('thermo', step)
+        self.assertEqual(step['natoms'], 20286)
+        self.assertEqual(yaml_reader.get_next_thermo()['timestep'], 20)
+
+    def test_skip_document(self):
+        """
+        Test if the skip_document method moves the reader to the next step.
+
+        Steps:
+        1. Instantiate the YAMLReader class in text and memory-mapped mode.
+        2. Skip the first step.
+        3. Assert that the next step is the second one.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        for use_mmap in (False, True):
+            yaml_reader = YAMLReader(filename, use_mmap=use_mmap)
+            yaml_reader.skip_document()
+            self.assertEqual(yaml_reader.get_next_step()['timestep'], 20)
+
+    def test_get_next_header(self):
+        """
+        Test if the get_next_header method returns the header and the box of
+        every step, without the thermo and the atom data.
+
+        Steps:
+        1. Instantiate the YAMLReader class in text and memory-mapped mode.
+        2. Read all the steps with get_next_header.
+        3. Assert that the header matches the one of get_next_step.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        for use_mmap in (False, True):
+            check_reader = YAMLReader(filename)
+            yaml_reader = YAMLReader(filename, use_mmap=use_mmap)
+            for timestep in [0, 20, 40]:
+                step = yaml_reader.get_next_header()
+                check_step = check_reader.get_next_step()
+                del check_step['thermo'], check_step['data']
+                self.assertEqual(step, check_step)
+            self.assertEqual(yaml_reader.get_next_header(), {})
+            self.assertTrue(yaml_reader.file.closed)
+
+    def test_skip_rows_count(self):
+        """
+        Test if the skip_rows method skips blocks with the expected number of
+        rows, and more or fewer rows than expected.
+
+        Steps:
+        1. Write a file with blocks of 3 rows.
+        2. Skip the first block with the right count, a larger count and a
+           smaller count.
+        3. Assert that the line after the block is returned.
+        """
+        temp_dir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(temp_dir, 'rows.yaml')
+            with open(filename, 'w') as file:
+                file.write('data:\n  - [ 1 ]\n  - [ 2 ]\n  - [ 3 ]\n'
+                           '...\n---\ndata:\n' + '  - [ 4 ]\n' * 9 + '...')
+            for count in (3, 4, 10, 2, None):
+                yaml_reader = YAMLReader(filename)
+                yaml_reader.file.readline()
+                self.assertEqual(yaml_reader.skip_rows(count), '...\n')
+                self.assertEqual(yaml_reader.file.readline(), '---\n')
+                yaml_reader.close()
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class Test_YAMLReader_compressed(unittest.TestCase):
+    """
+    Tests the reading of compressed YAML files with the YAMLReader class.
+    """
+    def setUp(self):
+        """
+        Write a gzip-compressed copy of the test file in a temporary
+        directory.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'test.yaml.gz')
+        with open(os.path.join('tests', 'test.yaml'), 'rb') as file:
+            data = file.read()
+        with gzip.open(self.filename, 'wb') as file:
+            file.write(data)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def test_read_compressed(self):
+        """
+        Test if the steps of a compressed file are the same as the steps of
+        the plain file, also when a memory map is requested.
+        """
+        steps = list(YAMLReader(os.path.join('tests', 'test.yaml')))
+        yaml_reader = YAMLReader(self.filename, use_mmap=True)
+        self.assertEqual(yaml_reader.compression, 'gzip')
+        self.assertFalse(yaml_reader.use_mmap)
+        self.assertEqual(list(yaml_reader), steps)
+
+    def test_random_access_compressed(self):
+        """
+        Test if the index and the random access work on a compressed file.
+
+        Steps:
+        1. Instantiate the YAMLReader class with the compressed file.
+        2. Read the last step, then the first one, with get_step.
+        3. Seek a timestep and read the next step.
+        4. Assert that the expected steps are returned.
+        """
+        yaml_reader = YAMLReader(self.filename)
+        self.assertEqual(yaml_reader.get_step(-1)['timestep'], 40)
+        self.assertEqual(yaml_reader.get_step(0)['timestep'], 0)
+        self.assertEqual(yaml_reader.seek_timestep(20), 1)
+        self.assertEqual(yaml_reader.get_next_step()['timestep'], 20)
+
+
+class Test_YAMLReader_follow(unittest.TestCase):
+    """
+    Tests the following of a YAML file that is still being written with the
+    YAMLReader class.
+    """
+    def setUp(self):
+        """
+        Write the first step and a half of the test file in a temporary
+        directory.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.temp_dir, 'test.yaml')
+        with open(os.path.join('tests', 'test.yaml'), 'r') as file:
+            self.data = file.read()
+        # End of the first step and middle of the second one
+        self.first_end = self.data.index('...\n') + 4
+        self.second_end = self.data.index('...\n', self.first_end) + 4
+        self.middle = (self.first_end + self.second_end) // 2
+        with open(self.filename, 'w') as file:
+            file.write(self.data[:self.middle])
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        shutil.rmtree(self.temp_dir)
+
+    def append(self, start, stop):
+        """
+        Appends a part of the test file to the followed file.
+        """
+        with open(self.filename, 'a') as file:
+            file.write(self.data[start:stop])
+
+    def test_follow_complete_steps(self):
+        """
+        Test if only the complete steps are returned and if a later call
+        continues after the last complete step.
+
+        Steps:
+        1. Follow the file with a null timeout.
+        2. Assert that only the first step is returned.
+        3. Write the rest of the second step, but only '..' of its end
+           marker.
+        4. Assert that no step is returned.
+        5. Write the rest of the file and follow it again.
+        6. Assert that the second and third steps are returned.
+        """
+        steps = list(YAMLReader(os.path.join('tests', 'test.yaml')))
+        yaml_reader = YAMLReader(self.filename)
+        self.assertEqual(list(yaml_reader.follow(timeout=0)), steps[:1])
+        self.assertEqual(yaml_reader.tell(), self.first_end)
+
+        self.append(self.middle, self.second_end - 2)
+        self.assertEqual(list(yaml_reader.follow(timeout=0)), [])
+        self.append(self.second_end - 2, len(self.data))
+        self.assertEqual(list(yaml_reader.follow(timeout=0)), steps[1:])
+
+    def test_follow_waits_for_new_steps(self):
+        """
+        Test if the reader waits for the steps written by another thread.
+        """
+        yaml_reader = YAMLReader(self.filename, use_mmap=True)
+        timer = threading.Timer(0.05, self.append,
+                                (self.middle, len(self.data)))
+        timer.start()
+        try:
+            steps = yaml_reader.follow(poll_interval=0.01, timeout=5)
+            timesteps = [step['timestep']
+                         for step in itertools.islice(steps, 3)]
+        finally:
+            timer.join()
+        self.assertEqual(timesteps, [0, 20, 40])
+
+    def test_follow_compressed(self):
+        """
+        Test if following a compressed file raises a ValueError.
+        """
+        filename = os.path.join(self.temp_dir, 'test.yaml.gz')
+        with gzip.open(filename, 'wt') as file:
+            file.write(self.data)
+        with self.assertRaises(ValueError):
+            next(YAMLReader(filename).follow(timeout=0))
+
+
+class Test_YAMLReader_iteration(unittest.TestCase):
+    """
+    Tests the iterator and context manager protocols and the iter_steps
+    method of the YAMLReader class.
+    """
+    def timesteps(self, steps):
+        """
+        Returns the timesteps of a sequence of steps.
+        """
+        return [step['timestep'] for step in steps]
+
+    def test_iterate(self):
+        """
+        Test if iterating over the reader returns every step and closes the
+        file at the end.
+
+        Steps:
+        1. Instantiate the YAMLReader class as a context manager.
+        2. Iterate over the reader.
+        3. Assert that every step is returned and the file is closed.
+        4. Assert that a new iteration returns nothing.
+        """
+        with YAMLReader(os.path.join('tests', 'test.yaml')) as yaml_reader:
+            self.assertEqual(self.timesteps(yaml_reader), [0, 20, 40])
+            self.assertTrue(yaml_reader.file.closed)
+            self.assertEqual(list(yaml_reader), [])
+
+    def test_context_manager_closes_file(self):
+        """
+        Test if the file is closed when leaving the context manager before
+        the end of the file.
+        """
+        with YAMLReader(os.path.join('tests', 'test.yaml')) as yaml_reader:
+            next(yaml_reader)
+        self.assertTrue(yaml_reader.file.closed)
+
+    def test_iter_steps_selection(self):
+        """
+        Test if iter_steps returns the selected steps.
+
+        Steps:
+        1. Instantiate the YAMLReader class in text and memory-mapped mode.
+        2. Call iter_steps with different start, stop and stride values.
+        3. Assert that the selected steps are returned.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        for use_mmap in (False, True):
+            for kwargs, expected in [({'start': 1}, [20, 40]),
+                                     ({'stride': 2}, [0, 40]),
+                                     ({'stop': 2}, [0, 20]),
+                                     ({'start': 1, 'stride': 5}, [20]),
+                                     ({'start': 5}, [])]:
+                yaml_reader = YAMLReader(filename, use_mmap=use_mmap)
+                steps = yaml_reader.iter_steps(**kwargs)
+                self.assertEqual(self.timesteps(steps), expected)
+
+    def test_iter_steps_timestep_range(self):
+        """
+        Test if iter_steps returns the steps within a range of timesteps.
+
+        Steps:
+        1. Instantiate the YAMLReader class in text and memory-mapped mode.
+        2. Call iter_steps with different timestep ranges and strides.
+        3. Assert that the selected steps are returned.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        for use_mmap in (False, True):
+            for kwargs, expected in [({'start_timestep': 20}, [20, 40]),
+                                     ({'stop_timestep': 20}, [0, 20]),
+                                     ({'start_timestep': 10,
+                                       'stop_timestep': 30}, [20]),
+                                     ({'start_timestep': 0,
+                                       'stride': 2}, [0, 40]),
+                                     ({'start_timestep': 50}, [])]:
+                yaml_reader = YAMLReader(filename, use_mmap=use_mmap)
+                steps = yaml_reader.iter_steps(**kwargs)
+                self.assertEqual(self.timesteps(steps), expected)
+
+    def test_iter_steps_stops_after_range(self):
+        """
+        Test if iter_steps stops reading the file after the last timestep of
+        the range.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'))
+        with patch.object(yaml_reader, 'peek_timestep',
+                          wraps=yaml_reader.peek_timestep) as mock_peek:
+            self.assertEqual(
+                self.timesteps(yaml_reader.iter_steps(stop_timestep=0)), [0])
+            # The third step is never looked at
+            self.assertEqual(mock_peek.call_count, 2)
+
+    def test_peek_timestep(self):
+        """
+        Test if peek_timestep returns the timestep of the next step without
+        moving the reader.
+        """
+        for use_mmap in (False, True):
+            yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'),
+                                     use_mmap=use_mmap)
+            yaml_reader.skip_step()
+            offset = yaml_reader.tell()
+            self.assertEqual(yaml_reader.peek_timestep(), 20)
+            self.assertEqual(yaml_reader.tell(), offset)
+            self.assertEqual(yaml_reader.get_next_step()['timestep'], 20)
+
+    def test_iter_steps_skips_without_parsing(self):
+        """
+        Test if the steps that are not selected are not parsed.
+
+        Steps:
+        1. Instantiate the YAMLReader class.
+        2. Call iter_steps with a stride of 2, counting the get_next_step
+           calls.
+        3. Assert that get_next_step is called only for the selected steps.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'))
+        with patch.object(yaml_reader, 'get_next_step',
+                          wraps=yaml_reader.get_next_step) as mock_next:
+            self.assertEqual(self.timesteps(yaml_reader.iter_steps(stride=2)),
+                             [0, 40])
+            # Only the two selected steps are parsed
+            self.assertEqual(mock_next.call_count, 2)
+
+    def test_iter_steps_invalid(self):
+        """
+        Test if iter_steps raises a ValueError for invalid arguments.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'))
+        with self.assertRaises(ValueError):
+            list(yaml_reader.iter_steps(stride=0))
+        with self.assertRaises(ValueError):
+            list(yaml_reader.iter_steps(start=-1))
+
+    def test_skip_step(self):
+        """
+        Test if skip_step skips a step and returns False at the end of the
+        file.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'))
+        self.assertTrue(yaml_reader.skip_step())
+        self.assertTrue(yaml_reader.skip_step())
+        self.assertEqual(yaml_reader.get_next_step()['timestep'], 40)
+        self.assertFalse(yaml_reader.skip_step())
+        self.assertTrue(yaml_reader.file.closed)
+
+
+class Test_YAMLReader_columns(unittest.TestCase):
+    """
+    Tests the selection of the atom and thermo columns of the YAMLReader
+    class.
+    """
+    def project(self, step, columns, thermo_columns):
+        """
+        Returns the projection of a step read entirely.
+        """
+        keywords = step['keywords']
+        kept = [n for n, keyword in enumerate(keywords) if keyword in columns]
+        step['keywords'] = [keywords[n] for n in kept]
+        step['data'] = [[row[n] for n in kept] for row in step['data']]
+        thermo = step['thermo']
+        kept = [n for n, keyword in enumerate(thermo['keywords'])
+                if keyword in thermo_columns]
+        thermo['keywords'] = [thermo['keywords'][n] for n in kept]
+        thermo['data'] = [thermo['data'][n] for n in kept]
+        return step
+
+    def test_columns_same_steps(self):
+        """
+        Test if the steps read with a selection of columns are the
+        projection of the steps read entirely, in every reading mode.
+
+        Steps:
+        1. Read the test file entirely and project its steps.
+        2. Read it with columns and thermo_columns, with and without memory
+           map, and with the generic parser only.
+        3. Assert that the steps are the same, the keywords being in the
+           order of the file and the missing keywords being ignored.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        columns = ['z', 'element', 'x', 'missing']
+        thermo_columns = ['Time', 'Step']
+        expected = [self.project(step, columns, thermo_columns)
+                    for step in YAMLReader(filename)]
+        self.assertEqual(expected[0]['keywords'], ['element', 'x', 'z'])
+        for use_mmap in (False, True):
+            yaml_reader = YAMLReader(filename, use_mmap=use_mmap,
+                                     columns=columns,
+                                     thermo_columns=thermo_columns)
+            self.assertEqual(list(yaml_reader), expected)
+            self.assertIsNotNone(yaml_reader.schema)
+        yaml_reader = YAMLReader(filename, columns=columns,
+                                 thermo_columns=thermo_columns)
+        yaml_reader._deviations = StepSchema.MAX_DEVIATIONS
+        self.assertEqual(list(yaml_reader), expected)
+
+    def test_columns_array_data(self):
+        """
+        Test if only the selected columns are decoded in the structured
+        array of the atom rows.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        for use_mmap in (False, True):
+            yaml_reader = YAMLReader(filename, array_data=True,
+                                     use_mmap=use_mmap, columns=['x', 'id'])
+            for step in yaml_reader:
+                self.assertEqual(step['keywords'], ['id', 'x'])
+                self.assertEqual(step['data'].dtype.names, ('id', 'x'))
+                self.assertEqual(step['data']['id'].tolist(), [1, 2, 3])
+
+    def test_thermo_columns_get_next_thermo(self):
+        """
+        Test if get_next_thermo keeps the selected thermo columns.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'),
+                                 thermo_columns=['Step'])
+        step = yaml_reader.get_next_thermo()
+        self.assertEqual(step['thermo'], {'keywords': ['Step'], 'data': [0]})
+
+    def test_select_columns(self):
+        """
+        Test if a selection of all the keywords, or no selection, keeps the
+        steps unchanged.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'))
+        self.assertIsNone(yaml_reader.select_columns(['x', 'y'], None))
+        self.assertIsNone(yaml_reader.select_columns(['x', 'y'], ['y', 'x']))
+        self.assertEqual(yaml_reader.select_columns(['x', 'y'], ['y']),
+                         ((1,), ['y']))
+        yaml_reader.close()
+
+
+class Test_YAMLReader_atom_filter(unittest.TestCase):
+    """
+    Tests the selection of the atoms of the YAMLReader class.
+    """
+    def test_atom_filter_same_steps(self):
+        """
+        Test if the steps read with an atom filter keep the rows of the
+        selected atoms, in every reading mode.
+
+        Steps:
+        1. Read the test file entirely and keep the rows of the atoms 1
+           and 3.
+        2. Read it with an atom filter and a selection of columns without
+           'id', with and without memory map, and with the generic parser
+           only.
+        3. Assert that the steps are the same and that natoms is the number
+           of atoms kept.
+        4. Assert that the structured arrays keep the same atoms.
+        """
+        filename = os.path.join('tests', 'test.yaml')
+        expected = []
+        for step in YAMLReader(filename):
+            step['keywords'] = ['x', 'y']
+            step['data'] = [row[4:6] for row in step['data']
+                            if row[0] in (1, 3)]
+            step['natoms'] = 2
+            expected.append(step)
+
+        kwargs = {'columns': ['x', 'y'],
+                  'atom_filter': AtomFilter(ids=range(1, 4, 2))}
+        for use_mmap in (False, True):
+            yaml_reader = YAMLReader(filename, use_mmap=use_mmap, **kwargs)
+            self.assertEqual(list(yaml_reader), expected)
+        yaml_reader = YAMLReader(filename, **kwargs)
+        yaml_reader._deviations = StepSchema.MAX_DEVIATIONS
+        self.assertEqual(list(yaml_reader), expected)
+
+        for use_mmap in (False, True):
+            steps = YAMLReader(filename, array_data=True, use_mmap=use_mmap,
+                               **kwargs)
+            for step, expected_step in zip(steps, expected):
+                self.assertEqual(step['data'].dtype.names, ('x', 'y'))
+                self.assertEqual([list(row) for row in step['data'].tolist()],
+                                 expected_step['data'])
+
+    def test_atom_filter_no_atoms(self):
+        """
+        Test if the steps without selected atoms are read with the schema.
+        """
+        yaml_reader = YAMLReader(os.path.join('tests', 'test.yaml'),
+                                 atom_filter=AtomFilter(types=[1]))
+        steps = list(yaml_reader)
+        self.assertEqual([step['natoms'] for step in steps], [0, 0, 0])
+        self.assertEqual([step['data'] for step in steps], [[], [], []])
+        self.assertEqual(yaml_reader._deviations, 0)
+
+
 if __name__ == '__main__':
     unittest.main()
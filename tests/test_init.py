@@ -0,0 +1,41 @@
+import unittest
+import subprocess
+import sys
+import lammpshade
+
+
+class Test_lammpshade_lazy_import(unittest.TestCase):
+    """
+    Tests the lazy import of the public names of the lammpshade package.
+    """
+    def test_import_does_not_load_plotting(self):
+        """
+        Test if importing lammpshade and accessing Simulation does not
+        import pandas and matplotlib.
+
+        Steps:
+        1. Import lammpshade in a fresh interpreter and access Simulation.
+        2. Assert that pandas and matplotlib are not in sys.modules.
+        """
+        statement = ('import sys, lammpshade; lammpshade.Simulation; '
+                     'print("pandas" in sys.modules, '
+                     '"matplotlib" in sys.modules)')
+        output = subprocess.run([sys.executable, '-c', statement],
+                                check=True, capture_output=True,
+                                text=True).stdout
+        self.assertEqual(output.split(), ['False', 'False'])
+
+    def test_public_names(self):
+        """
+        Test if the public names are resolved on access and if an unknown
+        name raises an AttributeError.
+        """
+        from lammpshade.Constructor import Simulation
+        self.assertIs(lammpshade.Simulation, Simulation)
+        self.assertIn('GraphMaker', dir(lammpshade))
+        with self.assertRaises(AttributeError):
+            lammpshade.Missing
+
+
+if __name__ == '__main__':
+    unittest.main()